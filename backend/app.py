@@ -1,21 +1,869 @@
 import os
+import sys
+import hashlib
+import sqlite3
+import numpy as np
 from flask import Flask, jsonify, request, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import requests
 import json
-from datetime import datetime, timedelta
+import gzip
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timedelta, timezone
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import heapq
+import mmap
+import random
+import struct
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
+
+try:
+    import fcntl   # POSIX only; elects the pre-warming worker, shares rate limits
+except ImportError:
+    fcntl = None
+
+try:
+    import ijson   # incremental JSON; large upstream payloads are parsed as a stream
+except ImportError:
+    ijson = None
+
+try:
+    import prometheus_client   # /metrics; see gunicorn.conf.py for the multi-worker setup
+    from prometheus_client import multiprocess as prometheus_multiprocess
+except ImportError:
+    prometheus_client = None
+
+try:
+    import orjson   # fast JSON for API responses and SSE payloads; json is the fallback
+except ImportError:
+    orjson = None
+
+try:
+    import brotli   # br Content-Encoding; gzip is always available
+except ImportError:
+    brotli = None
+
+try:
+    import websocket   # websocket-client; the optional live Binance feed (BINANCE_WS=1)
+except ImportError:
+    websocket = None
 
 app = Flask(__name__)
 
-_BINANCE_BASE = "https://api.binance.com/api/v3"
+_BINANCE_BASE = os.environ.get('BINANCE_BASE_URL', 'https://api.binance.com') + '/api/v3'
 _STABLE_SYMBOLS = {'USDT', 'BUSD', 'USDC', 'DAI', 'TUSD', 'USDP', 'FDUSD', 'UST', 'USDS'}
 
 def _binance_headers() -> dict:
     key = os.environ.get('BINANCE_API_KEY')
     return {'X-MBX-APIKEY': key} if key else {}
 
+# ── Upstream HTTP Engine ─────────────────────────────────────────────────────
+# One keep-alive connection pool per worker, and one bounded fetch pool per
+# upstream (Yahoo, Binance) shared by every scan. Concurrent scans queue on
+# the same FETCH_CONCURRENCY threads instead of each spawning their own pool,
+# so thread and socket counts stay flat however many scans are running. The
+# pools are per upstream because fetch threads block in their host's rate
+# limiter: a throttled Binance backlog must not hold up Yahoo work.
+
+_FETCH_CONCURRENCY = int(os.environ.get('FETCH_CONCURRENCY', 8))
+
+_http = requests.Session()
+_http_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=_FETCH_CONCURRENCY)
+_http.mount('https://', _http_adapter)
+_http.mount('http://', _http_adapter)
+
+_fetch_executors = {
+    upstream: ThreadPoolExecutor(max_workers=_FETCH_CONCURRENCY, thread_name_prefix=f'fetch-{upstream}')
+    for upstream in ('yahoo', 'binance')
+}
+
+# Every upstream host gets a token bucket (requests/second) shared by all
+# gunicorn workers through a small state file, and a per-worker concurrency
+# window. Both follow AIMD: a 429 / 5xx halves them, fast successes grow them
+# back, slow responses shrink the window. Throttled and failed requests are
+# retried with jittered exponential backoff, honouring Retry-After.
+
+_HTTP_RETRIES       = int(os.environ.get('HTTP_RETRIES', 2))
+_HTTP_BACKOFF_BASE  = float(os.environ.get('HTTP_BACKOFF_BASE', 0.5))   # seconds
+_HTTP_BACKOFF_MAX   = float(os.environ.get('HTTP_BACKOFF_MAX', 8))
+_HTTP_SLOW_LATENCY  = float(os.environ.get('HTTP_SLOW_LATENCY', 3))     # seconds
+_HTTP_RETRY_STATUS  = {418, 429, 500, 502, 503, 504}
+_HTTP_THROTTLE_STATUS = {418, 429, 503}
+
+_YAHOO_RATE   = float(os.environ.get('YAHOO_RATE', 10))     # requests/second, all workers
+_BINANCE_RATE = float(os.environ.get('BINANCE_RATE', 40))     # klines weigh 2 of 6000/min
+_BINANCE_WEIGHT_LIMIT = int(os.environ.get('BINANCE_WEIGHT_LIMIT', 6000))   # per minute per IP
+
+
+def _host_rate(host: str) -> float:
+    # Matched on the configured base URL too, so a BINANCE_BASE_URL stand-in gets Binance's rate
+    binance = host == urlsplit(_BINANCE_BASE).netloc or 'binance' in host
+    return _BINANCE_RATE if binance else _YAHOO_RATE
+
+
+class _HostLimiter:
+    """Token bucket + AIMD concurrency window for one upstream host.
+
+    Bucket state is (tokens, updated_at, rate, paused_until), kept in an
+    mmap'd file under flock so every worker draws from the same budget.
+    Without fcntl it lives in this process only.
+    """
+
+    _STATE = struct.Struct('<dddd')
+
+    def __init__(self, host: str, max_rate: float, max_concurrency: int, state_path: str = None):
+        self.host = host
+        self.max_rate = max_rate
+        self.burst = max(1.0, max_rate)
+        self.max_concurrency = max_concurrency
+        self.window = float(max_concurrency)
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self._cond = threading.Condition()
+        self._lock = threading.Lock()       # flock doesn't exclude threads of one process
+        self._fh = None
+        if fcntl is not None and state_path:
+            try:
+                self._fh = open(state_path, 'a+b')
+                if os.fstat(self._fh.fileno()).st_size < self._STATE.size:
+                    self._fh.write(b'\0' * self._STATE.size)
+                    self._fh.flush()
+                self._state = mmap.mmap(self._fh.fileno(), self._STATE.size)
+            except OSError as e:
+                _log.warning('shared rate state unavailable', extra={'fields': {'host': host, 'error': str(e)}})
+                self._fh = None
+        if self._fh is None:
+            self._state = bytearray(self._STATE.size)
+
+    @contextmanager
+    def _shared(self):
+        """Yield the bucket state list; whatever it holds on exit is written back."""
+        with self._lock:
+            if self._fh is not None:
+                fcntl.flock(self._fh, fcntl.LOCK_EX)
+            try:
+                tokens, updated, rate, paused = self._STATE.unpack_from(self._state)
+                now = time.time()
+                if updated == 0 or rate <= 0:
+                    tokens, updated, rate = self.burst, now, self.max_rate
+                state = [min(self.burst, tokens + (now - updated) * rate), now, rate, paused]
+                yield state
+                self._STATE.pack_into(self._state, 0, *state)
+            finally:
+                if self._fh is not None:
+                    fcntl.flock(self._fh, fcntl.LOCK_UN)
+
+    def acquire(self):
+        """Block until this worker's window and the shared bucket both allow a request."""
+        with self._cond:
+            while self.in_flight >= int(self.window):
+                self._cond.wait()
+            self.in_flight += 1
+        while True:
+            with self._shared() as state:
+                now = state[1]
+                if now >= state[3] and state[0] >= 1:
+                    state[0] -= 1
+                    return
+                wait = max(state[3] - now, (1 - state[0]) / state[2])
+            time.sleep(min(wait, 1.0))
+
+    def release(self, status, latency: float):
+        """Feed one response (status None = connection error) back into AIMD."""
+        throttled = status is None or status in _HTTP_RETRY_STATUS
+        with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+            if throttled:
+                self.throttled += 1
+                self.window = max(1.0, self.window / 2)
+            elif latency > _HTTP_SLOW_LATENCY:
+                self.window = max(1.0, self.window * 0.9)
+            else:
+                self.window = min(self.max_concurrency, self.window + 1 / self.window)
+            self._cond.notify_all()
+        with self._shared() as state:
+            if throttled:
+                state[2] = max(self.max_rate / 20, state[2] / 2)
+            elif latency <= _HTTP_SLOW_LATENCY:
+                state[2] = min(self.max_rate, state[2] + self.max_rate / 20)
+
+    def pause(self, seconds: float):
+        """Stop every worker from sending to this host for the next few seconds."""
+        with self._shared() as state:
+            state[3] = max(state[3], time.time() + seconds)
+
+    def stats(self) -> dict:
+        with self._shared() as state:
+            rate, paused = state[2], state[3]
+        return {
+            'rate':         round(rate, 2),
+            'max_rate':     self.max_rate,
+            'window':       round(self.window, 2),
+            'in_flight':    self.in_flight,
+            'requests':     self.requests,
+            'throttled':    self.throttled,
+            'retries':      self.retries,
+            'paused_for':   round(max(0.0, paused - time.time()), 1),
+        }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _limiter_for(url: str) -> _HostLimiter:
+    host = urlsplit(url).netloc
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            state_path = f"{_OHLCV_DB_PATH}.{host.replace(':', '_')}.ratelimit"
+            limiter = _limiters[host] = _HostLimiter(host, _host_rate(host), _FETCH_CONCURRENCY, state_path)
+    return limiter
+
+
+def _retry_after(resp) -> float:
+    try:
+        return float(resp.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_get(url, **kwargs):
+    """GET through the shared keep-alive session, rate limited per host.
+
+    Retries 429 / 5xx / connection errors up to HTTP_RETRIES times and then
+    returns the last response (or raises the last error) as before.
+    """
+    limiter = _limiter_for(url)
+    for attempt in range(_HTTP_RETRIES + 1):
+        limiter.acquire()
+        started = time.time()
+        resp = None
+        try:
+            resp = _http.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == _HTTP_RETRIES:
+                raise
+        finally:
+            # Any error (a truncated or undecodable body too) gives the slot
+            # back and counts as a failure, or the window would leak shut
+            status = resp.status_code if resp is not None else None
+            elapsed = time.time() - started
+            _UPSTREAM_SECONDS.labels(limiter.host, 'error' if status is None else str(status)).observe(elapsed)
+            limiter.release(status, elapsed)
+        if resp is not None:
+            # Binance reports the IP's request weight for the current minute
+            used = resp.headers.get('X-MBX-USED-WEIGHT-1M')
+            if used and int(used) >= _BINANCE_WEIGHT_LIMIT * 0.9:
+                limiter.pause(60 - time.time() % 60)
+            if resp.status_code not in _HTTP_RETRY_STATUS:
+                return resp
+            resp.close()            # hand the connection back before retrying
+            retry_after = _retry_after(resp)
+            if retry_after:
+                limiter.pause(retry_after)
+            if attempt == _HTTP_RETRIES or (retry_after or 0) > _HTTP_BACKOFF_MAX:
+                return resp
+
+        limiter.retries += 1
+        delay = min(_HTTP_BACKOFF_MAX, _HTTP_BACKOFF_BASE * 2 ** attempt)
+        time.sleep(random.uniform(delay / 2, delay))
+
+
+# ── Logging ──────────────────────────────────────────────────────────────────
+# Scan code logs through one queue-backed logger: worker threads only put
+# records on an in-memory queue and a listener thread does the stdout writes,
+# so a scan never blocks on gunicorn's log pipe. Each scan ends with one
+# summary record; routine per-symbol records are DEBUG-level and sampled at
+# LOG_SYMBOL_SAMPLE, per-symbol warnings are not sampled. Startup and
+# background-thread messages go through the same logger. LOG_FORMAT=json switches to one JSON object per line.
+
+_LOG_LEVEL         = os.environ.get('LOG_LEVEL', 'INFO').upper()
+_LOG_FORMAT        = os.environ.get('LOG_FORMAT', 'text')
+_LOG_SYMBOL_SAMPLE = float(os.environ.get('LOG_SYMBOL_SAMPLE', 0.02))
+
+
+class _StructuredFormatter(logging.Formatter):
+    """`time level message key=value ...`, or a JSON object per record."""
+
+    def format(self, record):
+        fields = getattr(record, 'fields', None) or {}
+        if _LOG_FORMAT == 'json':
+            return json.dumps({
+                'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+                'level': record.levelname.lower(),
+                'msg': record.getMessage(),
+                **fields,
+            }, default=str)
+        text = ' '.join(f"{k}={v}" for k, v in fields.items())
+        return f"{self.formatTime(record)} {record.levelname:<7} {record.getMessage()} {text}".rstrip()
+
+
+_log = logging.getLogger('scanner')
+_log.setLevel(_LOG_LEVEL)
+_log.propagate = False
+_log_queue = queue.SimpleQueue()
+_log.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(_StructuredFormatter())
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+
+
+def _log_symbol(msg: str, level: int = logging.DEBUG, **fields):
+    """Per-symbol record. DEBUG ones are sampled at LOG_SYMBOL_SAMPLE;
+    warnings and errors are always emitted."""
+    if _log.isEnabledFor(level) and (level > logging.DEBUG or random.random() < _LOG_SYMBOL_SAMPLE):
+        _log.log(level, msg, extra={'fields': fields})
+
+
+def _log_scan_summary(endpoint: str, market: str, universe: str, elapsed: float,
+                      processed: int, matches: int, failed: list):
+    """The one record a finished scan writes; failed symbols are capped at 20."""
+    _log.info('scan finished', extra={'fields': {
+        'endpoint':   endpoint,
+        'market':     market,
+        'universe':   universe,
+        'seconds':    round(elapsed, 3),
+        'processed':  processed,
+        'matches':    matches,
+        'failed':     len(failed),
+        'failed_symbols': ','.join(failed[:20]) + (',...' if len(failed) > 20 else ''),
+        'symbols_per_s': round(processed / elapsed, 1) if elapsed > 0 else None,
+    }})
+
+
+# ── Metrics ──────────────────────────────────────────────────────────────────
+# Prometheus series for the hot paths, served at /metrics. Under gunicorn,
+# gunicorn.conf.py points PROMETHEUS_MULTIPROC_DIR at a shared directory;
+# every worker writes its samples there and the worker answering /metrics
+# sums them, so the numbers cover the whole instance. Without
+# prometheus_client installed the metrics below are no-ops.
+
+_METRICS_SAMPLE_INTERVAL = float(os.environ.get('METRICS_SAMPLE_INTERVAL', 1))
+
+
+class _NoMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+def _metric(kind: str, name: str, doc: str, labels=(), **kwargs):
+    if prometheus_client is None:
+        return _NoMetric()
+    return getattr(prometheus_client, kind)(name, doc, labels, **kwargs)
+
+
+_UPSTREAM_SECONDS = _metric(
+    'Histogram', 'upstream_request_seconds', 'Upstream HTTP request latency per attempt',
+    ('host', 'status'), buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15),
+)
+_SCAN_SECONDS = _metric(
+    'Histogram', 'scan_duration_seconds', 'Wall time of a /scan or /scan-stream scan',
+    ('endpoint', 'market', 'universe'), buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 40, 80),
+)
+_SCAN_RATE = _metric(
+    'Histogram', 'scan_symbols_per_second', 'Symbols screened per second of scan wall time',
+    ('market',), buckets=(5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+_SCAN_SYMBOLS = _metric('Counter', 'scan_symbols', 'Symbols screened by scans', ('market',))
+_SCAN_FAILURES = _metric('Counter', 'scan_failures', 'Symbols or scans that failed, by reason', ('market', 'reason'))
+_FETCH_QUEUE = _metric(
+    'Gauge', 'fetch_queue_depth', 'Fetch jobs waiting for a FETCH_CONCURRENCY thread', ('upstream',),
+    multiprocess_mode='livesum',
+)
+_SSE_STREAMS = _metric(
+    'Gauge', 'sse_streams_active', 'Open Server-Sent Events streams', ('stream',),
+    multiprocess_mode='livesum',
+)
+
+
+# market and universe come from the request; as labels they are limited to
+# known names, so made-up values can't create new series (which multiprocess
+# mode would keep in its files for good).
+
+def _metric_market(market: str) -> str:
+    return market if market in ('india', 'us', 'crypto') else 'other'
+
+
+def _metric_universe(market: str, universe: str) -> str:
+    if market == 'crypto':
+        known = universe in _CRYPTO_UNIVERSE_SIZES
+    else:
+        known = _metric_market(market) != 'other' and _universe_registry().has(market, universe)
+    return universe if known else 'other'
+
+
+def _observe_scan(endpoint: str, market: str, universe: str, started: float, symbols: int,
+                  matches: int = 0, failed=()):
+    """Record a finished scan's metrics and write its summary log record."""
+    elapsed = time.time() - started
+    _log_scan_summary(endpoint, market, universe, elapsed, symbols, matches, list(failed))
+    universe = _metric_universe(market, universe)
+    market = _metric_market(market)
+    _SCAN_SECONDS.labels(endpoint, market, universe).observe(elapsed)
+    _SCAN_SYMBOLS.labels(market).inc(symbols)
+    if symbols and elapsed > 0:
+        _SCAN_RATE.labels(market).observe(symbols / elapsed)
+
+
+def _metrics_sampler():
+    # Gauges in the multi-process directory are per-worker files; refresh ours
+    while True:
+        for upstream, executor in _fetch_executors.items():
+            _FETCH_QUEUE.labels(upstream).set(executor._work_queue.qsize())
+        time.sleep(_METRICS_SAMPLE_INTERVAL)
+
+
+if prometheus_client is not None:
+    threading.Thread(target=_metrics_sampler, name='metrics', daemon=True).start()
+
+# ── Price History Cache ──────────────────────────────────────────────────────
+# Process-wide cache of parsed price histories (Yahoo charts, Binance klines),
+# shared by every scan and every thread in this worker. Entries expire quickly
+# while the symbol's exchange is trading and slowly once it has closed.
+
+_PRICE_CACHE_MAX_BYTES  = int(float(os.environ.get('PRICE_CACHE_MAX_MB', 32)) * 1024 * 1024)
+_PRICE_CACHE_TTL_OPEN   = int(os.environ.get('PRICE_CACHE_TTL_OPEN', 120))     # seconds, during session
+_PRICE_CACHE_TTL_CLOSED = int(os.environ.get('PRICE_CACHE_TTL_CLOSED', 3600))  # seconds, after close
+
+_IST = timezone(timedelta(hours=5, minutes=30))
+try:
+    _ET = ZoneInfo('America/New_York')
+except Exception:
+    _ET = timezone(timedelta(hours=-5))   # no tzdata: fall back to EST
+
+
+def _market_is_open(symbol: str) -> bool:
+    """Rough regular-session check for the exchange a Yahoo symbol trades on."""
+    if symbol.endswith('-USD'):
+        return True                                    # crypto never closes
+    if symbol.endswith('.NS') or symbol.endswith('.BO') or symbol == '^NSEI':
+        now, open_t, close_t = datetime.now(_IST), (9, 15), (15, 30)
+    else:
+        now, open_t, close_t = datetime.now(_ET), (9, 30), (16, 0)
+    if now.weekday() >= 5:
+        return False
+    return open_t <= (now.hour, now.minute) < close_t
+
+
+def _history_ttl(symbol: str) -> int:
+    return _PRICE_CACHE_TTL_OPEN if _market_is_open(symbol) else _PRICE_CACHE_TTL_CLOSED
+
+
+def _estimate_history_bytes(history: dict) -> int:
+    """Approximate resident size of a parsed history (list slots + boxed numbers)."""
+    return 256 + 3 * len(history['timestamps']) * 40
+
+
+class _PriceCache:
+    """Thread-safe LRU of price histories, evicted by approximate byte size."""
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, value, ttl: int, size: int):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.time() + ttl, size, value)
+            self._bytes += size
+            while self._bytes > self._max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def expires_at(self, key) -> float:
+        """Expiry time of key (0 if absent), without touching LRU order or counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry else 0.0
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries':   len(self._entries),
+                'bytes':     self._bytes,
+                'max_bytes': self._max_bytes,
+                'hits':      self.hits,
+                'misses':    self.misses,
+                'evictions': self.evictions,
+                'hit_rate':  round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_price_cache = _PriceCache(_PRICE_CACHE_MAX_BYTES)
+
+
+# ── On-disk OHLCV Store ──────────────────────────────────────────────────────
+# SQLite file holding the daily bars behind the price cache, so a restarted or
+# freshly forked worker starts warm and both gunicorn workers see what either
+# one fetched. Opened lazily on first use; WAL mode lets the workers read
+# while one of them writes.
+
+_OHLCV_DB_PATH        = os.environ.get('OHLCV_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ohlcv.sqlite3'))
+_OHLCV_RETENTION_DAYS = int(os.environ.get('OHLCV_RETENTION_DAYS', 45))
+
+
+class _OhlcvStore:
+    """Daily bars and latest quote per (source, symbol), one connection per thread."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bars (
+            source  TEXT    NOT NULL,
+            symbol  TEXT    NOT NULL,
+            ts      INTEGER NOT NULL,
+            open    REAL,
+            close   REAL,
+            volume  REAL,
+            PRIMARY KEY (source, symbol, ts)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS quotes (
+            source     TEXT NOT NULL,
+            symbol     TEXT NOT NULL,
+            price      REAL,
+            volume     REAL,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (source, symbol)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id         TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            payload    TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS shards (
+            job_id     TEXT    NOT NULL,
+            shard      INTEGER NOT NULL,
+            symbols    TEXT    NOT NULL,
+            state      TEXT    NOT NULL,
+            owner      INTEGER,
+            claimed_at REAL,
+            created_at REAL    NOT NULL,
+            PRIMARY KEY (job_id, shard)
+        );
+        CREATE TABLE IF NOT EXISTS scan_jobs (
+            job_id     TEXT PRIMARY KEY,
+            done       INTEGER NOT NULL,
+            updated_at REAL    NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS scan_events (
+            job_id  TEXT    NOT NULL,
+            seq     INTEGER NOT NULL,
+            event   TEXT    NOT NULL,
+            payload TEXT    NOT NULL,
+            PRIMARY KEY (job_id, seq)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS scan_followers (
+            job_id      TEXT PRIMARY KEY,
+            followed_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(self._SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def save(self, source: str, symbol: str, history: dict, fetched_at: float = None):
+        """Replace stored bars from the history's first trading day on, and its quote.
+
+        Yahoo stamps a still-open daily candle with the last trade time, so
+        bars are replaced per UTC day rather than per exact timestamp.
+        Bars past the retention window are pruned.
+        """
+        opens = history.get('opens') or [None] * len(history['timestamps'])
+        volumes = history['volumes'] or [None] * len(history['timestamps'])
+        rows = [
+            (source, symbol, ts, o, c, v)
+            for ts, o, c, v in zip(history['timestamps'], opens, history['closes'], volumes)
+            if c is not None
+        ]
+        cutoff = int(time.time()) - _OHLCV_RETENTION_DAYS * 86400
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if rows:
+                conn.execute('DELETE FROM bars WHERE source = ? AND symbol = ? AND ts >= ?',
+                             (source, symbol, _day_start(rows[0][2])))
+            conn.executemany('INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?)', rows)
+            conn.execute('DELETE FROM bars WHERE source = ? AND symbol = ? AND ts < ?', (source, symbol, cutoff))
+            conn.execute(
+                'INSERT OR REPLACE INTO quotes VALUES (?, ?, ?, ?, ?)',
+                (source, symbol, history.get('price'), history.get('volume'), fetched_at or time.time()),
+            )
+
+    def load(self, source: str, symbol: str, since_ts: int):
+        """Return (history, fetched_at) for bars at or after since_ts, or None if unknown."""
+        conn = self._conn()
+        quote = conn.execute(
+            'SELECT price, volume, fetched_at FROM quotes WHERE source = ? AND symbol = ?', (source, symbol)
+        ).fetchone()
+        if quote is None:
+            return None
+        bars = conn.execute(
+            'SELECT ts, open, close, volume FROM bars WHERE source = ? AND symbol = ? AND ts >= ? ORDER BY ts',
+            (source, symbol, since_ts),
+        ).fetchall()
+        history = {
+            'timestamps': [b[0] for b in bars],
+            'opens':      [b[1] for b in bars],
+            'closes':     [b[2] for b in bars],
+            'volumes':    [b[3] for b in bars],
+            'price':      quote[0],
+            'volume':     quote[1],
+        }
+        return history, quote[2]
+
+
+    def save_snapshot(self, snapshot_id: str, created_at: float, payload: str, max_age: int):
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)', (snapshot_id, created_at, payload))
+            conn.execute('DELETE FROM snapshots WHERE created_at < ?', (time.time() - max_age,))
+
+    def load_snapshot(self, snapshot_id: str):
+        row = self._conn().execute(
+            'SELECT created_at, payload FROM snapshots WHERE id = ?', (snapshot_id,)
+        ).fetchone()
+        return row
+
+    def enqueue_shards(self, job_id: str, shards: dict, max_age: int):
+        """Queue {shard_no: [symbols]} for any worker to claim; drops abandoned jobs."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM shards WHERE created_at < ?', (now - max_age,))
+            conn.executemany(
+                "INSERT INTO shards VALUES (?, ?, ?, 'queued', NULL, NULL, ?)",
+                [(job_id, n, json.dumps(symbols), now) for n, symbols in shards.items()],
+            )
+
+    def claim_shard(self, stale_after: float, job_id: str = None):
+        """Claim the oldest queued shard, or one whose claimant went quiet.
+
+        Returns (job_id, shard_no, symbols) or None. job_id restricts the
+        search to one job; the job's originating worker uses that.
+        """
+        now = time.time()
+        conn = self._conn()
+        query = (
+            "SELECT job_id, shard, symbols FROM shards"
+            " WHERE (state = 'queued' OR (state = 'running' AND claimed_at < ?))"
+            " AND (? IS NULL OR job_id = ?)"
+            " ORDER BY created_at, shard LIMIT 1"
+        )
+        params = (now - stale_after, job_id, job_id)
+        # Idle polls stay plain WAL reads; the write lock is only taken
+        # when there is a shard to claim (and the pick is redone under it)
+        if conn.execute(query, params).fetchone() is None:
+            return None
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE shards SET state = 'running', owner = ?, claimed_at = ? WHERE job_id = ? AND shard = ?",
+                (os.getpid(), now, row[0], row[1]),
+            )
+        return row[0], row[1], json.loads(row[2])
+
+    def finish_shard(self, job_id: str, shard: int):
+        self._conn().execute(
+            "UPDATE shards SET state = 'done' WHERE job_id = ? AND shard = ?", (job_id, shard)
+        )
+
+    def shard_states(self, job_id: str) -> dict:
+        """{shard_no: state} for every shard still recorded for job_id."""
+        return dict(self._conn().execute(
+            'SELECT shard, state FROM shards WHERE job_id = ?', (job_id,)
+        ).fetchall())
+
+    def drop_shards(self, job_id: str):
+        self._conn().execute('DELETE FROM shards WHERE job_id = ?', (job_id,))
+
+    def append_job_events(self, job_id: str, first_seq: int, events: list, done: bool, max_age: int):
+        """Record events [(event, payload)] numbered from first_seq; drops expired jobs."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if first_seq == 1:
+                expired = 'SELECT job_id FROM scan_jobs WHERE updated_at < ?'
+                conn.execute(f'DELETE FROM scan_events WHERE job_id IN ({expired})', (now - max_age,))
+                conn.execute(f'DELETE FROM scan_followers WHERE job_id IN ({expired})', (now - max_age,))
+                conn.execute('DELETE FROM scan_jobs WHERE updated_at < ?', (now - max_age,))
+            conn.executemany(
+                'INSERT OR REPLACE INTO scan_events VALUES (?, ?, ?, ?)',
+                [(job_id, first_seq + i, event, payload) for i, (event, payload) in enumerate(events)],
+            )
+            conn.execute('INSERT OR REPLACE INTO scan_jobs VALUES (?, ?, ?)', (job_id, int(done), now))
+
+    def load_job_events(self, job_id: str, after_seq: int):
+        """(done, updated_at, [(seq, event, payload)] after after_seq), or None for unknown jobs."""
+        conn = self._conn()
+        job = conn.execute('SELECT done, updated_at FROM scan_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if job is None:
+            return None
+        events = conn.execute(
+            'SELECT seq, event, payload FROM scan_events WHERE job_id = ? AND seq > ? ORDER BY seq',
+            (job_id, after_seq),
+        ).fetchall()
+        return bool(job[0]), job[1], events
+
+    def touch_job_follower(self, job_id: str):
+        """Note that a client in this worker is following a job another worker runs."""
+        conn = self._conn()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO scan_followers VALUES (?, ?)', (job_id, time.time()))
+
+    def job_followed_at(self, job_id: str):
+        """When a client in another worker last followed the job, or None."""
+        row = self._conn().execute('SELECT followed_at FROM scan_followers WHERE job_id = ?', (job_id,)).fetchone()
+        return row[0] if row else None
+
+
+_ohlcv_store = _OhlcvStore(_OHLCV_DB_PATH)
+
+
+def _store_save(source: str, symbol: str, history: dict):
+    try:
+        _ohlcv_store.save(source, symbol, history)
+    except Exception as e:
+        _log_symbol('store save failed', logging.WARNING, source=source, symbol=symbol, error=str(e))
+
+
+def _store_load(source: str, symbol: str, since_ts: int):
+    try:
+        return _ohlcv_store.load(source, symbol, since_ts)
+    except Exception as e:
+        _log_symbol('store load failed', logging.WARNING, source=source, symbol=symbol, error=str(e))
+        return None
+
+
+def _adopt_stored(cache_key: tuple, stored, ttl: int, fresh_until: float = None):
+    """Put a stored (history, fetched_at) into the price cache if it is still within ttl.
+
+    fresh_until defaults to now; the pre-warmer passes its next-cycle horizon.
+    """
+    if stored is None:
+        return None
+    history, fetched_at = stored
+    remaining = fetched_at + ttl - time.time()
+    if fetched_at + ttl < (fresh_until or time.time()) or not history['timestamps']:
+        return None
+    _price_cache.put(cache_key, history, int(remaining), _estimate_history_bytes(history))
+    return history
+
+
+def _store_load_fresh(source: str, symbol: str, cache_key: tuple, ttl: int, since_ts: int, fresh_until: float = None):
+    """Load a stored history into the price cache if it is still within ttl."""
+    return _adopt_stored(cache_key, _store_load(source, symbol, since_ts), ttl, fresh_until)
+
+
+# ── Incremental (Delta) Fetch ────────────────────────────────────────────────
+# A stale stored series that reaches back far enough and ends recently is
+# topped up with only the bars since its last trading day, then merged.
+
+_DELTA_MAX_GAP_DAYS = 4
+
+
+def _day_start(ts: int) -> int:
+    return ts - ts % 86400
+
+
+def _delta_base(stored, covers_from: int):
+    """Return the stored history if a delta fetch can extend it, else None."""
+    if stored is None:
+        return None
+    history, _ = stored
+    timestamps = history['timestamps']
+    if not timestamps or timestamps[0] > covers_from:
+        return None
+    if timestamps[-1] < time.time() - _DELTA_MAX_GAP_DAYS * 86400:
+        return None
+    return history
+
+
+def _merge_history(base: dict, fresh: dict, keep_last: int = None) -> dict:
+    """Stored bars before fresh's first UTC day, followed by every fresh bar."""
+    n_fresh = len(fresh['timestamps'])
+    if not n_fresh:
+        return {**base, 'price': fresh.get('price') or base.get('price'), 'volume': fresh.get('volume') or base.get('volume')}
+    first_day = _day_start(fresh['timestamps'][0])
+    keep = sum(1 for ts in base['timestamps'] if ts < first_day)
+    merged = {
+        'timestamps': base['timestamps'][:keep] + fresh['timestamps'],
+        'opens':      (base.get('opens') or [None] * len(base['timestamps']))[:keep] + (fresh.get('opens') or [None] * n_fresh),
+        'closes':     base['closes'][:keep] + fresh['closes'],
+        'volumes':    base['volumes'][:keep] + fresh['volumes'],
+        'price':      fresh.get('price'),
+        'volume':     fresh.get('volume'),
+    }
+    if keep_last:
+        for k in ('timestamps', 'opens', 'closes', 'volumes'):
+            merged[k] = merged[k][-keep_last:]
+    return merged
+
+
 # Production CORS configuration
 if os.environ.get('RENDER') or os.environ.get('PORT'):
     # Production on Render
@@ -32,1405 +880,789 @@ if os.environ.get('RENDER') or os.environ.get('PORT'):
          methods=["GET", "POST", "OPTIONS"],
          allow_headers=["Content-Type", "Authorization"]
     )
-    print("Production CORS enabled for Vercel domains")
+    _log.info('production CORS enabled for Vercel domains')
 else:
     # Development
     CORS(app)
-    print("Development CORS enabled for all origins")
-
-# Comprehensive stock lists - manually curated and reliable
-def get_nifty_50_stocks():
-    """Nifty 50 stocks"""
-    return [
-        {'symbol': 'ADANIENT.NS', 'name': 'Adani Enterprises', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'ADANIPORTS.NS', 'name': 'Adani Ports and Special Economic Zone', 'sector': 'infrastructure', 'marketCap': 'large'},
-        {'symbol': 'APOLLOHOSP.NS', 'name': 'Apollo Hospitals Enterprise', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'ASIANPAINT.NS', 'name': 'Asian Paints', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'AXISBANK.NS', 'name': 'Axis Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJAJ-AUTO.NS', 'name': 'Bajaj Auto', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'BAJAJFINSV.NS', 'name': 'Bajaj Finserv', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJFINANCE.NS', 'name': 'Bajaj Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BEL.NS', 'name': 'Bharat Electronics', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'BHARTIARTL.NS', 'name': 'Bharti Airtel', 'sector': 'telecom', 'marketCap': 'large'},
-        {'symbol': 'CIPLA.NS', 'name': 'Cipla', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'COALINDIA.NS', 'name': 'Coal India', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'DRREDDY.NS', 'name': "Dr. Reddy's Laboratories", 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'EICHERMOT.NS', 'name': 'Eicher Motors', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'ETERNAL.NS', 'name': 'Eternal', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'GRASIM.NS', 'name': 'Grasim Industries', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'HCLTECH.NS', 'name': 'HCL Technologies', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'HDFCBANK.NS', 'name': 'HDFC Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'HDFCLIFE.NS', 'name': 'HDFC Life Insurance Company', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'HINDALCO.NS', 'name': 'Hindalco Industries', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'HINDUNILVR.NS', 'name': 'Hindustan Unilever', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'ICICIBANK.NS', 'name': 'ICICI Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'INDIGO.NS', 'name': 'InterGlobe Aviation', 'sector': 'infrastructure', 'marketCap': 'large'},
-        {'symbol': 'INFY.NS', 'name': 'Infosys', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'ITC.NS', 'name': 'ITC', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'JIOFIN.NS', 'name': 'Jio Financial Services', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'JSWSTEEL.NS', 'name': 'JSW Steel', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'KOTAKBANK.NS', 'name': 'Kotak Mahindra Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'LT.NS', 'name': 'Larsen & Toubro', 'sector': 'construction', 'marketCap': 'large'},
-        {'symbol': 'M&M.NS', 'name': 'Mahindra & Mahindra', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'MARUTI.NS', 'name': 'Maruti Suzuki India', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'MAXHEALTH.NS', 'name': 'Max Healthcare Institute', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'NESTLEIND.NS', 'name': 'Nestle India', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'NTPC.NS', 'name': 'NTPC', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ONGC.NS', 'name': 'Oil & Natural Gas Corporation', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'POWERGRID.NS', 'name': 'Power Grid Corporation of India', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'RELIANCE.NS', 'name': 'Reliance Industries', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'SBILIFE.NS', 'name': 'SBI Life Insurance Company', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'SBIN.NS', 'name': 'State Bank of India', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'SHRIRAMFIN.NS', 'name': 'Shriram Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'SUNPHARMA.NS', 'name': 'Sun Pharmaceutical Industries', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'TATACONSUM.NS', 'name': 'Tata Consumer Products', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'TATASTEEL.NS', 'name': 'Tata Steel', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'TCS.NS', 'name': 'Tata Consultancy Services', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'TECHM.NS', 'name': 'Tech Mahindra', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'TITAN.NS', 'name': 'Titan Company', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'TMPV.NS', 'name': 'Tata Motors Passenger Vehicles', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'TRENT.NS', 'name': 'Trent', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'ULTRACEMCO.NS', 'name': 'UltraTech Cement', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'WIPRO.NS', 'name': 'Wipro', 'sector': 'it', 'marketCap': 'large'},
-    ]
-
-def get_nifty_100_stocks():
-    """Nifty 100 stocks"""
-    return [
-        {'symbol': 'ABB.NS', 'name': 'ABB India', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'ADANIENSOL.NS', 'name': 'Adani Energy Solutions', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ADANIENT.NS', 'name': 'Adani Enterprises', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'ADANIGREEN.NS', 'name': 'Adani Green Energy', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ADANIPORTS.NS', 'name': 'Adani Ports and Special Economic Zone', 'sector': 'infrastructure', 'marketCap': 'large'},
-        {'symbol': 'ADANIPOWER.NS', 'name': 'Adani Power', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'AMBUJACEM.NS', 'name': 'Ambuja Cements', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'APOLLOHOSP.NS', 'name': 'Apollo Hospitals Enterprise', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'ASIANPAINT.NS', 'name': 'Asian Paints', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'AXISBANK.NS', 'name': 'Axis Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJAJ-AUTO.NS', 'name': 'Bajaj Auto', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'BAJAJFINSV.NS', 'name': 'Bajaj Finserv', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJAJHLDNG.NS', 'name': 'Bajaj Holdings & Investment', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJFINANCE.NS', 'name': 'Bajaj Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BANKBARODA.NS', 'name': 'Bank of Baroda', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BEL.NS', 'name': 'Bharat Electronics', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'BHARTIARTL.NS', 'name': 'Bharti Airtel', 'sector': 'telecom', 'marketCap': 'large'},
-        {'symbol': 'BOSCHLTD.NS', 'name': 'Bosch', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'BPCL.NS', 'name': 'Bharat Petroleum Corporation', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'BRITANNIA.NS', 'name': 'Britannia Industries', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'CANBK.NS', 'name': 'Canara Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'CGPOWER.NS', 'name': 'CG Power and Industrial Solutions', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'CHOLAFIN.NS', 'name': 'Cholamandalam Investment and Finance Company', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'CIPLA.NS', 'name': 'Cipla', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'COALINDIA.NS', 'name': 'Coal India', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'CUMMINSIND.NS', 'name': 'Cummins India', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'DIVISLAB.NS', 'name': "Divi's Laboratories", 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'DLF.NS', 'name': 'DLF', 'sector': 'realty', 'marketCap': 'large'},
-        {'symbol': 'DMART.NS', 'name': 'Avenue Supermarts', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'DRREDDY.NS', 'name': "Dr. Reddy's Laboratories", 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'EICHERMOT.NS', 'name': 'Eicher Motors', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'ENRIN.NS', 'name': 'Siemens Energy India', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ETERNAL.NS', 'name': 'Eternal', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'GAIL.NS', 'name': 'GAIL (India)', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'GODREJCP.NS', 'name': 'Godrej Consumer Products', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'GRASIM.NS', 'name': 'Grasim Industries', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'HAL.NS', 'name': 'Hindustan Aeronautics', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'HCLTECH.NS', 'name': 'HCL Technologies', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'HDFCAMC.NS', 'name': 'HDFC Asset Management Company', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'HDFCBANK.NS', 'name': 'HDFC Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'HDFCLIFE.NS', 'name': 'HDFC Life Insurance Company', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'HINDALCO.NS', 'name': 'Hindalco Industries', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'HINDUNILVR.NS', 'name': 'Hindustan Unilever', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'HINDZINC.NS', 'name': 'Hindustan Zinc', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'HYUNDAI.NS', 'name': 'Hyundai Motor India', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'ICICIBANK.NS', 'name': 'ICICI Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'INDHOTEL.NS', 'name': 'Indian Hotels Co.', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'INDIGO.NS', 'name': 'InterGlobe Aviation', 'sector': 'infrastructure', 'marketCap': 'large'},
-        {'symbol': 'INFY.NS', 'name': 'Infosys', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'IOC.NS', 'name': 'Indian Oil Corporation', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'IRFC.NS', 'name': 'Indian Railway Finance Corporation', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'ITC.NS', 'name': 'ITC', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'JINDALSTEL.NS', 'name': 'Jindal Steel & Power', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'JIOFIN.NS', 'name': 'Jio Financial Services', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'JSWSTEEL.NS', 'name': 'JSW Steel', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'KOTAKBANK.NS', 'name': 'Kotak Mahindra Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'LODHA.NS', 'name': 'Lodha Developers', 'sector': 'realty', 'marketCap': 'large'},
-        {'symbol': 'LT.NS', 'name': 'Larsen & Toubro', 'sector': 'construction', 'marketCap': 'large'},
-        {'symbol': 'LTM.NS', 'name': 'LTM (formerly LTIMindtree)', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'M&M.NS', 'name': 'Mahindra & Mahindra', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'MARUTI.NS', 'name': 'Maruti Suzuki India', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'MAXHEALTH.NS', 'name': 'Max Healthcare Institute', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'MAZDOCK.NS', 'name': 'Mazagon Dock Shipbuilders', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'MOTHERSON.NS', 'name': 'Samvardhana Motherson International', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'MUTHOOTFIN.NS', 'name': 'Muthoot Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'NESTLEIND.NS', 'name': 'Nestle India', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'NTPC.NS', 'name': 'NTPC', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ONGC.NS', 'name': 'Oil & Natural Gas Corporation', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'PFC.NS', 'name': 'Power Finance Corporation', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'PIDILITIND.NS', 'name': 'Pidilite Industries', 'sector': 'chemicals', 'marketCap': 'large'},
-        {'symbol': 'PNB.NS', 'name': 'Punjab National Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'POWERGRID.NS', 'name': 'Power Grid Corporation of India', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'RECLTD.NS', 'name': 'REC', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'RELIANCE.NS', 'name': 'Reliance Industries', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'SBILIFE.NS', 'name': 'SBI Life Insurance Company', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'SBIN.NS', 'name': 'State Bank of India', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'SHREECEM.NS', 'name': 'Shree Cement', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'SHRIRAMFIN.NS', 'name': 'Shriram Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'SIEMENS.NS', 'name': 'Siemens', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'SOLARINDS.NS', 'name': 'Solar Industries India', 'sector': 'chemicals', 'marketCap': 'large'},
-        {'symbol': 'SUNPHARMA.NS', 'name': 'Sun Pharmaceutical Industries', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'TATACAP.NS', 'name': 'Tata Capital', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'TATACONSUM.NS', 'name': 'Tata Consumer Products', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'TATAPOWER.NS', 'name': 'Tata Power Co.', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'TATASTEEL.NS', 'name': 'Tata Steel', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'TCS.NS', 'name': 'Tata Consultancy Services', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'TECHM.NS', 'name': 'Tech Mahindra', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'TITAN.NS', 'name': 'Titan Company', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'TMCV.NS', 'name': 'Tata Motors (Commercial Vehicles)', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'TMPV.NS', 'name': 'Tata Motors Passenger Vehicles', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'TORNTPHARM.NS', 'name': 'Torrent Pharmaceuticals', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'TRENT.NS', 'name': 'Trent', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'TVSMOTOR.NS', 'name': 'TVS Motor Company', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'ULTRACEMCO.NS', 'name': 'UltraTech Cement', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'UNIONBANK.NS', 'name': 'Union Bank of India', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'UNITDSPR.NS', 'name': 'United Spirits', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'VBL.NS', 'name': 'Varun Beverages', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'VEDL.NS', 'name': 'Vedanta', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'WIPRO.NS', 'name': 'Wipro', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'ZYDUSLIFE.NS', 'name': 'Zydus Lifesciences', 'sector': 'healthcare', 'marketCap': 'large'},
-    ]
-
-def get_nifty_200_stocks():
-    """Nifty 200 stocks - comprehensive list of top 200 Indian companies"""
-    return [
-        {'symbol': 'ABB.NS', 'name': 'ABB India', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'ACC.NS', 'name': 'ACC', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'APLAPOLLO.NS', 'name': 'APL Apollo Tubes', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'AUBANK.NS', 'name': 'AU Small Finance Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'ADANIENSOL.NS', 'name': 'Adani Energy Solutions', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ADANIENT.NS', 'name': 'Adani Enterprises', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'ADANIGREEN.NS', 'name': 'Adani Green Energy', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ADANIPORTS.NS', 'name': 'Adani Ports and Special Economic Zone', 'sector': 'infrastructure', 'marketCap': 'large'},
-        {'symbol': 'ADANIPOWER.NS', 'name': 'Adani Power', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ATGL.NS', 'name': 'Adani Total Gas', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ABCAPITAL.NS', 'name': 'Aditya Birla Capital', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'ABFRL.NS', 'name': 'Aditya Birla Fashion and Retail', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'ALKEM.NS', 'name': 'Alkem Laboratories', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'AMBUJACEM.NS', 'name': 'Ambuja Cements', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'APOLLOHOSP.NS', 'name': 'Apollo Hospitals Enterprise', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'APOLLOTYRE.NS', 'name': 'Apollo Tyres', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'ASHOKLEY.NS', 'name': 'Ashok Leyland', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'ASIANPAINT.NS', 'name': 'Asian Paints', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'ASTRAL.NS', 'name': 'Astral', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'AUROPHARMA.NS', 'name': 'Aurobindo Pharma', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'DMART.NS', 'name': 'Avenue Supermarts', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'AXISBANK.NS', 'name': 'Axis Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BSE.NS', 'name': 'BSE', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJAJ-AUTO.NS', 'name': 'Bajaj Auto', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'BAJFINANCE.NS', 'name': 'Bajaj Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJAJFINSV.NS', 'name': 'Bajaj Finserv', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJAJHLDNG.NS', 'name': 'Bajaj Holdings & Investment', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BAJAJHFL.NS', 'name': 'Bajaj Housing Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BANDHANBNK.NS', 'name': 'Bandhan Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BANKBARODA.NS', 'name': 'Bank of Baroda', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BANKINDIA.NS', 'name': 'Bank of India', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'MAHABANK.NS', 'name': 'Bank of Maharashtra', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'BDL.NS', 'name': 'Bharat Dynamics', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'BEL.NS', 'name': 'Bharat Electronics', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'BHARATFORG.NS', 'name': 'Bharat Forge', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'BHEL.NS', 'name': 'Bharat Heavy Electricals', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'BPCL.NS', 'name': 'Bharat Petroleum Corporation', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'BHARTIARTL.NS', 'name': 'Bharti Airtel', 'sector': 'telecom', 'marketCap': 'large'},
-        {'symbol': 'BHARTIHEXA.NS', 'name': 'Bharti Hexacom', 'sector': 'telecom', 'marketCap': 'large'},
-        {'symbol': 'BIOCON.NS', 'name': 'Biocon', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'BOSCHLTD.NS', 'name': 'Bosch', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'BRITANNIA.NS', 'name': 'Britannia Industries', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'CGPOWER.NS', 'name': 'CG Power and Industrial Solutions', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'CANBK.NS', 'name': 'Canara Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'CHOLAFIN.NS', 'name': 'Cholamandalam Investment and Finance Company', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'CIPLA.NS', 'name': 'Cipla', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'COALINDIA.NS', 'name': 'Coal India', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'COCHINSHIP.NS', 'name': 'Cochin Shipyard', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'COFORGE.NS', 'name': 'Coforge', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'COLPAL.NS', 'name': 'Colgate Palmolive (India)', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'CONCOR.NS', 'name': 'Container Corporation of India', 'sector': 'infrastructure', 'marketCap': 'mid'},
-        {'symbol': 'CUMMINSIND.NS', 'name': 'Cummins India', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'DLF.NS', 'name': 'DLF', 'sector': 'realty', 'marketCap': 'mid'},
-        {'symbol': 'DABUR.NS', 'name': 'Dabur India', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'DIVISLAB.NS', 'name': 'Divi\'s Laboratories', 'sector': 'healthcare', 'marketCap': 'mid'},
-        {'symbol': 'DIXON.NS', 'name': 'Dixon Technologies (India)', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'DRREDDY.NS', 'name': 'Dr. Reddy\'s Laboratories', 'sector': 'healthcare', 'marketCap': 'mid'},
-        {'symbol': 'EICHERMOT.NS', 'name': 'Eicher Motors', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'ESCORTS.NS', 'name': 'Escorts Kubota', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'ETERNAL.NS', 'name': 'Eternal', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'EXIDEIND.NS', 'name': 'Exide Industries', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'NYKAA.NS', 'name': 'FSN E-Commerce Ventures', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'FEDERALBNK.NS', 'name': 'Federal Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'GAIL.NS', 'name': 'GAIL (India)', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'GMRAIRPORT.NS', 'name': 'GMR Airports', 'sector': 'infrastructure', 'marketCap': 'mid'},
-        {'symbol': 'GLENMARK.NS', 'name': 'Glenmark Pharmaceuticals', 'sector': 'healthcare', 'marketCap': 'mid'},
-        {'symbol': 'GODREJCP.NS', 'name': 'Godrej Consumer Products', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'GODREJPROP.NS', 'name': 'Godrej Properties', 'sector': 'realty', 'marketCap': 'mid'},
-        {'symbol': 'GRASIM.NS', 'name': 'Grasim Industries', 'sector': 'cement', 'marketCap': 'mid'},
-        {'symbol': 'HCLTECH.NS', 'name': 'HCL Technologies', 'sector': 'it', 'marketCap': 'mid'},
-        {'symbol': 'HDFCAMC.NS', 'name': 'HDFC Asset Management Company', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'HDFCBANK.NS', 'name': 'HDFC Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'HDFCLIFE.NS', 'name': 'HDFC Life Insurance Company', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'HAVELLS.NS', 'name': 'Havells India', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'HEROMOTOCO.NS', 'name': 'Hero MotoCorp', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'HINDALCO.NS', 'name': 'Hindalco Industries', 'sector': 'metals', 'marketCap': 'mid'},
-        {'symbol': 'HAL.NS', 'name': 'Hindustan Aeronautics', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'HINDPETRO.NS', 'name': 'Hindustan Petroleum Corporation', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'HINDUNILVR.NS', 'name': 'Hindustan Unilever', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'HINDZINC.NS', 'name': 'Hindustan Zinc', 'sector': 'metals', 'marketCap': 'mid'},
-        {'symbol': 'HUDCO.NS', 'name': 'Housing & Urban Development Corporation', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'HYUNDAI.NS', 'name': 'Hyundai Motor India', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'ICICIBANK.NS', 'name': 'ICICI Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'ICICIGI.NS', 'name': 'ICICI Lombard General Insurance Company', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'ICICIPRULI.NS', 'name': 'ICICI Prudential Life Insurance Company', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'IDFCFIRSTB.NS', 'name': 'IDFC First Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'IRB.NS', 'name': 'IRB Infrastructure Developers', 'sector': 'construction', 'marketCap': 'mid'},
-        {'symbol': 'ITC.NS', 'name': 'ITC', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'INDIANB.NS', 'name': 'Indian Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'INDHOTEL.NS', 'name': 'Indian Hotels Co.', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'IOC.NS', 'name': 'Indian Oil Corporation', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'IRCTC.NS', 'name': 'Indian Railway Catering And Tourism Corporation', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'IRFC.NS', 'name': 'Indian Railway Finance Corporation', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'IREDA.NS', 'name': 'Indian Renewable Energy Development Agency', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'IGL.NS', 'name': 'Indraprastha Gas', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'INDUSTOWER.NS', 'name': 'Indus Towers', 'sector': 'telecom', 'marketCap': 'mid'},
-        {'symbol': 'INDUSINDBK.NS', 'name': 'IndusInd Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'NAUKRI.NS', 'name': 'Info Edge (India)', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'INFY.NS', 'name': 'Infosys', 'sector': 'it', 'marketCap': 'mid'},
-        {'symbol': 'INDIGO.NS', 'name': 'InterGlobe Aviation', 'sector': 'infrastructure', 'marketCap': 'mid'},
-        {'symbol': 'JSWENERGY.NS', 'name': 'JSW Energy', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'JSWINFRA.NS', 'name': 'JSW Infrastructure', 'sector': 'infrastructure', 'marketCap': 'small'},
-        {'symbol': 'JSWSTEEL.NS', 'name': 'JSW Steel', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'JINDALSTEL.NS', 'name': 'Jindal Steel & Power', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'JIOFIN.NS', 'name': 'Jio Financial Services', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'JUBLFOOD.NS', 'name': 'Jubilant FoodWorks', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'KPITTECH.NS', 'name': 'KPIT Technologies', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'KANSAINER.NS', 'name': 'Kansai Nerolac Paints', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'KEI.NS', 'name': 'KEI Industries', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'KOTAKBANK.NS', 'name': 'Kotak Mahindra Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'LTIM.NS', 'name': 'LTIMindtree', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'LTTS.NS', 'name': 'L&T Technology Services', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'LT.NS', 'name': 'Larsen & Toubro', 'sector': 'construction', 'marketCap': 'small'},
-        {'symbol': 'LICHSGFIN.NS', 'name': 'LIC Housing Finance', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'LICI.NS', 'name': 'Life Insurance Corporation of India', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'LODHA.NS', 'name': 'Lodha Developers', 'sector': 'realty', 'marketCap': 'small'},
-        {'symbol': 'LUPIN.NS', 'name': 'Lupin', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'M&M.NS', 'name': 'Mahindra & Mahindra', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'M&MFIN.NS', 'name': 'Mahindra & Mahindra Financial Services', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'MFSL.NS', 'name': 'Max Financial Services', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'MGL.NS', 'name': 'Mahanagar Gas', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'MAHINDCIE.NS', 'name': 'Mahindra CIE Automotive', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'MANAPPURAM.NS', 'name': 'Manappuram Finance', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'MARICO.NS', 'name': 'Marico', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'MARUTI.NS', 'name': 'Maruti Suzuki India', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'METROPOLIS.NS', 'name': 'Metropolis Healthcare', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'MRF.NS', 'name': 'MRF', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'MOTHERSON.NS', 'name': 'Samvardhana Motherson International', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'MPHASIS.NS', 'name': 'Mphasis', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'MRPL.NS', 'name': 'Mangalore Refinery and Petrochemicals', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'MUTHOOTFIN.NS', 'name': 'Muthoot Finance', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'NATIONALUM.NS', 'name': 'National Aluminium Company', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'NIACL.NS', 'name': 'The New India Assurance Company', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'NMDC.NS', 'name': 'NMDC', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'NTPC.NS', 'name': 'NTPC', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'NESTLEIND.NS', 'name': 'Nestle India', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'OBEROIRLTY.NS', 'name': 'Oberoi Realty', 'sector': 'realty', 'marketCap': 'small'},
-        {'symbol': 'ONGC.NS', 'name': 'Oil & Natural Gas Corporation', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'OIL.NS', 'name': 'Oil India', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'PAYTM.NS', 'name': 'One 97 Communications', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'PAGEIND.NS', 'name': 'Page Industries', 'sector': 'textiles', 'marketCap': 'small'},
-        {'symbol': 'PERSISTENT.NS', 'name': 'Persistent Systems', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'PETRONET.NS', 'name': 'Petronet LNG', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'PFIZER.NS', 'name': 'Pfizer', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'PIDILITIND.NS', 'name': 'Pidilite Industries', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'PIIND.NS', 'name': 'PI Industries', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'PFC.NS', 'name': 'Power Finance Corporation', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'POWERGRID.NS', 'name': 'Power Grid Corporation of India', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'PRESTIGE.NS', 'name': 'Prestige Estates Projects', 'sector': 'realty', 'marketCap': 'small'},
-        {'symbol': 'PVRINOX.NS', 'name': 'PVR INOX', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'PNB.NS', 'name': 'Punjab National Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'POLYCAB.NS', 'name': 'Polycab India', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'RBLBANK.NS', 'name': 'RBL Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'RECLTD.NS', 'name': 'REC', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'RELIANCE.NS', 'name': 'Reliance Industries', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'SAIL.NS', 'name': 'Steel Authority of India', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'SBICARD.NS', 'name': 'SBI Cards and Payment Services', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'SBILIFE.NS', 'name': 'SBI Life Insurance Company', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'SJVN.NS', 'name': 'SJVN', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'SKFINDIA.NS', 'name': 'SKF India', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'SOBHA.NS', 'name': 'Sobha', 'sector': 'realty', 'marketCap': 'small'},
-        {'symbol': 'SOLARINDS.NS', 'name': 'Solar Industries India', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'SONACOMS.NS', 'name': 'Sona BLW Precision Forgings', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'SHREECEM.NS', 'name': 'Shree Cement', 'sector': 'cement', 'marketCap': 'small'},
-        {'symbol': 'SHRIRAMFIN.NS', 'name': 'Shriram Finance', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'SIEMENS.NS', 'name': 'Siemens', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'SBIN.NS', 'name': 'State Bank of India', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'SUNPHARMA.NS', 'name': 'Sun Pharmaceutical Industries', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'SUNTV.NS', 'name': 'Sun TV Network', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'SWIGGY.NS', 'name': 'Swiggy', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'SYMPHONY.NS', 'name': 'Symphony', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'SYNGENE.NS', 'name': 'Syngene International', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'TVSMOTOR.NS', 'name': 'TVS Motor Company', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'TCS.NS', 'name': 'Tata Consultancy Services', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'TATACOMM.NS', 'name': 'Tata Communications', 'sector': 'telecom', 'marketCap': 'small'},
-        {'symbol': 'TATACONSUM.NS', 'name': 'Tata Consumer Products', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'TATAELXSI.NS', 'name': 'Tata Elxsi', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'TATAMOTORS.NS', 'name': 'Tata Motors', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'TATAPOWER.NS', 'name': 'Tata Power Co.', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'TATASTEEL.NS', 'name': 'Tata Steel', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'TECHM.NS', 'name': 'Tech Mahindra', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'THERMAX.NS', 'name': 'Thermax', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'TIINDIA.NS', 'name': 'Tube Investments of India', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'TITAN.NS', 'name': 'Titan Company', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'TORNTPHARM.NS', 'name': 'Torrent Pharmaceuticals', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'TRENT.NS', 'name': 'Trent', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'TTML.NS', 'name': 'Tata Teleservices (Maharashtra)', 'sector': 'telecom', 'marketCap': 'small'},
-        {'symbol': 'UBL.NS', 'name': 'United Breweries', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'ULTRACEMCO.NS', 'name': 'UltraTech Cement', 'sector': 'cement', 'marketCap': 'small'},
-        {'symbol': 'UNIONBANK.NS', 'name': 'Union Bank of India', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'UNITDSPR.NS', 'name': 'United Spirits', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'UPL.NS', 'name': 'UPL', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'VBL.NS', 'name': 'Varun Beverages', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'VEDL.NS', 'name': 'Vedanta', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'VINATIORGA.NS', 'name': 'Vinati Organics', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'VOLTAS.NS', 'name': 'Voltas', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'WHIRLPOOL.NS', 'name': 'Whirlpool of India', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'WIPRO.NS', 'name': 'Wipro', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'YESBANK.NS', 'name': 'Yes Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'ZYDUSLIFE.NS', 'name': 'Zydus Lifesciences', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'ETERNAL.NS', 'name': 'Zomato', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'ZEEL.NS', 'name': 'Zee Entertainment Enterprises', 'sector': 'consumer', 'marketCap': 'small'}
-    ]
-    
-def get_nifty_500_stocks():
-    """Nifty 500 stocks - comprehensive list of top 500+ Indian companies"""
-    return [
-        # Large Cap (1-50)
-        {'symbol': '360ONE.NS', 'name': '360 ONE WAM', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': '3MINDIA.NS', 'name': '3M India', 'sector': 'diversified', 'marketCap': 'large'},
-        {'symbol': 'ABB.NS', 'name': 'ABB India', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'ACC.NS', 'name': 'ACC', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'ACMESOLAR.NS', 'name': 'ACME Solar Holdings', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'AIAENG.NS', 'name': 'AIA Engineering', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'APLAPOLLO.NS', 'name': 'APL Apollo Tubes', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'AUBANK.NS', 'name': 'AU Small Finance Bank', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'AWL.NS', 'name': 'AWL Agri Business', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'AADHARHFC.NS', 'name': 'Aadhar Housing Finance', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'AARTIIND.NS', 'name': 'Aarti Industries', 'sector': 'chemicals', 'marketCap': 'large'},
-        {'symbol': 'AAVAS.NS', 'name': 'Aavas Financiers', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'ABCAPITAL.NS', 'name': 'Aditya Birla Capital', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'ABFRL.NS', 'name': 'Aditya Birla Fashion and Retail', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'ADANIENSOL.NS', 'name': 'Adani Energy Solutions', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ADANIENT.NS', 'name': 'Adani Enterprises', 'sector': 'metals', 'marketCap': 'large'},
-        {'symbol': 'ADANIGREEN.NS', 'name': 'Adani Green Energy', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ADANIPORTS.NS', 'name': 'Adani Ports and Special Economic Zone', 'sector': 'infrastructure', 'marketCap': 'large'},
-        {'symbol': 'ADANIPOWER.NS', 'name': 'Adani Power', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'ATGL.NS', 'name': 'Adani Total Gas', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'AWL.NS', 'name': 'Adani Wilmar', 'sector': 'fmcg', 'marketCap': 'large'},
-        {'symbol': 'AEGISLOG.NS', 'name': 'Aegis Logistics', 'sector': 'energy', 'marketCap': 'large'},
-        {'symbol': 'AETHER.NS', 'name': 'Aether Industries', 'sector': 'chemicals', 'marketCap': 'large'},
-        {'symbol': 'AFFLE.NS', 'name': 'Affle (India)', 'sector': 'it', 'marketCap': 'large'},
-        {'symbol': 'AJANTPHARM.NS', 'name': 'Ajanta Pharma', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'AKZOINDIA.NS', 'name': 'Akzo Nobel India', 'sector': 'chemicals', 'marketCap': 'large'},
-        {'symbol': 'ALKEM.NS', 'name': 'Alkem Laboratories', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'ALKYLAMINE.NS', 'name': 'Alkyl Amines Chemicals', 'sector': 'chemicals', 'marketCap': 'large'},
-        {'symbol': 'ALLCARGO.NS', 'name': 'Allcargo Logistics', 'sector': 'infrastructure', 'marketCap': 'large'},
-        {'symbol': 'ALOKINDS.NS', 'name': 'Alok Industries', 'sector': 'textiles', 'marketCap': 'large'},
-        {'symbol': 'AMBER.NS', 'name': 'Amber Enterprises India', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'AMBUJACEM.NS', 'name': 'Ambuja Cements', 'sector': 'cement', 'marketCap': 'large'},
-        {'symbol': 'ANANTRAJ.NS', 'name': 'Anant Raj', 'sector': 'realty', 'marketCap': 'large'},
-        {'symbol': 'ANGELONE.NS', 'name': 'Angel One', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'APARINDS.NS', 'name': 'Apar Industries', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'APOLLOHOSP.NS', 'name': 'Apollo Hospitals Enterprise', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'APOLLOTYRE.NS', 'name': 'Apollo Tyres', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'APTUS.NS', 'name': 'Aptus Value Housing Finance India', 'sector': 'banking', 'marketCap': 'large'},
-        {'symbol': 'ASAHIINDIA.NS', 'name': 'Asahi India Glass', 'sector': 'auto', 'marketCap': 'large'},
-        {'symbol': 'ASHOKLEY.NS', 'name': 'Ashok Leyland', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'ASIANPAINT.NS', 'name': 'Asian Paints', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'ASTERDM.NS', 'name': 'Aster DM Healthcare', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'ASTRAL.NS', 'name': 'Astral', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'ASTRAZEN.NS', 'name': 'AstraZeneca Pharma India', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'ATLANTAA.NS', 'name': 'Atlantaa', 'sector': 'capital_goods', 'marketCap': 'large'},
-        {'symbol': 'ATUL.NS', 'name': 'Atul', 'sector': 'chemicals', 'marketCap': 'large'},
-        {'symbol': 'AUROPHARMA.NS', 'name': 'Aurobindo Pharma', 'sector': 'healthcare', 'marketCap': 'large'},
-        {'symbol': 'DMART.NS', 'name': 'Avenue Supermarts', 'sector': 'consumer', 'marketCap': 'large'},
-        {'symbol': 'AXISBANK.NS', 'name': 'Axis Bank', 'sector': 'banking', 'marketCap': 'large'},
-        
-        # Mid Cap (51-100)
-        {'symbol': 'BSE.NS', 'name': 'BSE', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BAJAJ-AUTO.NS', 'name': 'Bajaj Auto', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'BAJFINANCE.NS', 'name': 'Bajaj Finance', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BAJAJFINSV.NS', 'name': 'Bajaj Finserv', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BAJAJHLDNG.NS', 'name': 'Bajaj Holdings & Investment', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BAJAJHFL.NS', 'name': 'Bajaj Housing Finance', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BALKRISIND.NS', 'name': 'Balkrishna Industries', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'BALRAMCHIN.NS', 'name': 'Balrampur Chini Mills', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'BANDHANBNK.NS', 'name': 'Bandhan Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BANKBARODA.NS', 'name': 'Bank of Baroda', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BANKINDIA.NS', 'name': 'Bank of India', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'MAHABANK.NS', 'name': 'Bank of Maharashtra', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'BASF.NS', 'name': 'BASF India', 'sector': 'chemicals', 'marketCap': 'mid'},
-        {'symbol': 'BATAINDIA.NS', 'name': 'Bata India', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'BAYERCROP.NS', 'name': 'Bayer CropScience', 'sector': 'chemicals', 'marketCap': 'mid'},
-        {'symbol': 'BDL.NS', 'name': 'Bharat Dynamics', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'BEL.NS', 'name': 'Bharat Electronics', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'BHARATFORG.NS', 'name': 'Bharat Forge', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'BHEL.NS', 'name': 'Bharat Heavy Electricals', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'BPCL.NS', 'name': 'Bharat Petroleum Corporation', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'BHARTIARTL.NS', 'name': 'Bharti Airtel', 'sector': 'telecom', 'marketCap': 'mid'},
-        {'symbol': 'BHARTIHEXA.NS', 'name': 'Bharti Hexacom', 'sector': 'telecom', 'marketCap': 'mid'},
-        {'symbol': 'BIKAJI.NS', 'name': 'Bikaji Foods International', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'BIOCON.NS', 'name': 'Biocon', 'sector': 'healthcare', 'marketCap': 'mid'},
-        {'symbol': 'BIRLACORPN.NS', 'name': 'Birla Corporation', 'sector': 'cement', 'marketCap': 'mid'},
-        {'symbol': 'BSOFT.NS', 'name': 'Birlasoft', 'sector': 'it', 'marketCap': 'mid'},
-        {'symbol': 'BLISSGVS.NS', 'name': 'Bliss GVS Pharma', 'sector': 'healthcare', 'marketCap': 'mid'},
-        {'symbol': 'BLUEDART.NS', 'name': 'Blue Dart Express', 'sector': 'infrastructure', 'marketCap': 'mid'},
-        {'symbol': 'BLUESTARCO.NS', 'name': 'Blue Star', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'BOSCHLTD.NS', 'name': 'Bosch', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'BRIGADE.NS', 'name': 'Brigade Enterprises', 'sector': 'realty', 'marketCap': 'mid'},
-        {'symbol': 'BRITANNIA.NS', 'name': 'Britannia Industries', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'CCL.NS', 'name': 'CCL Products (India)', 'sector': 'fmcg', 'marketCap': 'mid'},
-        {'symbol': 'CESC.NS', 'name': 'CESC', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'CGPOWER.NS', 'name': 'CG Power and Industrial Solutions', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'CAMS.NS', 'name': 'Computer Age Management Services', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'CANBK.NS', 'name': 'Canara Bank', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'CANFINHOME.NS', 'name': 'Can Fin Homes', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'CAPLIPOINT.NS', 'name': 'Caplin Point Laboratories', 'sector': 'healthcare', 'marketCap': 'mid'},
-        {'symbol': 'CARBORUNIV.NS', 'name': 'Carborundum Universal', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        {'symbol': 'CASTROLIND.NS', 'name': 'Castrol India', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'CEATLTD.NS', 'name': 'CEAT', 'sector': 'auto', 'marketCap': 'mid'},
-        {'symbol': 'ABREL.NS', 'name': 'Century Textiles & Industries', 'sector': 'textiles', 'marketCap': 'mid'},
-        {'symbol': 'CERA.NS', 'name': 'Cera Sanitaryware', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'CHALET.NS', 'name': 'Chalet Hotels', 'sector': 'consumer', 'marketCap': 'mid'},
-        {'symbol': 'CHAMBLFERT.NS', 'name': 'Chambal Fertilizers & Chemicals', 'sector': 'chemicals', 'marketCap': 'mid'},
-        {'symbol': 'CHENNPETRO.NS', 'name': 'Chennai Petroleum Corporation', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'CHOLAFIN.NS', 'name': 'Cholamandalam Investment and Finance Company', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'CHOLAHLDNG.NS', 'name': 'Cholamandalam Financial Holdings', 'sector': 'banking', 'marketCap': 'mid'},
-        {'symbol': 'CIPLA.NS', 'name': 'Cipla', 'sector': 'healthcare', 'marketCap': 'mid'},
-        {'symbol': 'COALINDIA.NS', 'name': 'Coal India', 'sector': 'energy', 'marketCap': 'mid'},
-        {'symbol': 'COCHINSHIP.NS', 'name': 'Cochin Shipyard', 'sector': 'capital_goods', 'marketCap': 'mid'},
-        
-        # Small Cap (101-250)
-        {'symbol': 'COFORGE.NS', 'name': 'Coforge', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'COLPAL.NS', 'name': 'Colgate Palmolive (India)', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'CONCOR.NS', 'name': 'Container Corporation of India', 'sector': 'infrastructure', 'marketCap': 'small'},
-        {'symbol': 'COROMANDEL.NS', 'name': 'Coromandel International', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'CREDITACC.NS', 'name': 'Credit Access Grameen', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'CROMPTON.NS', 'name': 'Crompton Greaves Consumer Electricals', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'CUMMINSIND.NS', 'name': 'Cummins India', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'CYIENT.NS', 'name': 'Cyient', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'DLF.NS', 'name': 'DLF', 'sector': 'realty', 'marketCap': 'small'},
-        {'symbol': 'DABUR.NS', 'name': 'Dabur India', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'DALMIASUG.NS', 'name': 'Dalmia Bharat Sugar and Industries', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'DEEPAKNTR.NS', 'name': 'Deepak Nitrite', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'DELTACORP.NS', 'name': 'Delta Corp', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'DEVYANI.NS', 'name': 'Devyani International', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'DIVISLAB.NS', 'name': 'Divi\'s Laboratories', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'DIXON.NS', 'name': 'Dixon Technologies (India)', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'DRREDDY.NS', 'name': 'Dr. Reddy\'s Laboratories', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'EICHERMOT.NS', 'name': 'Eicher Motors', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'EIDPARRY.NS', 'name': 'EID Parry (India)', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'EIHOTEL.NS', 'name': 'EIH', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'ELGIEQUIP.NS', 'name': 'Elgi Equipments', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'EMAMILTD.NS', 'name': 'Emami', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'ENDURANCE.NS', 'name': 'Endurance Technologies', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'ENGINERSIN.NS', 'name': 'Engineers India', 'sector': 'construction', 'marketCap': 'small'},
-        {'symbol': 'EQUITASBNK.NS', 'name': 'Equitas Small Finance Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'ESCORTS.NS', 'name': 'Escorts Kubota', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'ESABINDIA.NS', 'name': 'Esab India', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'ETERNAL.NS', 'name': 'Eternal', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'EVEREADY.NS', 'name': 'Eveready Industries India', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'EXIDEIND.NS', 'name': 'Exide Industries', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'NYKAA.NS', 'name': 'FSN E-Commerce Ventures', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'FINEORG.NS', 'name': 'Fine Organic Industries', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'FINPIPE.NS', 'name': 'Finolex Cables', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'FEDERALBNK.NS', 'name': 'Federal Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'FORTIS.NS', 'name': 'Fortis Healthcare', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'FRETAIL.NS', 'name': 'Future Retail', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'GAIL.NS', 'name': 'GAIL (India)', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'GARFIBRES.NS', 'name': 'Garware Technical Fibres', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'GMRAIRPORT.NS', 'name': 'GMR Airports', 'sector': 'infrastructure', 'marketCap': 'small'},
-        {'symbol': 'GNFC.NS', 'name': 'Gujarat Narmada Valley Fertilizers & Chemicals', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'GLENMARK.NS', 'name': 'Glenmark Pharmaceuticals', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'GLAXO.NS', 'name': 'GlaxoSmithKline Pharmaceuticals', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'GMDCLTD.NS', 'name': 'Gujarat Mineral Development Corporation', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'GMRAIRPORT.NS', 'name': 'GMR Infrastructure', 'sector': 'infrastructure', 'marketCap': 'small'},
-        {'symbol': 'GODFRYPHLP.NS', 'name': 'Godfrey Phillips India', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'GODREJCP.NS', 'name': 'Godrej Consumer Products', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'GODREJIND.NS', 'name': 'Godrej Industries', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'GODREJPROP.NS', 'name': 'Godrej Properties', 'sector': 'realty', 'marketCap': 'small'},
-        {'symbol': 'GRANULES.NS', 'name': 'Granules India', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'GRAPHITE.NS', 'name': 'Graphite India', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'GRASIM.NS', 'name': 'Grasim Industries', 'sector': 'cement', 'marketCap': 'small'},
-        {'symbol': 'GRINFRA.NS', 'name': 'G R Infraprojects', 'sector': 'construction', 'marketCap': 'small'},
-        {'symbol': 'GESHIP.NS', 'name': 'Great Eastern Shipping Company', 'sector': 'infrastructure', 'marketCap': 'small'},
-        {'symbol': 'GRSE.NS', 'name': 'Garden Reach Shipbuilders & Engineers', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'GSFC.NS', 'name': 'Gujarat State Fertilizers & Chemicals', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'GSPL.NS', 'name': 'Gujarat State Petronet', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'GUJGASLTD.NS', 'name': 'Gujarat Gas', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'GULFOILLUB.NS', 'name': 'Gulf Oil Lubricants India', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'HCG.NS', 'name': 'HealthCare Global Enterprises', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'HCLTECH.NS', 'name': 'HCL Technologies', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'HDFCAMC.NS', 'name': 'HDFC Asset Management Company', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'HDFCBANK.NS', 'name': 'HDFC Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'HDFCLIFE.NS', 'name': 'HDFC Life Insurance Company', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'HFCL.NS', 'name': 'HFCL', 'sector': 'telecom', 'marketCap': 'small'},
-        {'symbol': 'HLEGLAS.NS', 'name': 'HLE Glascoat', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'HMVL.NS', 'name': 'Hindustan Media Ventures', 'sector': 'media', 'marketCap': 'small'},
-        {'symbol': 'HONAUT.NS', 'name': 'Honeywell Automation India', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'HUDCO.NS', 'name': 'Housing & Urban Development Corporation', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'HAVELLS.NS', 'name': 'Havells India', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'HEIDELBERG.NS', 'name': 'HeidelbergCement India', 'sector': 'cement', 'marketCap': 'small'},
-        {'symbol': 'HEROMOTOCO.NS', 'name': 'Hero MotoCorp', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'HEXT.NS', 'name': 'Hexaware Technologies', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'HIKAL.NS', 'name': 'Hical Chemicals', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'HINDALCO.NS', 'name': 'Hindalco Industries', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'HAL.NS', 'name': 'Hindustan Aeronautics', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'HINDCOPPER.NS', 'name': 'Hindustan Copper', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'HINDPETRO.NS', 'name': 'Hindustan Petroleum Corporation', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'HINDUNILVR.NS', 'name': 'Hindustan Unilever', 'sector': 'fmcg', 'marketCap': 'small'},
-        {'symbol': 'HINDZINC.NS', 'name': 'Hindustan Zinc', 'sector': 'metals', 'marketCap': 'small'},
-        {'symbol': 'HIMATSEIDE.NS', 'name': 'Himatsingka Seide', 'sector': 'textiles', 'marketCap': 'small'},
-        {'symbol': 'HPL.NS', 'name': 'HPL Electric & Power', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'AGI.NS', 'name': 'HSIL', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'HYUNDAI.NS', 'name': 'Hyundai Motor India', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'SAMMAANCAP.NS', 'name': 'Indiabulls Housing Finance', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'ICICIBANK.NS', 'name': 'ICICI Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'ICICIGI.NS', 'name': 'ICICI Lombard General Insurance Company', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'ICICIPRULI.NS', 'name': 'ICICI Prudential Life Insurance Company', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'IDEA.NS', 'name': 'Vodafone Idea', 'sector': 'telecom', 'marketCap': 'small'},
-        {'symbol': 'IDFCFIRSTB.NS', 'name': 'IDFC First Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'IEX.NS', 'name': 'Indian Energy Exchange', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'IFBIND.NS', 'name': 'IFB Industries', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'IGARASHI.NS', 'name': 'Igarashi Motors India', 'sector': 'auto', 'marketCap': 'small'},
-        {'symbol': 'IIFL.NS', 'name': 'India Infoline Finance', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'INDIACEM.NS', 'name': 'The India Cements', 'sector': 'cement', 'marketCap': 'small'},
-        {'symbol': 'INDIAMART.NS', 'name': 'IndiaMART InterMESH', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'INDIANB.NS', 'name': 'Indian Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'INDHOTEL.NS', 'name': 'Indian Hotels Co.', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'IOC.NS', 'name': 'Indian Oil Corporation', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'IRCTC.NS', 'name': 'Indian Railway Catering And Tourism Corporation', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'IRFC.NS', 'name': 'Indian Railway Finance Corporation', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'IREDA.NS', 'name': 'Indian Renewable Energy Development Agency', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'INDIGO.NS', 'name': 'InterGlobe Aviation', 'sector': 'infrastructure', 'marketCap': 'small'},
-        {'symbol': 'IGL.NS', 'name': 'Indraprastha Gas', 'sector': 'energy', 'marketCap': 'small'},
-        {'symbol': 'INDUSTOWER.NS', 'name': 'Indus Towers', 'sector': 'telecom', 'marketCap': 'small'},
-        {'symbol': 'INDUSINDBK.NS', 'name': 'IndusInd Bank', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'NAUKRI.NS', 'name': 'Info Edge (India)', 'sector': 'consumer', 'marketCap': 'small'},
-        {'symbol': 'INFY.NS', 'name': 'Infosys', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'INGERRAND.NS', 'name': 'Ingersoll Rand (India)', 'sector': 'capital_goods', 'marketCap': 'small'},
-        {'symbol': 'INSECTICID.NS', 'name': 'Insecticides (India)', 'sector': 'chemicals', 'marketCap': 'small'},
-        {'symbol': 'INTELLECT.NS', 'name': 'Intellect Design Arena', 'sector': 'it', 'marketCap': 'small'},
-        {'symbol': 'IPCALAB.NS', 'name': 'IPCA Laboratories', 'sector': 'healthcare', 'marketCap': 'small'},
-        {'symbol': 'IRB.NS', 'name': 'IRB Infrastructure Developers', 'sector': 'construction', 'marketCap': 'small'},
-        {'symbol': 'IIFLCAPS.NS', 'name': 'IIFL Securities', 'sector': 'banking', 'marketCap': 'small'},
-        {'symbol': 'ITC.NS', 'name': 'ITC', 'sector': 'fmcg', 'marketCap': 'small'},
-        
-        # Micro Cap (251-501)
-        {'symbol': 'ITDCEM.NS', 'name': 'ITD Cementation India', 'sector': 'construction', 'marketCap': 'micro'},
-        {'symbol': 'JSWENERGY.NS', 'name': 'JSW Energy', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'JSWINFRA.NS', 'name': 'JSW Infrastructure', 'sector': 'infrastructure', 'marketCap': 'micro'},
-        {'symbol': 'JSWSTEEL.NS', 'name': 'JSW Steel', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'JBCHEPHARM.NS', 'name': 'JB Chemicals & Pharmaceuticals', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'JKCEMENT.NS', 'name': 'JK Cement', 'sector': 'cement', 'marketCap': 'micro'},
-        {'symbol': 'JKLAKSHMI.NS', 'name': 'JK Lakshmi Cement', 'sector': 'cement', 'marketCap': 'micro'},
-        {'symbol': 'JKPAPER.NS', 'name': 'JK Paper', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'JKTYRE.NS', 'name': 'JK Tyre & Industries', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'JMFINANCIL.NS', 'name': 'JM Financial', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'JSL.NS', 'name': 'Jindal Stainless (Hisar)', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'JINDALSTEL.NS', 'name': 'Jindal Steel & Power', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'JIOFIN.NS', 'name': 'Jio Financial Services', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'JYOTHYLAB.NS', 'name': 'Jyothy Labs', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'JUBLFOOD.NS', 'name': 'Jubilant FoodWorks', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'JUBLINGREA.NS', 'name': 'Jubilant Ingrevia', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'JUSTDIAL.NS', 'name': 'Just Dial', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'JYOTHYLAB.NS', 'name': 'Jyothy Labs', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'KAJARIACER.NS', 'name': 'Kajaria Ceramics', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'KPIL.NS', 'name': 'Kalpataru Power Transmission', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'KANSAINER.NS', 'name': 'Kansai Nerolac Paints', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'KARURVYSYA.NS', 'name': 'Karur Vysya Bank', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'KECL.NS', 'name': 'Kirloskar Electric Company', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'KEI.NS', 'name': 'KEI Industries', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'KENNAMET.NS', 'name': 'Kennametal India', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'KFINTECH.NS', 'name': 'KFin Technologies', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'KHADIM.NS', 'name': 'Khadim India', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'KIOCL.NS', 'name': 'KIOCL', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'KIRLOSENG.NS', 'name': 'Kirloskar Brothers', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'KIRLFER.NS', 'name': 'Kirloskar Ferrous Industries', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'KIRLOSBROS.NS', 'name': 'Kirloskar Brothers', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'KIRIINDUS.NS', 'name': 'Kiri Industries', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'KOTAKBANK.NS', 'name': 'Kotak Mahindra Bank', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'KPITTECH.NS', 'name': 'KPIT Technologies', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'KRBL.NS', 'name': 'KRBL', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'KSB.NS', 'name': 'KSB', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'KTKBANK.NS', 'name': 'Karnataka Bank', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'LTF.NS', 'name': 'L&T Finance Holdings', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'LTIM.NS', 'name': 'LTIMindtree', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'LTTS.NS', 'name': 'L&T Technology Services', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'LEMONTREE.NS', 'name': 'Lemon Tree Hotels', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'LT.NS', 'name': 'Larsen & Toubro', 'sector': 'construction', 'marketCap': 'micro'},
-        {'symbol': 'LAURUSLABS.NS', 'name': 'Laurus Labs', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'LICHSGFIN.NS', 'name': 'LIC Housing Finance', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'LICI.NS', 'name': 'Life Insurance Corporation of India', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'LINDEINDIA.NS', 'name': 'Linde India', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'LODHA.NS', 'name': 'Lodha Developers', 'sector': 'realty', 'marketCap': 'micro'},
-        {'symbol': 'LUPIN.NS', 'name': 'Lupin', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'LXCHEM.NS', 'name': 'Laxmi Organic Industries', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'LYKALABS.NS', 'name': 'Lyka Labs', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'M&M.NS', 'name': 'Mahindra & Mahindra', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'M&MFIN.NS', 'name': 'Mahindra & Mahindra Financial Services', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'MFSL.NS', 'name': 'Max Financial Services', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'MGL.NS', 'name': 'Mahanagar Gas', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'CIEINDIA.NS', 'name': 'Mahindra CIE Automotive', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'MANAPPURAM.NS', 'name': 'Manappuram Finance', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'MARICO.NS', 'name': 'Marico', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'MARUTI.NS', 'name': 'Maruti Suzuki India', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'MASTEK.NS', 'name': 'Mastek', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'MAXHEALTH.NS', 'name': 'Max Healthcare Institute', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'MAZDOCK.NS', 'name': 'Mazagon Dock Shipbuilders', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'MCDHOLDING.NS', 'name': 'United Spirits', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'MCX.NS', 'name': 'Multi Commodity Exchange of India', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'MEDPLUS.NS', 'name': 'MedPlus Health Services', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'METROPOLIS.NS', 'name': 'Metropolis Healthcare', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'MHRIL.NS', 'name': 'Mahindra Holidays & Resorts India', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'MIDHANI.NS', 'name': 'Mishra Dhatu Nigam', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'MINDACORP.NS', 'name': 'Minda Corporation', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'MOLDTKPAC.NS', 'name': 'Mold-Tek Packaging', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'MOIL.NS', 'name': 'MOIL', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'MRF.NS', 'name': 'MRF', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'MOTHERSON.NS', 'name': 'Samvardhana Motherson International', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'MOTILALOFS.NS', 'name': 'Motilal Oswal Financial Services', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'MPHASIS.NS', 'name': 'Mphasis', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'MRPL.NS', 'name': 'Mangalore Refinery and Petrochemicals', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'MSUMI.NS', 'name': 'Motherson Sumi Wiring India', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'MTARTECH.NS', 'name': 'MTAR Technologies', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'MUTHOOTFIN.NS', 'name': 'Muthoot Finance', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'NATIONALUM.NS', 'name': 'National Aluminium Company', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'NATIONALUM.NS', 'name': 'National Aluminium Company', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'NAVINFLUOR.NS', 'name': 'Navin Fluorine International', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'NESCO.NS', 'name': 'Nesco', 'sector': 'infrastructure', 'marketCap': 'micro'},
-        {'symbol': 'NESTLEIND.NS', 'name': 'Nestle India', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'NETWORK18.NS', 'name': 'Network18 Media & Investments', 'sector': 'media', 'marketCap': 'micro'},
-        {'symbol': 'NEWGEN.NS', 'name': 'Newgen Software Technologies', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'NIACL.NS', 'name': 'The New India Assurance Company', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'NIITLTD.NS', 'name': 'NIIT', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'NILKAMAL.NS', 'name': 'Nilkamal', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'NLCINDIA.NS', 'name': 'NLC India', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'NMDC.NS', 'name': 'NMDC', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'NOCIL.NS', 'name': 'NOCIL', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'NSLNISP.NS', 'name': 'NSIL', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'NTPC.NS', 'name': 'NTPC', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'NUCLEUS.NS', 'name': 'Nucleus Software Exports', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'OBEROIRLTY.NS', 'name': 'Oberoi Realty', 'sector': 'realty', 'marketCap': 'micro'},
-        {'symbol': 'OFSS.NS', 'name': 'Oracle Financial Services Software', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'OIL.NS', 'name': 'Oil India', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'ONGC.NS', 'name': 'Oil & Natural Gas Corporation', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'ORIENTELEC.NS', 'name': 'Orient Electric', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'PAYTM.NS', 'name': 'One 97 Communications', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'PNBGILTS.NS', 'name': 'PNB Gilts', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'PNCINFRA.NS', 'name': 'PNC Infratech', 'sector': 'construction', 'marketCap': 'micro'},
-        {'symbol': 'PAGEIND.NS', 'name': 'Page Industries', 'sector': 'textiles', 'marketCap': 'micro'},
-        {'symbol': 'PARAGMILK.NS', 'name': 'Parag Milk Foods', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'PERSISTENT.NS', 'name': 'Persistent Systems', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'PETRONET.NS', 'name': 'Petronet LNG', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'PFIZER.NS', 'name': 'Pfizer', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'PHOENIXLTD.NS', 'name': 'The Phoenix Mills', 'sector': 'realty', 'marketCap': 'micro'},
-        {'symbol': 'PIDILITIND.NS', 'name': 'Pidilite Industries', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'PIIND.NS', 'name': 'PI Industries', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'PEL.NS', 'name': 'Piramal Enterprises', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'POLICYBZR.NS', 'name': 'PB Fintech', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'POLYMED.NS', 'name': 'Poly Medicure', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'POLYCAB.NS', 'name': 'Polycab India', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'POLYPLEX.NS', 'name': 'Polyplex Corporation', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'POONAWALLA.NS', 'name': 'Poonawalla Fincorp', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'PFC.NS', 'name': 'Power Finance Corporation', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'POWERGRID.NS', 'name': 'Power Grid Corporation of India', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'PRAJIND.NS', 'name': 'Praj Industries', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'PRESTIGE.NS', 'name': 'Prestige Estates Projects', 'sector': 'realty', 'marketCap': 'micro'},
-        {'symbol': 'PRINCEPIPE.NS', 'name': 'Prince Pipes and Fittings', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'PRSMJOHNSN.NS', 'name': 'Prism Johnson', 'sector': 'cement', 'marketCap': 'micro'},
-        {'symbol': 'PVRINOX.NS', 'name': 'PVR', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'PVRINOX.NS', 'name': 'PVR INOX', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'PNB.NS', 'name': 'Punjab National Bank', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'QUESS.NS', 'name': 'Quess Corp', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'RADICO.NS', 'name': 'Radico Khaitan', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'RAIN.NS', 'name': 'Rain Industries', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'RAJESHEXPO.NS', 'name': 'Rajesh Exports', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'RALLIS.NS', 'name': 'Rallis India', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'RAMCOCEM.NS', 'name': 'The Ramco Cements', 'sector': 'cement', 'marketCap': 'micro'},
-        {'symbol': 'RATEGAIN.NS', 'name': 'RateGain Travel Technologies', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'RATNAMANI.NS', 'name': 'Ratnamani Metals & Tubes', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'RAYMOND.NS', 'name': 'Raymond', 'sector': 'textiles', 'marketCap': 'micro'},
-        {'symbol': 'RBL.NS', 'name': 'Rane Brake Lining', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'RBLBANK.NS', 'name': 'RBL Bank', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'RECLTD.NS', 'name': 'REC', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'REDINGTON.NS', 'name': 'Redington', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'RELAXO.NS', 'name': 'Relaxo Footwears', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'RELIANCE.NS', 'name': 'Reliance Industries', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'RENUKA.NS', 'name': 'Shree Renuka Sugars', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'REXPIPES.NS', 'name': 'RGP Pipes', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'RITES.NS', 'name': 'RITES', 'sector': 'construction', 'marketCap': 'micro'},
-        {'symbol': 'ROUTE.NS', 'name': 'Route Mobile', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'RSYSTEMS.NS', 'name': 'R Systems International', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'SAFARI.NS', 'name': 'Safari Industries (India)', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'SAIL.NS', 'name': 'Steel Authority of India', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'SANOFI.NS', 'name': 'Sanofi India', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'SAREGAMA.NS', 'name': 'Saregama India', 'sector': 'media', 'marketCap': 'micro'},
-        {'symbol': 'SBICARD.NS', 'name': 'SBI Cards and Payment Services', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'SBILIFE.NS', 'name': 'SBI Life Insurance Company', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'SCHAEFFLER.NS', 'name': 'Schaeffler India', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'SFL.NS', 'name': 'Sheela Foam', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'SHOPERSTOP.NS', 'name': 'Shoppers Stop', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'SHREECEM.NS', 'name': 'Shree Cement', 'sector': 'cement', 'marketCap': 'micro'},
-        {'symbol': 'TRANSWORLD.NS', 'name': 'Shreyas Shipping & Logistics', 'sector': 'infrastructure', 'marketCap': 'micro'},
-        {'symbol': 'SHRIRAMFIN.NS', 'name': 'Shriram Finance', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'SIEMENS.NS', 'name': 'Siemens', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'SIS.NS', 'name': 'SIS', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'SJVN.NS', 'name': 'SJVN', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'SKFINDIA.NS', 'name': 'SKF India', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'SOBHA.NS', 'name': 'Sobha', 'sector': 'realty', 'marketCap': 'micro'},
-        {'symbol': 'SOLARINDS.NS', 'name': 'Solar Industries India', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'SONACOMS.NS', 'name': 'Sona BLW Precision Forgings', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'SBIN.NS', 'name': 'State Bank of India', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'STAR.NS', 'name': 'Strides Pharma Science', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'STARHEALTH.NS', 'name': 'Star Health and Allied Insurance Company', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'SUDARSCHEM.NS', 'name': 'Sudarshan Chemical Industries', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'SUMICHEM.NS', 'name': 'Sumitomo Chemical India', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'SUNPHARMA.NS', 'name': 'Sun Pharmaceutical Industries', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'SUNTV.NS', 'name': 'Sun TV Network', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'SUPRAJIT.NS', 'name': 'Suprajit Engineering', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'SUPREMEIND.NS', 'name': 'Supreme Industries', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'SWANENERGY.NS', 'name': 'Swan Energy', 'sector': 'textiles', 'marketCap': 'micro'},
-        {'symbol': 'SWIGGY.NS', 'name': 'Swiggy', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'SYMPHONY.NS', 'name': 'Symphony', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'SYNGENE.NS', 'name': 'Syngene International', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'TATACHEM.NS', 'name': 'Tata Chemicals', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'TATACOMM.NS', 'name': 'Tata Communications', 'sector': 'telecom', 'marketCap': 'micro'},
-        {'symbol': 'TATACONSUM.NS', 'name': 'Tata Consumer Products', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'TATAELXSI.NS', 'name': 'Tata Elxsi', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'TATAINVEST.NS', 'name': 'Tata Investment Corporation', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'TATAMOTORS.NS', 'name': 'Tata Motors', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'TATAPOWER.NS', 'name': 'Tata Power Co.', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'TATASTEEL.NS', 'name': 'Tata Steel', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'TCS.NS', 'name': 'Tata Consultancy Services', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'TVSMOTOR.NS', 'name': 'TVS Motor Company', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'TEAMLEASE.NS', 'name': 'TeamLease Services', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'TECHM.NS', 'name': 'Tech Mahindra', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'TEJASNET.NS', 'name': 'Tejas Networks', 'sector': 'telecom', 'marketCap': 'micro'},
-        {'symbol': 'THERMAX.NS', 'name': 'Thermax', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'THYROCARE.NS', 'name': 'Thyrocare Technologies', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'TIINDIA.NS', 'name': 'Tube Investments of India', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'TIMKEN.NS', 'name': 'Timken India', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'TITAN.NS', 'name': 'Titan Company', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'TORNTPHARM.NS', 'name': 'Torrent Pharmaceuticals', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'TORNTPOWER.NS', 'name': 'Torrent Power', 'sector': 'energy', 'marketCap': 'micro'},
-        {'symbol': 'TRENT.NS', 'name': 'Trent', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'TRIDENT.NS', 'name': 'Trident', 'sector': 'textiles', 'marketCap': 'micro'},
-        {'symbol': 'TRITURBINE.NS', 'name': 'Triveni Turbine', 'sector': 'capital_goods', 'marketCap': 'micro'},
-        {'symbol': 'TTML.NS', 'name': 'Tata Teleservices (Maharashtra)', 'sector': 'telecom', 'marketCap': 'micro'},
-        {'symbol': 'UJJIVANSFB.NS', 'name': 'Ujjivan Financial Services', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'UBL.NS', 'name': 'United Breweries', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'ULTRACEMCO.NS', 'name': 'UltraTech Cement', 'sector': 'cement', 'marketCap': 'micro'},
-        {'symbol': 'UNIONBANK.NS', 'name': 'Union Bank of India', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'UNITDSPR.NS', 'name': 'United Spirits', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'UPL.NS', 'name': 'UPL', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'UTIAMC.NS', 'name': 'UTI Asset Management Company', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'VBL.NS', 'name': 'Varun Beverages', 'sector': 'fmcg', 'marketCap': 'micro'},
-        {'symbol': 'VEDL.NS', 'name': 'Vedanta', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'VIJAYA.NS', 'name': 'Vijaya Diagnostic Centre', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'VINATIORGA.NS', 'name': 'Vinati Organics', 'sector': 'chemicals', 'marketCap': 'micro'},
-        {'symbol': 'VIPIND.NS', 'name': 'VIP Industries', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'VMART.NS', 'name': 'V-Mart Retail', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'VOLTAS.NS', 'name': 'Voltas', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'VTL.NS', 'name': 'Vardhman Textiles', 'sector': 'textiles', 'marketCap': 'micro'},
-        {'symbol': 'WELCORP.NS', 'name': 'Welspun Corp', 'sector': 'metals', 'marketCap': 'micro'},
-        {'symbol': 'WELSPUNLIV.NS', 'name': 'Welspun India', 'sector': 'textiles', 'marketCap': 'micro'},
-        {'symbol': 'WESTLIFE.NS', 'name': 'Westlife Foodworld', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'WHIRLPOOL.NS', 'name': 'Whirlpool of India', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'WIPRO.NS', 'name': 'Wipro', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'WOCKPHARMA.NS', 'name': 'Wockhardt', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'YESBANK.NS', 'name': 'Yes Bank', 'sector': 'banking', 'marketCap': 'micro'},
-        {'symbol': 'ZENSARTECH.NS', 'name': 'Zensar Technologies', 'sector': 'it', 'marketCap': 'micro'},
-        {'symbol': 'ZFCVINDIA.NS', 'name': 'ZF Commercial Vehicle Control Systems India', 'sector': 'auto', 'marketCap': 'micro'},
-        {'symbol': 'ZYDUSLIFE.NS', 'name': 'Zydus Lifesciences', 'sector': 'healthcare', 'marketCap': 'micro'},
-        {'symbol': 'ETERNAL.NS', 'name': 'Zomato', 'sector': 'consumer', 'marketCap': 'micro'},
-        {'symbol': 'ZEEL.NS', 'name': 'Zee Entertainment Enterprises', 'sector': 'consumer', 'marketCap': 'micro'}
-    ]
-
-# ── US Stock Lists ──────────────────────────────────────────────────────────
-
-def get_dow30_stocks():
-    return [
-        {'symbol': 'AAPL',  'name': 'Apple Inc.',               'sector': 'technology',  'marketCap': 'large'},
-        {'symbol': 'AMGN',  'name': 'Amgen Inc.',                'sector': 'healthcare',  'marketCap': 'large'},
-        {'symbol': 'AXP',   'name': 'American Express',          'sector': 'financials',  'marketCap': 'large'},
-        {'symbol': 'BA',    'name': 'Boeing Co.',                'sector': 'industrials', 'marketCap': 'large'},
-        {'symbol': 'CAT',   'name': 'Caterpillar Inc.',          'sector': 'industrials', 'marketCap': 'large'},
-        {'symbol': 'CRM',   'name': 'Salesforce Inc.',           'sector': 'technology',  'marketCap': 'large'},
-        {'symbol': 'CSCO',  'name': 'Cisco Systems',             'sector': 'technology',  'marketCap': 'large'},
-        {'symbol': 'CVX',   'name': 'Chevron Corp.',             'sector': 'energy',      'marketCap': 'large'},
-        {'symbol': 'DIS',   'name': 'Walt Disney Co.',           'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'DOW',   'name': 'Dow Inc.',                  'sector': 'materials',   'marketCap': 'large'},
-        {'symbol': 'GS',    'name': 'Goldman Sachs',             'sector': 'financials',  'marketCap': 'large'},
-        {'symbol': 'HD',    'name': 'Home Depot Inc.',           'sector': 'consumer',    'marketCap': 'large'},
-        {'symbol': 'HON',   'name': 'Honeywell International',   'sector': 'industrials', 'marketCap': 'large'},
-        {'symbol': 'IBM',   'name': 'IBM Corp.',                 'sector': 'technology',  'marketCap': 'large'},
-        {'symbol': 'JNJ',   'name': 'Johnson & Johnson',         'sector': 'healthcare',  'marketCap': 'large'},
-        {'symbol': 'JPM',   'name': 'JPMorgan Chase',            'sector': 'financials',  'marketCap': 'large'},
-        {'symbol': 'KO',    'name': 'Coca-Cola Co.',             'sector': 'consumer',    'marketCap': 'large'},
-        {'symbol': 'MCD',   'name': "McDonald's Corp.",          'sector': 'consumer',    'marketCap': 'large'},
-        {'symbol': 'MMM',   'name': '3M Co.',                    'sector': 'industrials', 'marketCap': 'large'},
-        {'symbol': 'MRK',   'name': 'Merck & Co.',               'sector': 'healthcare',  'marketCap': 'large'},
-        {'symbol': 'MSFT',  'name': 'Microsoft Corp.',           'sector': 'technology',  'marketCap': 'large'},
-        {'symbol': 'NKE',   'name': 'Nike Inc.',                 'sector': 'consumer',    'marketCap': 'large'},
-        {'symbol': 'PG',    'name': 'Procter & Gamble',          'sector': 'consumer',    'marketCap': 'large'},
-        {'symbol': 'SHW',   'name': 'Sherwin-Williams',          'sector': 'materials',   'marketCap': 'large'},
-        {'symbol': 'TRV',   'name': 'Travelers Companies',       'sector': 'financials',  'marketCap': 'large'},
-        {'symbol': 'UNH',   'name': 'UnitedHealth Group',        'sector': 'healthcare',  'marketCap': 'large'},
-        {'symbol': 'V',     'name': 'Visa Inc.',                 'sector': 'financials',  'marketCap': 'large'},
-        {'symbol': 'VZ',    'name': 'Verizon Communications',    'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'WMT',   'name': 'Walmart Inc.',              'sector': 'consumer',    'marketCap': 'large'},
-        {'symbol': 'INTC',  'name': 'Intel Corp.',               'sector': 'technology',  'marketCap': 'large'},
-    ]
-
-def get_sp100_stocks():
-    return [
-        # Technology
-        {'symbol': 'AAPL',  'name': 'Apple Inc.',               'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'MSFT',  'name': 'Microsoft Corp.',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'NVDA',  'name': 'NVIDIA Corp.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'GOOGL', 'name': 'Alphabet Inc.',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'META',  'name': 'Meta Platforms',            'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'AVGO',  'name': 'Broadcom Inc.',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'AMD',   'name': 'Advanced Micro Devices',    'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ORCL',  'name': 'Oracle Corp.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'CRM',   'name': 'Salesforce Inc.',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'CSCO',  'name': 'Cisco Systems',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'INTC',  'name': 'Intel Corp.',               'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'IBM',   'name': 'IBM Corp.',                 'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'QCOM',  'name': 'QUALCOMM Inc.',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'TXN',   'name': 'Texas Instruments',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'NOW',   'name': 'ServiceNow Inc.',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'INTU',  'name': 'Intuit Inc.',               'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'AMAT',  'name': 'Applied Materials',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ADBE',  'name': 'Adobe Inc.',                'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'MU',    'name': 'Micron Technology',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'LRCX',  'name': 'Lam Research',             'sector': 'technology',   'marketCap': 'large'},
-        # Consumer / Retail
-        {'symbol': 'AMZN',  'name': 'Amazon.com Inc.',           'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'TSLA',  'name': 'Tesla Inc.',                'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'WMT',   'name': 'Walmart Inc.',              'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'COST',  'name': 'Costco Wholesale',          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'HD',    'name': 'Home Depot Inc.',           'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'PG',    'name': 'Procter & Gamble',          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'MCD',   'name': "McDonald's Corp.",          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'KO',    'name': 'Coca-Cola Co.',             'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'PEP',   'name': 'PepsiCo Inc.',              'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'NKE',   'name': 'Nike Inc.',                 'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'SBUX',  'name': 'Starbucks Corp.',           'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'LOW',   'name': "Lowe's Companies",          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'TGT',   'name': 'Target Corp.',              'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'PM',    'name': 'Philip Morris Intl.',       'sector': 'consumer',     'marketCap': 'large'},
-        # Financials
-        {'symbol': 'JPM',   'name': 'JPMorgan Chase',            'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'V',     'name': 'Visa Inc.',                 'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'MA',    'name': 'Mastercard Inc.',           'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'BAC',   'name': 'Bank of America',           'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'GS',    'name': 'Goldman Sachs',             'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'WFC',   'name': 'Wells Fargo',               'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'MS',    'name': 'Morgan Stanley',            'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'BLK',   'name': 'BlackRock Inc.',            'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'AXP',   'name': 'American Express',          'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'SCHW',  'name': 'Charles Schwab',            'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'C',     'name': 'Citigroup Inc.',            'sector': 'financials',   'marketCap': 'large'},
-        # Healthcare
-        {'symbol': 'LLY',   'name': 'Eli Lilly',                 'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'UNH',   'name': 'UnitedHealth Group',        'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'JNJ',   'name': 'Johnson & Johnson',         'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'ABBV',  'name': 'AbbVie Inc.',               'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'MRK',   'name': 'Merck & Co.',               'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'TMO',   'name': 'Thermo Fisher Scientific',  'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'ABT',   'name': 'Abbott Laboratories',       'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'AMGN',  'name': 'Amgen Inc.',                'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'PFE',   'name': 'Pfizer Inc.',               'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'GILD',  'name': 'Gilead Sciences',           'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'BMY',   'name': 'Bristol-Myers Squibb',      'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'CVS',   'name': 'CVS Health Corp.',          'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'ISRG',  'name': 'Intuitive Surgical',        'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'REGN',  'name': 'Regeneron Pharmaceuticals', 'sector': 'healthcare',   'marketCap': 'large'},
-        # Energy
-        {'symbol': 'XOM',   'name': 'Exxon Mobil Corp.',         'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'CVX',   'name': 'Chevron Corp.',             'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'COP',   'name': 'ConocoPhillips',            'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'EOG',   'name': 'EOG Resources',             'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'SLB',   'name': 'Schlumberger NV',           'sector': 'energy',       'marketCap': 'large'},
-        # Industrials
-        {'symbol': 'CAT',   'name': 'Caterpillar Inc.',          'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'HON',   'name': 'Honeywell International',   'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'BA',    'name': 'Boeing Co.',                'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'RTX',   'name': 'RTX Corp.',                 'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'MMM',   'name': '3M Co.',                    'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'GE',    'name': 'GE Aerospace',              'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'UPS',   'name': 'United Parcel Service',     'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'DE',    'name': 'Deere & Company',           'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'LMT',   'name': 'Lockheed Martin',           'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'UNP',   'name': 'Union Pacific Corp.',       'sector': 'industrials',  'marketCap': 'large'},
-        # Communication
-        {'symbol': 'NFLX',  'name': 'Netflix Inc.',              'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'DIS',   'name': 'Walt Disney Co.',           'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'VZ',    'name': 'Verizon Communications',    'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'T',     'name': 'AT&T Inc.',                 'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'CMCSA', 'name': 'Comcast Corp.',             'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'TMUS',  'name': 'T-Mobile US',               'sector': 'communication','marketCap': 'large'},
-        # Materials
-        {'symbol': 'LIN',   'name': 'Linde PLC',                 'sector': 'materials',    'marketCap': 'large'},
-        {'symbol': 'SHW',   'name': 'Sherwin-Williams',          'sector': 'materials',    'marketCap': 'large'},
-        {'symbol': 'DOW',   'name': 'Dow Inc.',                  'sector': 'materials',    'marketCap': 'large'},
-        {'symbol': 'FCX',   'name': 'Freeport-McMoRan',          'sector': 'materials',    'marketCap': 'large'},
-        {'symbol': 'APD',   'name': 'Air Products & Chemicals',  'sector': 'materials',    'marketCap': 'large'},
-        # Utilities & Real Estate
-        {'symbol': 'NEE',   'name': 'NextEra Energy',            'sector': 'utilities',    'marketCap': 'large'},
-        {'symbol': 'SO',    'name': 'Southern Company',          'sector': 'utilities',    'marketCap': 'large'},
-        {'symbol': 'DUK',   'name': 'Duke Energy Corp.',         'sector': 'utilities',    'marketCap': 'large'},
-        {'symbol': 'AMT',   'name': 'American Tower Corp.',      'sector': 'realestate',   'marketCap': 'large'},
-        {'symbol': 'PLD',   'name': 'Prologis Inc.',             'sector': 'realestate',   'marketCap': 'large'},
-    ]
-
-def get_nasdaq100_stocks():
-    return [
-        {'symbol': 'AAPL',  'name': 'Apple Inc.',               'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'MSFT',  'name': 'Microsoft Corp.',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'NVDA',  'name': 'NVIDIA Corp.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'GOOGL', 'name': 'Alphabet Inc. (A)',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'GOOG',  'name': 'Alphabet Inc. (C)',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'META',  'name': 'Meta Platforms',            'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'AMZN',  'name': 'Amazon.com Inc.',           'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'TSLA',  'name': 'Tesla Inc.',                'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'AVGO',  'name': 'Broadcom Inc.',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'COST',  'name': 'Costco Wholesale',          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'NFLX',  'name': 'Netflix Inc.',              'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'AMD',   'name': 'Advanced Micro Devices',    'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ADBE',  'name': 'Adobe Inc.',                'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'QCOM',  'name': 'QUALCOMM Inc.',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'INTU',  'name': 'Intuit Inc.',               'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'TXN',   'name': 'Texas Instruments',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'AMAT',  'name': 'Applied Materials',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ISRG',  'name': 'Intuitive Surgical',        'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'BKNG',  'name': 'Booking Holdings',          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'NOW',   'name': 'ServiceNow Inc.',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'MU',    'name': 'Micron Technology',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'LRCX',  'name': 'Lam Research',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ADI',   'name': 'Analog Devices',            'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'PANW',  'name': 'Palo Alto Networks',        'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'KLAC',  'name': 'KLA Corp.',                 'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'SNPS',  'name': 'Synopsys Inc.',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'CDNS',  'name': 'Cadence Design Systems',    'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'MRVL',  'name': 'Marvell Technology',        'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'CRWD',  'name': 'CrowdStrike Holdings',      'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ORCL',  'name': 'Oracle Corp.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ASML',  'name': 'ASML Holding',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ADP',   'name': 'Automatic Data Processing', 'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'MELI',  'name': 'MercadoLibre Inc.',         'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'ABNB',  'name': 'Airbnb Inc.',               'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'PYPL',  'name': 'PayPal Holdings',           'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'ORLY',  'name': "O'Reilly Automotive",       'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'MNST',  'name': 'Monster Beverage Corp.',    'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'REGN',  'name': 'Regeneron Pharmaceuticals', 'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'MDLZ',  'name': 'Mondelez International',    'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'GILD',  'name': 'Gilead Sciences',           'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'CTAS',  'name': 'Cintas Corp.',              'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'CSX',   'name': 'CSX Corp.',                 'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'PCAR',  'name': 'PACCAR Inc.',               'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'DXCM',  'name': 'DexCom Inc.',               'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'IDXX',  'name': 'IDEXX Laboratories',        'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'BIIB',  'name': 'Biogen Inc.',               'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'VRTX',  'name': 'Vertex Pharmaceuticals',    'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'AMGN',  'name': 'Amgen Inc.',                'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'HON',   'name': 'Honeywell International',   'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'CMCSA', 'name': 'Comcast Corp.',             'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'TMUS',  'name': 'T-Mobile US',               'sector': 'communication','marketCap': 'large'},
-        {'symbol': 'KDP',   'name': 'Keurig Dr Pepper',          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'MAR',   'name': 'Marriott International',    'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'SBUX',  'name': 'Starbucks Corp.',           'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'LULU',  'name': 'Lululemon Athletica',       'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'EA',    'name': 'Electronic Arts',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ZS',    'name': 'Zscaler Inc.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'FTNT',  'name': 'Fortinet Inc.',             'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'TEAM',  'name': 'Atlassian Corp.',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'WDAY',  'name': 'Workday Inc.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'MCHP',  'name': 'Microchip Technology',      'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'FAST',  'name': 'Fastenal Co.',              'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'ON',    'name': 'ON Semiconductor',          'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'PAYX',  'name': 'Paychex Inc.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'ODFL',  'name': 'Old Dominion Freight Line', 'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'VRSK',  'name': 'Verisk Analytics',          'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'TTWO',  'name': 'Take-Two Interactive',      'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'DDOG',  'name': 'Datadog Inc.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'DASH',  'name': 'DoorDash Inc.',             'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'GEHC',  'name': 'GE HealthCare Technologies','sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'CPRT',  'name': 'Copart Inc.',               'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'NXPI',  'name': 'NXP Semiconductors',        'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'CEG',   'name': 'Constellation Energy',      'sector': 'utilities',    'marketCap': 'large'},
-        {'symbol': 'TTD',   'name': 'The Trade Desk',            'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'APP',   'name': 'Applovin Corp.',            'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'PLTR',  'name': 'Palantir Technologies',     'sector': 'technology',   'marketCap': 'large'},
-    ]
-
-def get_sp500_stocks():
-    """Representative S&P 500 stocks — top ~200 by sector coverage"""
-    return get_sp100_stocks() + [
-        # Extended Technology
-        {'symbol': 'ACN',   'name': 'Accenture PLC',            'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'SHOP',  'name': 'Shopify Inc.',              'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'SNOW',  'name': 'Snowflake Inc.',            'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'NET',   'name': 'Cloudflare Inc.',           'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'UBER',  'name': 'Uber Technologies',         'sector': 'technology',   'marketCap': 'large'},
-        {'symbol': 'LYFT',  'name': 'Lyft Inc.',                 'sector': 'technology',   'marketCap': 'mid'},
-        {'symbol': 'COIN',  'name': 'Coinbase Global',           'sector': 'financials',   'marketCap': 'mid'},
-        {'symbol': 'PINS',  'name': 'Pinterest Inc.',            'sector': 'communication','marketCap': 'mid'},
-        {'symbol': 'SNAP',  'name': 'Snap Inc.',                 'sector': 'communication','marketCap': 'mid'},
-        {'symbol': 'X',     'name': 'U.S. Steel Corp.',          'sector': 'materials',    'marketCap': 'mid'},
-        {'symbol': 'F',     'name': 'Ford Motor Co.',            'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'GM',    'name': 'General Motors',            'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'RIVN',  'name': 'Rivian Automotive',         'sector': 'consumer',     'marketCap': 'mid'},
-        {'symbol': 'LCID',  'name': 'Lucid Group',               'sector': 'consumer',     'marketCap': 'small'},
-        # Extended Financials
-        {'symbol': 'USB',   'name': 'U.S. Bancorp',              'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'PNC',   'name': 'PNC Financial Services',    'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'TFC',   'name': 'Truist Financial',          'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'COF',   'name': 'Capital One Financial',     'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'DFS',   'name': 'Discover Financial',        'sector': 'financials',   'marketCap': 'large'},
-        {'symbol': 'SYF',   'name': 'Synchrony Financial',       'sector': 'financials',   'marketCap': 'mid'},
-        {'symbol': 'FITB',  'name': 'Fifth Third Bancorp',       'sector': 'financials',   'marketCap': 'mid'},
-        {'symbol': 'KEY',   'name': 'KeyCorp',                   'sector': 'financials',   'marketCap': 'mid'},
-        {'symbol': 'RF',    'name': 'Regions Financial',         'sector': 'financials',   'marketCap': 'mid'},
-        # Extended Healthcare
-        {'symbol': 'CI',    'name': 'Cigna Group',               'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'HUM',   'name': 'Humana Inc.',               'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'MDT',   'name': 'Medtronic PLC',             'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'SYK',   'name': 'Stryker Corp.',             'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'BDX',   'name': 'Becton Dickinson',          'sector': 'healthcare',   'marketCap': 'large'},
-        {'symbol': 'MRNA',  'name': 'Moderna Inc.',              'sector': 'healthcare',   'marketCap': 'mid'},
-        {'symbol': 'ILMN',  'name': 'Illumina Inc.',             'sector': 'healthcare',   'marketCap': 'mid'},
-        # Extended Energy
-        {'symbol': 'PXD',   'name': 'Pioneer Natural Resources', 'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'DVN',   'name': 'Devon Energy Corp.',        'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'MPC',   'name': 'Marathon Petroleum',        'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'PSX',   'name': 'Phillips 66',               'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'VLO',   'name': 'Valero Energy',             'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'HAL',   'name': 'Halliburton Co.',           'sector': 'energy',       'marketCap': 'large'},
-        {'symbol': 'OXY',   'name': 'Occidental Petroleum',      'sector': 'energy',       'marketCap': 'large'},
-        # Extended Industrials
-        {'symbol': 'FDX',   'name': 'FedEx Corp.',               'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'ETN',   'name': 'Eaton Corp.',               'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'EMR',   'name': 'Emerson Electric',          'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'NOC',   'name': 'Northrop Grumman',          'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'GD',    'name': 'General Dynamics',          'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'ITW',   'name': 'Illinois Tool Works',       'sector': 'industrials',  'marketCap': 'large'},
-        {'symbol': 'WM',    'name': 'Waste Management Inc.',     'sector': 'industrials',  'marketCap': 'large'},
-        # Extended Consumer
-        {'symbol': 'CL',    'name': 'Colgate-Palmolive',         'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'MO',    'name': 'Altria Group',              'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'KHC',   'name': 'Kraft Heinz Co.',           'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'GIS',   'name': 'General Mills',             'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'K',     'name': "Kellogg's Co.",             'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'HRL',   'name': 'Hormel Foods',              'sector': 'consumer',     'marketCap': 'mid'},
-        {'symbol': 'CAG',   'name': 'Conagra Brands',            'sector': 'consumer',     'marketCap': 'mid'},
-        {'symbol': 'AZO',   'name': "AutoZone Inc.",             'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'DLTR',  'name': 'Dollar Tree Inc.',          'sector': 'consumer',     'marketCap': 'large'},
-        {'symbol': 'DG',    'name': 'Dollar General Corp.',      'sector': 'consumer',     'marketCap': 'large'},
-        # Extended Real Estate & Utilities
-        {'symbol': 'O',     'name': 'Realty Income Corp.',       'sector': 'realestate',   'marketCap': 'large'},
-        {'symbol': 'WELL',  'name': 'Welltower Inc.',            'sector': 'realestate',   'marketCap': 'large'},
-        {'symbol': 'PSA',   'name': 'Public Storage',            'sector': 'realestate',   'marketCap': 'large'},
-        {'symbol': 'EQR',   'name': 'Equity Residential',        'sector': 'realestate',   'marketCap': 'large'},
-        {'symbol': 'D',     'name': 'Dominion Energy',           'sector': 'utilities',    'marketCap': 'large'},
-        {'symbol': 'AEP',   'name': 'American Electric Power',   'sector': 'utilities',    'marketCap': 'large'},
-        {'symbol': 'XEL',   'name': 'Xcel Energy Inc.',          'sector': 'utilities',    'marketCap': 'large'},
-    ]
-
-def get_us_universe(universe_type):
-    if universe_type == 'dow30':
-        return get_dow30_stocks()
-    elif universe_type == 'sp100':
-        return get_sp100_stocks()
-    elif universe_type == 'nasdaq100':
-        return get_nasdaq100_stocks()
-    elif universe_type == 'sp500':
-        return get_sp500_stocks()
-    return get_sp100_stocks()
+    _log.info('development CORS enabled for all origins')
+
+# ── Response Encoding ────────────────────────────────────────────────────────
+# API bodies and SSE payloads are serialized with orjson when it is installed
+# (compact, no spaces) and with json otherwise. Non-streaming JSON responses
+# of COMPRESS_MIN_BYTES or more are sent br or gzip, whichever the client
+# accepts (br preferred); a response with an ETag keeps its compressed bodies
+# in a small LRU, so repeat /stock-universe and /tickers hits compress once.
+
+_COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+_COMPRESS_MIMETYPES = {'application/json'}
+_COMPRESS_CACHE_MAX = 64
+_GZIP_LEVEL = 6
+_BROTLI_QUALITY = 5        # 4-6 is the usual range for dynamic content
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _dumps(data, sort_keys: bool = False, default=None) -> str:
+    """Compact JSON text of data."""
+    if orjson is not None:
+        options = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        if default is not None:
+            options |= orjson.OPT_PASSTHROUGH_DATETIME
+        try:
+            return orjson.dumps(data, default=default, option=options).decode()
+        except TypeError:
+            pass   # e.g. an int past 64 bits; json copes
+    return json.dumps(data, sort_keys=sort_keys, default=default, separators=(',', ':'))
+
+
+class _JSONProvider(DefaultJSONProvider):
+    """Flask's provider with dumps routed through _dumps (jsonify uses it)."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent') is not None:
+            return super().dumps(obj, **kwargs)
+        return _dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys), default=kwargs.get('default', self.default))
+
+
+app.json = _JSONProvider(app)
+
+_compressed = OrderedDict()    # (etag, encoding) -> compressed body
+_compressed_lock = threading.Lock()
 
 
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0)
+
+
+def _accepted_encoding():
+    """br or gzip, whichever Accept-Encoding rates higher (br on a tie), or None.
+
+    Codings the client rates q=0, or below an explicit identity, are not used.
+    """
+    accept = request.accept_encodings
+    offered = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best = max(offered, key=accept.quality)
+    q = accept.quality(best)
+    if q <= 0 or q < accept.quality('identity'):
+        return None
+    return best
+
+
+@app.after_request
+def _compress_response(resp):
+    if (resp.mimetype not in _COMPRESS_MIMETYPES or resp.is_streamed or resp.direct_passthrough
+            or resp.status_code < 200 or resp.status_code in (204, 304)
+            or 'Content-Encoding' in resp.headers):
+        return resp
+    resp.vary.add('Accept-Encoding')
+    encoding = _accepted_encoding()
+    if encoding is None or (resp.content_length or 0) < _COMPRESS_MIN_BYTES:
+        return resp
+
+    etag, _ = resp.get_etag()
+    key = (etag, encoding)
+    body = None
+    if etag:
+        with _compressed_lock:
+            body = _compressed.get(key)
+            if body is not None:
+                _compressed.move_to_end(key)
+    if body is None:
+        body = _compress(resp.get_data(), encoding)
+        if etag:
+            with _compressed_lock:
+                _compressed[key] = body
+                while len(_compressed) > _COMPRESS_CACHE_MAX:
+                    _compressed.popitem(last=False)
+    resp.set_data(body)
+    resp.headers['Content-Encoding'] = encoding
+    if etag:
+        # Weak: the bytes differ per encoding, and If-None-Match still matches weakly
+        resp.set_etag(etag, weak=True)
+    return resp
+
 # ── CoinGecko Crypto Scanner ─────────────────────────────────────────────────
 
-def _get_binance_kline_changes(symbol: str) -> tuple:
+_BINANCE_TICKER_TTL = 60   # seconds the 24hr ticker ranking is reused
+
+
+def _binance_klines_key(symbol: str) -> tuple:
+    return (symbol, '32d', 'binance-1d')
+
+
+def _binance_since() -> int:
+    """Open time of the oldest of the 32 daily candles a scan looks at."""
+    return _day_start(int(time.time())) - 31 * 86400
+
+
+def _get_binance_kline_changes(symbol: str, refresh: bool = False) -> tuple:
     """Return (weekly_pct, monthly_pct, current_price) for a Binance USDT pair using daily klines."""
     try:
-        resp = requests.get(
-            f"{_BINANCE_BASE}/klines",
-            params={'symbol': symbol, 'interval': '1d', 'limit': 32},
-            headers=_binance_headers(),
-            timeout=15,
-        )
-        if resp.status_code != 200:
-            return None, None, None
-        klines = resp.json()
-        if len(klines) < 8:
+        key = _binance_klines_key(symbol)
+        klines = None if refresh else _price_cache.get(key)
+        if klines is None:
+            stored = _store_load('binance', symbol, _binance_since())
+            klines = None if refresh else _adopt_stored(key, stored, _PRICE_CACHE_TTL_OPEN)
+        if klines is None:
+            # Warm symbols only ask for candles from the last stored one on
+            base = _delta_base(stored, _binance_since())
+            params = {'symbol': symbol, 'interval': '1d', 'limit': 32}
+            if base:
+                params['startTime'] = base['timestamps'][-1] * 1000
+            resp = _http_get(
+                f"{_BINANCE_BASE}/klines",
+                params=params,
+                headers=_binance_headers(),
+                timeout=15,
+            )
+            if resp.status_code != 200:
+                return None, None, None
+            rows = resp.json()
+            fresh = {
+                'timestamps': [r[0] // 1000 for r in rows],
+                'opens':      [float(r[1]) for r in rows],
+                'closes':     [float(r[4]) for r in rows],
+                'volumes':    [float(r[5]) for r in rows],
+                'price':      float(rows[-1][4]) if rows else None,
+                'volume':     None,
+            }
+            klines = _merge_history(base, fresh, keep_last=32) if base else fresh
+            _price_cache.put(key, klines, _PRICE_CACHE_TTL_OPEN, _estimate_history_bytes(klines))
+            _store_save('binance', symbol, fresh)
+        opens, closes = klines['opens'], klines['closes']
+        if len(closes) < 8:
             return None, None, None
-        current       = float(klines[-1][4])          # latest close
-        price_7d_ago  = float(klines[-8][1])           # open of candle 7 days back
-        price_30d_ago = float(klines[-31][1]) if len(klines) >= 31 else float(klines[0][1])
+        current       = closes[-1]                                  # latest close
+        price_7d_ago  = opens[-8]                                   # open of candle 7 days back
+        price_30d_ago = opens[-31] if len(opens) >= 31 else opens[0]
         weekly  = (current - price_7d_ago)  / price_7d_ago  * 100
         monthly = (current - price_30d_ago) / price_30d_ago * 100
         return round(weekly, 2), round(monthly, 2), current
     except Exception as e:
-        print(f"[CRYPTO] klines error for {symbol}: {e}")
+        _log_symbol('binance klines error', logging.WARNING, symbol=symbol, error=str(e))
         return None, None, None
 
 
-def _fetch_binance_coins(universe_size: int) -> list:
-    """Fetch top N crypto coins from Binance by 24h USD volume, with 7d/30d changes from klines."""
-    print(f"[CRYPTO] Fetching top {universe_size} USDT pairs from Binance...")
+def _binance_candle_changes(symbol: str, last_price) -> tuple:
+    """(weekly_pct, monthly_pct, current_price) from held daily candles and a live price.
+
+    The reference prices are the opens of the candles 7 and 30 days back,
+    which never change once those candles have opened, so a cached or stored
+    series reaching back to them stays usable all day and only the current
+    price has to be fresh. (None, None, None) when the series is missing or
+    does not cover the 7-day candle.
+    """
     try:
-        resp = requests.get(f"{_BINANCE_BASE}/ticker/24hr", headers=_binance_headers(), timeout=30)
-        if resp.status_code != 200:
-            print(f"[CRYPTO] Binance ticker returned {resp.status_code}")
-            return []
-        tickers = resp.json()
+        current = float(last_price or 0)
+        if not current:
+            return None, None, None
+        klines = _price_cache.get(_binance_klines_key(symbol))
+        if klines is None:
+            stored = _store_load('binance', symbol, _binance_since())
+            klines = stored[0] if stored else None
+        if not klines or not klines['timestamps']:
+            return None, None, None
+        today = _day_start(int(time.time()))
+        opens = dict(zip(klines['timestamps'], klines['opens']))
+        price_7d_ago = opens.get(today - 7 * 86400)
+        if not price_7d_ago:
+            return None, None, None
+        # Pairs listed less than 30 days ago compare against their first candle
+        price_30d_ago = opens.get(today - 30 * 86400) or klines['opens'][0]
+        weekly  = (current - price_7d_ago)  / price_7d_ago  * 100
+        monthly = (current - price_30d_ago) / price_30d_ago * 100
+        return round(weekly, 2), round(monthly, 2), current
     except Exception as e:
-        print(f"[CRYPTO] Binance ticker request failed: {e}")
-        return []
+        _log_symbol('binance candle error', logging.WARNING, symbol=symbol, error=str(e))
+        return None, None, None
+
+
+_BINANCE_TICKERS_KEY = ('binance', 'ticker/24hr', 'usdt')
+_BINANCE_RANK_MAX    = 500   # largest crypto universe (top500)
+_CRYPTO_UNIVERSE_SIZES = {'top50': 50, 'top100': 100, 'top200': 200, 'top500': 500}
+
 
-    usdt = [
+def _cache_usdt_tickers(tickers) -> list:
+    """Rank non-stablecoin USDT tickers by quote volume and cache the top _BINANCE_RANK_MAX."""
+    usdt = (
         t for t in tickers
         if t['symbol'].endswith('USDT') and t['symbol'][:-4] not in _STABLE_SYMBOLS
-    ]
-    usdt.sort(key=lambda x: float(x.get('quoteVolume', 0)), reverse=True)
-    top_tickers = usdt[:universe_size]
+    )
+    top = heapq.nlargest(_BINANCE_RANK_MAX, usdt, key=lambda x: float(x.get('quoteVolume') or 0))
+    _price_cache.put(_BINANCE_TICKERS_KEY, top, _BINANCE_TICKER_TTL, 256 + len(top) * 500)
+    return top
 
-    print(f"[CRYPTO] Got {len(top_tickers)} pairs, fetching klines in parallel...")
 
-    def build_coin(ticker):
-        symbol    = ticker['symbol']
-        base      = symbol[:-4]
-        quote_vol = float(ticker.get('quoteVolume', 0))
-        cap_label = 'large' if quote_vol > 100_000_000 else 'mid' if quote_vol > 10_000_000 else 'small'
-        weekly, monthly, current = _get_binance_kline_changes(symbol)
-        if weekly is None:
-            return None
-        return {
-            'symbol':    base,
-            'name':      base,
-            '_weekly':   weekly,
-            '_monthly':  monthly,
-            '_current':  current,
-            '_quoteVol': quote_vol,
-            '_capLabel': cap_label,
+def _iter_slim_tickers(resp):
+    """Yield /ticker/24hr entries reduced to the fields the scanner reads.
+
+    With ijson the ~2,000-entry body is parsed straight off the socket, so
+    only one full entry exists at a time; otherwise it falls back to resp.json().
+    """
+    if ijson is None:
+        items = resp.json()
+    else:
+        resp.raw.decode_content = True
+        items = ijson.items(resp.raw, 'item')
+    for t in items:
+        yield {
+            'symbol':      t['symbol'],
+            'openPrice':   t.get('openPrice'),
+            'lastPrice':   t.get('lastPrice'),
+            'quoteVolume': t.get('quoteVolume'),
         }
 
-    coins = []
-    with ThreadPoolExecutor(max_workers=15) as executor:
-        futures = {executor.submit(build_coin, t): t for t in top_tickers}
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                coins.append(result)
 
-    print(f"[CRYPTO] Fetched {len(coins)} coins")
+def _binance_top_tickers(universe_size: int, refresh: bool = False) -> list:
+    """Top N non-stablecoin USDT tickers from /ticker/24hr, ranked by quote volume."""
+    usdt = None if refresh else _price_cache.get(_BINANCE_TICKERS_KEY)
+    if usdt is None:
+        try:
+            with _http_get(f"{_BINANCE_BASE}/ticker/24hr", headers=_binance_headers(),
+                           timeout=30, stream=True) as resp:
+                if resp.status_code != 200:
+                    _log.warning('binance ticker failed', extra={'fields': {'status': resp.status_code}})
+                    return []
+                usdt = _cache_usdt_tickers(_iter_slim_tickers(resp))
+        except Exception as e:
+            _log.warning('binance ticker failed', extra={'fields': {'error': str(e)}})
+            return []
+    return usdt[:universe_size]
+
+
+def _binance_coin(ticker: dict, fetch: bool = True) -> dict:
+    """Coin dict with 7d/30d changes for one /ticker/24hr entry, or None without candles.
+
+    Held candles plus the ticker's lastPrice are used when they reach back
+    far enough; otherwise fetch=True falls back to a /klines request.
+    """
+    symbol    = ticker['symbol']
+    base      = symbol[:-4]
+    quote_vol = float(ticker.get('quoteVolume') or 0)
+    cap_label = 'large' if quote_vol > 100_000_000 else 'mid' if quote_vol > 10_000_000 else 'small'
+    weekly, monthly, current = _binance_candle_changes(symbol, ticker.get('lastPrice'))
+    if weekly is None and fetch:
+        weekly, monthly, current = _get_binance_kline_changes(symbol)
+    if weekly is None:
+        return None
+    return {
+        'symbol':    base,
+        'name':      base,
+        '_weekly':   weekly,
+        '_monthly':  monthly,
+        '_current':  current,
+        '_quoteVol': quote_vol,
+        '_capLabel': cap_label,
+    }
+
+
+def _binance_coin_feed(universe_size: int):
+    """Flight producer: the top-N ticker list first, then (pair, coin or None) per coin.
+
+    Coins whose candles are already held come straight from the ticker's
+    price; only the rest cost a /klines request each.
+    """
+    top_tickers = _binance_top_tickers(universe_size)
+    yield top_tickers
+    cold = []
+    for t in top_tickers:
+        coin = _binance_coin(t, fetch=False)
+        if coin is None:
+            cold.append(t)
+        else:
+            yield t['symbol'], coin
+    if cold:
+        _log.debug('binance klines fallback', extra={'fields': {'pairs': len(cold), 'of': len(top_tickers)}})
+    futures = {_fetch_executors['binance'].submit(_binance_coin, t): t['symbol'] for t in cold}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def iter_crypto_coins(universe_size: int):
+    """Return (total, iterator of (pair, coin or None)) for the top N USDT pairs.
+
+    Coins arrive in completion order. A scan of a smaller universe rides on
+    any larger crypto fetch already in flight and stops as soon as its own
+    top N have arrived; finished klines are served from the price cache.
+    """
+    items = iter(_crypto_flight(universe_size))
+    tickers = (next(items, None) or [])[:universe_size]
+    wanted = {t['symbol'] for t in tickers}
+
+    def coins():
+        remaining = len(wanted)
+        for pair, coin in items:
+            if remaining and pair in wanted:
+                remaining -= 1
+                yield pair, coin
+            if not remaining:
+                return
+
+    return len(tickers), coins()
+
+
+def _fetch_binance_coins(universe_size: int) -> list:
+    """Fetch top N crypto coins from Binance by 24h USD volume, with 7d/30d changes."""
+    total, feed = iter_crypto_coins(universe_size)
+    if not total:
+        return []
+
+    coins = [coin for _, coin in feed if coin]
+    _SCAN_FAILURES.labels('crypto', 'no_candles').inc(total - len(coins))
     return coins
 
 
-def scan_crypto_via_binance(universe_size, weekly_threshold, monthly_threshold, market_cap_filter='all'):
-    """Scan crypto via Binance public API — no key needed, 1200 req/min limit."""
+def _coin_is_dip(coin: dict, weekly_threshold, monthly_threshold, market_cap_filter='all') -> bool:
+    """Scalar form of the mask in scan_crypto_via_binance, for per-coin streaming."""
+    return (coin['_weekly'] <= -weekly_threshold and coin['_monthly'] <= -monthly_threshold
+            and market_cap_filter in ('all', coin['_capLabel']))
+
+
+def scan_crypto_via_binance(universe_size, weekly_threshold, monthly_threshold, market_cap_filter='all', snapshot_rows=None):
+    """Scan crypto via Binance public API — no key needed, 6000 weight/min limit.
+
+    A warm scan costs one /ticker/24hr request; /klines is only requested
+    for pairs whose last 30 days of candles are not stored yet.
+
+    If snapshot_rows is a list, every fetched coin (not just matches) is
+    appended to it in result shape.
+    """
     coins = _fetch_binance_coins(universe_size)
     if not coins:
-        print("[CRYPTO] No coin data (Binance fetch failed)")
+        _log.warning('no crypto data; binance fetch failed')
         return []
 
-    results = []
-    for coin in coins:
-        weekly  = coin['_weekly']
-        monthly = coin['_monthly']
-        current = coin['_current']
-        cap     = coin['_capLabel']
+    # One vectorized threshold/cap pass over every coin
+    weekly_arr  = np.array([c['_weekly'] for c in coins])
+    monthly_arr = np.array([c['_monthly'] for c in coins])
+    mask = (weekly_arr <= -weekly_threshold) & (monthly_arr <= -monthly_threshold)
+    if market_cap_filter != 'all':
+        mask &= np.array([c['_capLabel'] == market_cap_filter for c in coins])
 
-        if market_cap_filter != 'all' and cap != market_cap_filter:
-            continue
-        if weekly <= -weekly_threshold and monthly <= -monthly_threshold:
-            w_factor = 1 + weekly  / 100
-            m_factor = 1 + monthly / 100
-            results.append({
-                'symbol':          coin['symbol'],
-                'name':            coin['name'],
-                'currentPrice':    round(current, 6),
-                'weeklyChange':    weekly,
-                'monthlyChange':   monthly,
-                'priceOneWeekAgo': round(current / w_factor, 6) if w_factor else 0,
-                'priceOneMonthAgo':round(current / m_factor, 6) if m_factor else 0,
-                'volume':          int(coin['_quoteVol']),
-                'marketCap':       cap,
-                'sector':          'crypto',
-                'source':          'binance',
-            })
-            print(f"[MATCH] {coin['symbol']} W:{weekly:.1f}% M:{monthly:.1f}%")
+    results = []
+    for idx in np.flatnonzero(mask):
+        coin = coins[idx]
+        results.append(_crypto_row(coin))
+        _log_symbol('match', symbol=coin['symbol'], weekly=coin['_weekly'], monthly=coin['_monthly'])
 
     results.sort(key=lambda x: x['weeklyChange'])
-    print(f"[CRYPTO] Done — {len(results)} coins matched criteria")
+    if snapshot_rows is not None:
+        snapshot_rows.extend(_crypto_row(c) for c in coins)
     return results
 
 
-# ── Stock Universe Router ─────────────────────────────────────────────────────
+def _crypto_row(coin: dict) -> dict:
+    """A coin from _fetch_binance_coins in scan result shape."""
+    weekly  = coin['_weekly']
+    monthly = coin['_monthly']
+    current = coin['_current']
+    w_factor = 1 + weekly  / 100
+    m_factor = 1 + monthly / 100
+    return {
+        'symbol':          coin['symbol'],
+        'name':            coin['name'],
+        'currentPrice':    round(current, 6),
+        'weeklyChange':    weekly,
+        'monthlyChange':   monthly,
+        'priceOneWeekAgo': round(current / w_factor, 6) if w_factor else 0,
+        'priceOneMonthAgo':round(current / m_factor, 6) if m_factor else 0,
+        'volume':          int(coin['_quoteVol']),
+        'marketCap':       coin['_capLabel'],
+        'sector':          'crypto',
+        'source':          'binance',
+    }
+
+
+# ── Stock Universe Registry ───────────────────────────────────────────────────
+# The curated Nifty and US constituent lists live in data/universes.json
+# (UNIVERSES_PATH), one [symbol, name, sector, marketCap] row per stock. The
+# file is read on first use into an immutable registry and re-read when its
+# mtime changes (checked at most every UNIVERSES_CHECK_INTERVAL seconds), so
+# index membership updates need no deploy or restart. Identical entries
+# shared by several universes (Nifty 50 ⊂ 100 ⊂ 200 ⊂ 500) are one record;
+# the same symbol keeps separate records where lists disagree on its sector
+# or marketCap. Every (universe, sector, marketCap) selection is precomputed,
+# so filtering a scan is a dict lookup.
+
+_UNIVERSES_PATH = os.environ.get(
+    'UNIVERSES_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'universes.json'))
+_UNIVERSES_CHECK_INTERVAL = int(os.environ.get('UNIVERSES_CHECK_INTERVAL', 30))
+
+class _Stock:
+    """Read-only universe entry. Behaves like the old stock dicts for reads
+    and ** unpacking; use dict(stock) where a real dict is needed."""
+
+    __slots__ = ('symbol', 'name', 'sector', 'marketCap')
+
+    def __init__(self, symbol, name, sector, marketCap):
+        for field, value in zip(self.__slots__, (symbol, name, sector, marketCap)):
+            object.__setattr__(self, field, sys.intern(value) if field != 'name' else value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError('_Stock is immutable')
+
+    def keys(self):
+        return self.__slots__
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def __repr__(self):
+        return f"_Stock({self.symbol!r}, {self.sector!r}, {self.marketCap!r})"
+
+
+class _UniverseRegistry:
+    """Universes as tuples of interned _Stock records plus prebuilt filter indexes."""
+
+    def __init__(self, data: dict, version: str = None, generation: int = 0):
+        self.version = version or data.get('version')
+        self.generation = generation            # per-worker load count; changes on every reload
+        self.defaults = data['defaults']        # market -> universe used for unknown names
+        fields = data['fields']
+        interned = {}
+        self._stocks = {}                       # (market, universe, sector, cap) -> tuple
+        self._by_symbol = {}                    # (market, universe) -> {symbol: tuple}
+        for market, universes in data['universes'].items():
+            for universe, rows in universes.items():
+                self._add(market, universe, rows, fields, interned)
+        self.record_count = len(interned)
+
+    def _add(self, market, universe, rows, fields, interned):
+        records = []
+        for row in rows:
+            e = dict(zip(fields, row))
+            key = (e['symbol'], e['name'], e['sector'], e['marketCap'])
+            records.append(interned.setdefault(key, _Stock(*key)))
+        records = tuple(records)
+
+        groups = {}
+        for r in records:
+            for sector in ('all', r.sector):
+                for cap in ('all', r.marketCap):
+                    groups.setdefault((sector, cap), []).append(r)
+        self._stocks[(market, universe, 'all', 'all')] = records
+        for (sector, cap), members in groups.items():
+            self._stocks[(market, universe, sector, cap)] = tuple(members)
+
+        by_symbol = {}
+        for r in records:
+            by_symbol.setdefault(r.symbol, []).append(r)
+        self._by_symbol[(market, universe)] = {s: tuple(rs) for s, rs in by_symbol.items()}
+
+    def has(self, market: str, universe: str) -> bool:
+        return (market, universe) in self._by_symbol
+
+    def resolve(self, market: str, universe: str) -> tuple:
+        market = 'us' if market == 'us' else 'india'
+        if not self.has(market, universe):
+            universe = self.defaults[market]
+        return market, universe
+
+    def stocks(self, market: str, universe: str, sector: str = 'all', cap: str = 'all') -> tuple:
+        market, universe = self.resolve(market, universe)
+        return self._stocks.get((market, universe, sector or 'all', cap or 'all'), ())
+
+    def by_symbol(self, market: str, universe: str) -> dict:
+        """{symbol: records} for a universe; a few lists carry a symbol twice."""
+        return self._by_symbol[self.resolve(market, universe)]
+
+
+_universes_state = {'registry': None, 'mtime': None, 'checked_at': 0, 'loads': 0, 'last_error': None}
+_universes_lock = threading.Lock()
+
+
+def _load_universes() -> _UniverseRegistry:
+    mtime = os.stat(_UNIVERSES_PATH).st_mtime
+    with open(_UNIVERSES_PATH, encoding='utf-8') as fh:
+        registry = _UniverseRegistry(json.load(fh), generation=_universes_state['loads'] + 1)
+    _universes_state.update(registry=registry, mtime=mtime, loads=_universes_state['loads'] + 1, last_error=None)
+    _log.info('universes loaded', extra={'fields': {'version': registry.version, 'records': registry.record_count, 'path': _UNIVERSES_PATH}})
+    return registry
+
+
+def _universe_registry() -> _UniverseRegistry:
+    """Current registry; loads the data file on first use and after it changes.
+
+    Take it once per scan and use that instance throughout, so a reload in
+    the middle of a scan can't mix records from two versions.
+    """
+    registry = _universes_state['registry']
+    now = time.time()
+    if registry is not None and now - _universes_state['checked_at'] < _UNIVERSES_CHECK_INTERVAL:
+        return registry
+    with _universes_lock:
+        registry = _universes_state['registry']
+        if registry is not None and now - _universes_state['checked_at'] < _UNIVERSES_CHECK_INTERVAL:
+            return registry
+        _universes_state['checked_at'] = now
+        try:
+            if registry is None or os.stat(_UNIVERSES_PATH).st_mtime != _universes_state['mtime']:
+                registry = _load_universes()
+        except Exception as e:
+            if registry is None:
+                raise
+            # A bad edit keeps the last good registry serving
+            _universes_state['last_error'] = str(e)
+            _log.warning('universes reload failed', extra={'fields': {'keeping': registry.version, 'error': str(e)}})
+        return registry
 
 def get_stock_universe(universe_type, market='india'):
-    """Get stock universe by market and universe type"""
-    print(f"\n📋 Getting {universe_type} ({market}) stock universe...")
-
-    if market == 'us':
-        stocks = get_us_universe(universe_type)
-        print(f"✅ Got {len(stocks)} US stocks for {universe_type}")
-        return stocks
-
-    # India (default)
-    if universe_type == 'nifty50':
-        stocks = get_nifty_50_stocks()
-        print(f"✅ Got {len(stocks)} stocks for Nifty 50")
-        return stocks
-    elif universe_type == 'nifty100':
-        stocks = get_nifty_100_stocks()
-        print(f"✅ Got {len(stocks)} stocks for Nifty 100")
-        return stocks
-    elif universe_type == 'nifty200':
-        stocks = get_nifty_200_stocks()
-        print(f"✅ Got {len(stocks)} stocks for Nifty 200")
-        return stocks
-    elif universe_type == 'nifty500':
-        stocks = get_nifty_500_stocks()
-        print(f"✅ Got {len(stocks)} stocks for Nifty 500")
-        return stocks
+    """Get stock universe by market and universe type (a shared, read-only tuple)"""
+    stocks = _universe_registry().stocks(market, universe_type)
+    _log.debug('stock universe', extra={'fields': {'market': market, 'universe': universe_type, 'stocks': len(stocks)}})
+    return stocks
+
+# ── Yahoo Finance Fetch ──────────────────────────────────────────────────────
+
+_YAHOO_BASE_URL  = os.environ.get('YAHOO_BASE_URL', 'https://query1.finance.yahoo.com')   # bench/ points these at a local stand-in
+_YAHOO_CHART_URL = _YAHOO_BASE_URL + '/v8/finance/chart'
+_YAHOO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+# Daily bars never include pre/post-market trading and nothing reads the
+# adjusted closes, so ask Yahoo to leave both out of chart responses.
+_YAHOO_CHART_PARAMS = {
+    'includePrePost': 'false',
+    'includeAdjustedClose': 'false',
+}
+
+
+def _fetch_yahoo_history(symbol: str, range_: str = '1mo', interval: str = '1d', refresh: bool = False):
+    """Return a parsed chart history for symbol, served from the cache when fresh.
+
+    History shape:
+      { timestamps: [...], closes: [...], volumes: [...], price: regularMarketPrice }
+
+    For the 1mo/1d series scans use, a stale but recent stored series is
+    extended with period1/period2 instead of downloading the whole month.
+    refresh=True skips the cache read and always asks Yahoo.
+    Returns None when Yahoo fails; failures are never cached.
+    """
+    key = (symbol, range_, interval)
+    base = None
+    if (range_, interval) == ('1mo', '1d'):
+        history, base = _yahoo_lookup(symbol, refresh)
+    else:
+        history = None if refresh else _price_cache.get(key)
+    if history is not None:
+        return history
+
+    params = dict(_YAHOO_CHART_PARAMS, interval=interval)
+    if base:
+        params['period1'] = _day_start(base['timestamps'][-1])
+        params['period2'] = int(time.time())
     else:
-        return get_nifty_100_stocks()
+        params['range'] = range_
+
+    response = _http_get(f"{_YAHOO_CHART_URL}/{symbol}", headers=_YAHOO_HEADERS, params=params, timeout=15)
+
+    if response.status_code != 200:
+        _log_symbol('yahoo chart failed', symbol=symbol, status=response.status_code)
+        return None
+
+    result = _chart_result(response)
+    if result is None:
+        _log_symbol('yahoo chart empty', symbol=symbol)
+        return None
+
+    history = _parse_chart_result(result)
+    if (range_, interval) == ('1mo', '1d'):
+        return _yahoo_commit(symbol, history, base)
+    _price_cache.put(key, history, _history_ttl(symbol), _estimate_history_bytes(history))
+    return history
+
+
+def _yahoo_lookup(symbol: str, refresh: bool = False):
+    """Resolve the 1mo/1d series from cache or store without going upstream.
+
+    Returns (history, None) when fresh data is available, otherwise
+    (None, base) where base is a stored series a delta fetch can extend
+    (None means fetch the full month).
+    """
+    key = (symbol, '1mo', '1d')
+    if not refresh:
+        history = _price_cache.get(key)
+        if history is not None:
+            return history, None
+    now = int(time.time())
+    stored = _store_load('yahoo', symbol, now - 35 * 86400)
+    if not refresh:
+        history = _adopt_stored(key, stored, _history_ttl(symbol))
+        if history is not None:
+            return history, None
+    return None, _delta_base(stored, now - 28 * 86400)
+
+
+def _yahoo_commit(symbol: str, fresh: dict, base: dict = None) -> dict:
+    """Merge freshly fetched bars onto their stored base, cache and persist them."""
+    history = _merge_history(base, fresh) if base else fresh
+    _price_cache.put((symbol, '1mo', '1d'), history, _history_ttl(symbol), _estimate_history_bytes(history))
+    _store_save('yahoo', symbol, fresh)
+    return history
+
+
+def _yahoo_from_store(symbol: str, fresh_until: float = None):
+    """Serve the 1mo/1d history from the on-disk store when it is still fresh."""
+    return _store_load_fresh(
+        'yahoo', symbol, (symbol, '1mo', '1d'), _history_ttl(symbol),
+        int(time.time()) - 35 * 86400, fresh_until,
+    )
+
+
+def _chart_result(response):
+    """The first chart result object in a /v8/finance/chart response, or None.
+
+    The body is a few KB once pre/post-market and adjusted closes are left
+    out; the C json decoder handles that faster than an ijson event loop
+    would, so only the large Binance ticker list is stream-parsed.
+    """
+    chart = json.loads(response.content).get('chart') or {}
+    results = chart.get('result') or []
+    return results[0] if results else None
+
+
+def _parse_chart_result(result: dict) -> dict:
+    """Reduce one chart/spark result object to the history shape we cache.
+
+    Only the timestamp, close and volume arrays and the meta price/volume are
+    kept; the arrays are referenced as decoded, never copied or zipped, and
+    open/high/low and the rest of meta are dropped with the response.
+    """
+    quote = (result.get('indicators', {}).get('quote') or [{}])[0]
+    meta = result.get('meta', {})
+    timestamps = result.get('timestamp') or []
+    return {
+        'timestamps': timestamps,
+        'closes':     quote.get('close') or [None] * len(timestamps),
+        'volumes':    quote.get('volume') or [None] * len(timestamps),
+        'price':      meta.get('regularMarketPrice'),
+        'volume':     meta.get('regularMarketVolume'),
+    }
+
+
+# ── Batched Yahoo Fetch ──────────────────────────────────────────────────────
+# The spark endpoint returns chart-shaped histories for many symbols in one
+# request. Scans go through iter_yahoo_finance_data, which serves cached
+# symbols immediately, batches the rest through spark and only falls back to
+# one chart request per symbol for whatever a batch did not return.
 
-def process_single_stock(stock, weekly_threshold, monthly_threshold):
-    """Process a single stock and return result if it matches criteria"""
+_YAHOO_SPARK_URL = _YAHOO_BASE_URL + '/v7/finance/spark'
+_SPARK_BATCH_SIZE = 20   # Yahoo rejects larger spark requests
+
+
+def _fetch_yahoo_spark(symbols: list, range_: str = '1mo', interval: str = '1d') -> dict:
+    """Fetch histories for up to _SPARK_BATCH_SIZE symbols in one request.
+
+    Returns {symbol: history} for the symbols Yahoo answered; anything missing
+    from the dict should be retried per-symbol. Nothing is cached here, the
+    caller merges and commits each history.
+    """
+    params = {
+        'symbols': ','.join(symbols),
+        'range': range_,
+        'interval': interval,
+    }
     try:
-        # Fetch REAL market data from Yahoo Finance
-        market_data = fetch_yahoo_finance_data(stock['symbol'])
-        
-        # Count data quality
-        if market_data['status'] == 'success':
-            # Check criteria
-            weekly_decline = market_data['weeklyChange'] <= -weekly_threshold
-            monthly_decline = market_data['monthlyChange'] <= -monthly_threshold
-            
-            if weekly_decline and monthly_decline:
-                result = {**stock, **market_data}
-                print(f"[MATCH] {stock['symbol']} - W:{market_data['weeklyChange']}% M:{market_data['monthlyChange']}% [YAHOO FINANCE]")
-                return {'status': 'match', 'data': result}
-            else:
-                return {'status': 'no_match', 'data': market_data}
-        else:  # failed
-            print(f"[FAILED] {stock['symbol']} - Yahoo Finance API failed")
-            return {'status': 'failed', 'data': market_data}
+        response = _http_get(_YAHOO_SPARK_URL, headers=_YAHOO_HEADERS, params=params, timeout=15)
+        if response.status_code != 200:
+            _log.warning('yahoo spark failed', extra={'fields': {'symbols': len(symbols), 'status': response.status_code}})
+            return {}
+        results = (response.json().get('spark') or {}).get('result') or []
     except Exception as e:
-        print(f"[ERROR] {stock['symbol']} - {str(e)}")
-        return {'status': 'error', 'data': None}
+        _log.warning('yahoo spark error', extra={'fields': {'symbols': len(symbols), 'error': str(e)}})
+        return {}
+
+    histories = {}
+    for item in results:
+        symbol = item.get('symbol')
+        chart = (item.get('response') or [None])[0]
+        if symbol not in symbols or not chart or not chart.get('timestamp'):
+            continue
+        histories[symbol] = _parse_chart_result(chart)
+    return histories
 
-def fetch_yahoo_finance_data(symbol):
-    """Fetch real stock data from Yahoo Finance - ONLY working source"""
-    print(f"🔍 Fetching REAL data from Yahoo Finance for {symbol}...")
-    
+
+def iter_yahoo_batches(symbols, refresh: bool = False):
+    """Yield _PriceMatrix batches covering every symbol as data becomes available.
+
+    Cached and fresh-stored symbols come first, as one matrix. Symbols with a
+    recent stored series are batched with range=5d and merged onto it; the
+    rest get the full month. Whatever spark misses is fetched per-symbol and
+    yielded as a one-row matrix. refresh=True bypasses fresh cached histories
+    and refetches every symbol.
+    """
+    hit_symbols, hit_histories = [], []
+    full, delta, bases = [], [], {}
+    for symbol in symbols:
+        history, base = _yahoo_lookup(symbol, refresh)
+        if history is not None:
+            hit_symbols.append(symbol)
+            hit_histories.append(history)
+        elif base is not None:
+            bases[symbol] = base
+            delta.append(symbol)
+        else:
+            full.append(symbol)
+    if hit_symbols:
+        yield _PriceMatrix(hit_symbols, hit_histories)
+    if not full and not delta:
+        return
+
+    chunks = [(full[i:i + _SPARK_BATCH_SIZE], '1mo') for i in range(0, len(full), _SPARK_BATCH_SIZE)]
+    chunks += [(delta[i:i + _SPARK_BATCH_SIZE], '5d') for i in range(0, len(delta), _SPARK_BATCH_SIZE)]
+    _log.debug('yahoo batches', extra={'fields': {'full': len(full), 'delta': len(delta), 'batches': len(chunks)}})
+
+    futures = {_fetch_executors['yahoo'].submit(_fetch_yahoo_spark, chunk, range_): chunk for chunk, range_ in chunks}
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            job = futures.pop(future)
+            if isinstance(job, str):
+                # Per-symbol fallback finished
+                yield _PriceMatrix([job], [future.result()])
+                continue
+            histories = future.result()
+            got = [s for s in job if s in histories]
+            for symbol in job:
+                if symbol not in histories:
+                    futures[_fetch_executors['yahoo'].submit(_yahoo_history_or_none, symbol)] = symbol
+            if got:
+                yield _PriceMatrix(got, [_yahoo_commit(s, histories[s], bases.get(s)) for s in got])
+
+
+def iter_yahoo_finance_data(symbols, refresh: bool = False):
+    """Yield (symbol, market_data) for each symbol as its data becomes available.
+
+    market_data has the same shape as fetch_yahoo_finance_data's return value.
+    """
+    for batch in iter_yahoo_batches(symbols, refresh):
+        for i, symbol in enumerate(batch.symbols):
+            yield symbol, batch.market_data(i)
+
+
+def _yahoo_history_or_none(symbol):
     try:
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
-        params = {
-            'range': '1mo',
-            'interval': '1d',
-            'includePrePost': 'true'
-        }
-        
-        # Small delay to respect API rate limits (but much less than 1 second)
-        time.sleep(0.1)
-        response = requests.get(url, headers=headers, params=params, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            if data.get('chart') and data['chart'].get('result'):
-                result = data['chart']['result'][0]
-                
-                timestamps = result['timestamp']
-                indicators = result['indicators']['quote'][0]
-                closes = indicators['close']
-                
-                # Remove None values and create valid data points
-                valid_data = [(ts, close) for ts, close in zip(timestamps, closes) if close is not None]
-                
-                if len(valid_data) >= 7:  # Need at least a week of data
-                    # Use regularMarketPrice for today's actual close.
-                    # valid_data[-1] can be yesterday's close when today's
-                    # candle hasn't settled in the chart yet.
-                    current_price = result.get('meta', {}).get('regularMarketPrice') or valid_data[-1][1]
-                    
-                    # Calculate dates for comparison from now, not from last chart timestamp
-                    now_ts = int(time.time())
-                    week_ago_ts = now_ts - (7 * 24 * 60 * 60)
-                    month_ago_ts = now_ts - (30 * 24 * 60 * 60)
-                    
-                    # Find closest prices to our target dates
-                    week_price = None
-                    month_price = None
-                    
-                    for ts, price in valid_data:
-                        if ts <= week_ago_ts:
-                            week_price = price
-                        if ts <= month_ago_ts:
-                            month_price = price
-                    
-                    # Use earliest available if we don't have enough history
-                    if week_price is None:
-                        week_price = valid_data[0][1]
-                    if month_price is None:
-                        month_price = valid_data[0][1]
-                    
-                    # Calculate percentage changes
-                    weekly_change = ((current_price - week_price) / week_price) * 100
-                    monthly_change = ((current_price - month_price) / month_price) * 100
-                    
-                    # Get volume (latest non-null)
-                    volumes = indicators.get('volume', [])
-                    volume = 0
-                    for v in reversed(volumes):
-                        if v is not None and v > 0:
-                            volume = int(v)
-                            break
-                    
-                    print(f"✅ SUCCESS: Got real data for {symbol} - ₹{current_price:.2f}")
-                    
-                    return {
-                        'symbol': symbol,
-                        'currentPrice': round(current_price, 2),
-                        'priceOneWeekAgo': round(week_price, 2),
-                        'priceOneMonthAgo': round(month_price, 2),
-                        'weeklyChange': round(weekly_change, 2),
-                        'monthlyChange': round(monthly_change, 2),
-                        'volume': volume,
-                        'lastUpdated': datetime.now().isoformat(),
-                        'status': 'success',
-                        'source': 'yahoo_finance'
-                    }
-        
-        print(f"❌ Yahoo Finance API failed for {symbol}: Status {response.status_code}")
-        
+        return _fetch_yahoo_history(symbol)
     except Exception as e:
-        print(f"❌ Yahoo Finance API error for {symbol}: {str(e)}")
-    
+        _log_symbol('yahoo chart error', logging.WARNING, symbol=symbol, error=str(e))
+        return None
+
+
+def fetch_yahoo_finance_data(symbol):
+    """Fetch real stock data from Yahoo Finance - ONLY working source"""
+    _log_symbol('yahoo fetch', symbol=symbol)
+    return _PriceMatrix([symbol], [_yahoo_history_or_none(symbol)]).market_data(0)
+
+
+def _yahoo_failure(symbol):
     # If Yahoo Finance fails, return clear error
     return {
         'symbol': symbol,
@@ -1440,6 +1672,1001 @@ def fetch_yahoo_finance_data(symbol):
         'note': 'This stock will be excluded from scan results'
     }
 
+
+# ── Vectorized Screening ─────────────────────────────────────────────────────
+# A batch of histories is laid out as a symbols × days close matrix on one
+# sorted timestamp axis. Week-ago / month-ago lookups, percentage changes and
+# the threshold mask are then single NumPy passes over the whole batch.
+
+class _PriceMatrix:
+    """Weekly/monthly change for many Yahoo histories at once.
+
+    Matches the per-symbol rules: current price is regularMarketPrice (else the
+    last close), the week/month-ago price is the last close at or before
+    now-7d / now-30d (else the earliest close), and at least 7 closes are needed.
+    """
+
+    def __init__(self, symbols, histories, now_ts=None):
+        self.symbols = list(symbols)
+        self._histories = histories
+        n = len(self.symbols)
+        now_ts = int(time.time()) if now_ts is None else now_ts
+
+        lengths = [min(len(h['timestamps']), len(h['closes'])) if h else 0 for h in histories]
+        ts_flat = np.array([t for h, m in zip(histories, lengths) if m for t in h['timestamps'][:m]], dtype=np.int64)
+        close_flat = np.array([c for h, m in zip(histories, lengths) if m for c in h['closes'][:m]], dtype=float)
+        self.axis = np.unique(ts_flat)
+        if not len(self.axis):
+            nan = np.full(n, np.nan)
+            self.ok = np.zeros(n, dtype=bool)
+            self.current = self.week_price = self.month_price = self.weekly = self.monthly = nan
+            return
+
+        closes = np.full((n, len(self.axis)), np.nan)
+        closes[np.repeat(np.arange(n), lengths), np.searchsorted(self.axis, ts_flat)] = close_flat
+        valid = ~np.isnan(closes)
+        rows = np.arange(n)
+        first = closes[rows, valid.argmax(axis=1)]
+
+        def price_at(target_ts):
+            # Last valid close at or before target_ts, else the row's first close
+            j = np.searchsorted(self.axis, target_ts, side='right') - 1
+            if j < 0:
+                return first
+            window = valid[:, j::-1]
+            last = j - window.argmax(axis=1)
+            return np.where(window.any(axis=1), closes[rows, last], first)
+
+        meta_price = np.array([(h or {}).get('price') or np.nan for h in histories], dtype=float)
+        self.current = np.where(np.isnan(meta_price), price_at(self.axis[-1]), meta_price)
+        self.week_price = price_at(now_ts - 7 * 24 * 60 * 60)
+        self.month_price = price_at(now_ts - 30 * 24 * 60 * 60)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.weekly = np.round((self.current - self.week_price) / self.week_price * 100, 2)
+            self.monthly = np.round((self.current - self.month_price) / self.month_price * 100, 2)
+        self.ok = (valid.sum(axis=1) >= 7) & np.isfinite(self.weekly) & np.isfinite(self.monthly)
+
+    def failure_reason(self, i) -> str:
+        """Why row i has no result, as a scan_failures_total reason label."""
+        return 'fetch_failed' if self._histories[i] is None else 'insufficient_history'
+
+    def dip_mask(self, weekly_threshold, monthly_threshold):
+        """Boolean mask of rows down at least the given percentages over both windows."""
+        return self.ok & (self.weekly <= -weekly_threshold) & (self.monthly <= -monthly_threshold)
+
+    def market_data(self, i):
+        """Row i in fetch_yahoo_finance_data's result shape."""
+        symbol = self.symbols[i]
+        if not self.ok[i]:
+            return _yahoo_failure(symbol)
+
+        # Get volume (latest non-null); spark batches carry only the meta volume
+        history = self._histories[i]
+        volume = 0
+        for v in reversed(history['volumes']):
+            if v is not None and v > 0:
+                volume = int(v)
+                break
+        if not volume and history.get('volume'):
+            volume = int(history['volume'])
+
+        return {
+            'symbol': symbol,
+            'currentPrice': round(float(self.current[i]), 2),
+            'priceOneWeekAgo': round(float(self.week_price[i]), 2),
+            'priceOneMonthAgo': round(float(self.month_price[i]), 2),
+            'weeklyChange': float(self.weekly[i]),
+            'monthlyChange': float(self.monthly[i]),
+            'volume': volume,
+            'lastUpdated': datetime.now().isoformat(),
+            'status': 'success',
+            'source': 'yahoo_finance'
+        }
+
+# ── Background Pre-warmer ─────────────────────────────────────────────────────
+# Keeps the configured universes in the price cache so /scan and /scan-stream
+# mostly filter in-memory data. Every PREWARM_INTERVAL seconds it refetches
+# whatever would expire before the next cycle; after market close that is
+# close to nothing. POST /prewarm wakes it immediately (used by keep-alive.yml).
+
+_US_UNIVERSES = ('dow30', 'sp100', 'nasdaq100', 'sp500')
+
+_PREWARM_ENABLED    = os.environ.get('PREWARM_ENABLED', '1' if os.environ.get('RENDER') else '0') == '1'
+_PREWARM_INTERVAL   = int(os.environ.get('PREWARM_INTERVAL', 60))
+_PREWARM_UNIVERSES  = [u.strip() for u in os.environ.get(
+    'PREWARM_UNIVERSES', 'nifty50,nifty100,nifty200,nifty500,dow30,sp100,nasdaq100,sp500'
+).split(',') if u.strip()]
+_PREWARM_CRYPTO_TOP = int(os.environ.get('PREWARM_CRYPTO_TOP', 100))
+
+_prewarm_wake = threading.Event()
+_prewarm_status = {
+    'enabled':        _PREWARM_ENABLED,
+    'interval':       _PREWARM_INTERVAL,
+    'universes':      _PREWARM_UNIVERSES,
+    'crypto_top':     _PREWARM_CRYPTO_TOP,
+    'cycles':         0,
+    'last_run':       None,
+    'last_duration':  None,
+    'last_refreshed': 0,
+    'last_leader':    None,
+    'last_error':     None,
+}
+
+
+@contextmanager
+def _prewarm_leader():
+    """Yield True if this worker should hit upstream this cycle.
+
+    Workers share the OHLCV store, so only the one holding the lock file
+    refreshes upstream; the others pick its results up from the store.
+    """
+    if fcntl is None:
+        yield True
+        return
+    with open(_OHLCV_DB_PATH + '.prewarm.lock', 'a') as fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _prewarm_once():
+    """Refresh every prewarmed symbol whose cache entry expires before the next cycle."""
+    started = time.time()
+    horizon = started + _PREWARM_INTERVAL + 5
+    refreshed = 0
+
+    symbols = {}
+    for universe in _PREWARM_UNIVERSES:
+        market = 'us' if universe in _US_UNIVERSES else 'india'
+        for stock in get_stock_universe(universe, market):
+            symbols[stock['symbol']] = None
+    stale = [s for s in symbols if _price_cache.expires_at((s, '1mo', '1d')) < horizon]
+    # Another worker may already have refreshed these into the shared store
+    stale = [s for s in stale if _yahoo_from_store(s, fresh_until=horizon) is None]
+
+    with _prewarm_leader() as leader:
+        if leader:
+            for _, market_data in iter_yahoo_finance_data(stale, refresh=True):
+                if market_data['status'] == 'success':
+                    refreshed += 1
+
+        if _PREWARM_CRYPTO_TOP:
+            # Scans price coins off the ticker; klines are only needed where
+            # the stored candles do not reach back to the reference days
+            tickers = _binance_top_tickers(_PREWARM_CRYPTO_TOP, refresh=leader)
+            stale = [t['symbol'] for t in tickers
+                     if _binance_candle_changes(t['symbol'], t.get('lastPrice'))[0] is None]
+            if leader:
+                futures = [_fetch_executors['binance'].submit(_get_binance_kline_changes, s, True) for s in stale]
+                for future in as_completed(futures):
+                    if future.result()[0] is not None:
+                        refreshed += 1
+
+    _prewarm_status.update({
+        'cycles':         _prewarm_status['cycles'] + 1,
+        'last_run':       datetime.now().isoformat(),
+        'last_duration':  round(time.time() - started, 2),
+        'last_refreshed': refreshed,
+        'last_leader':    leader,
+        'last_error':     None,
+    })
+    _log.debug('prewarm finished', extra={'fields': {
+        'refreshed': refreshed, 'seconds': round(time.time() - started, 1), 'leader': leader,
+    }})
+
+
+def _prewarm_loop():
+    while True:
+        try:
+            _prewarm_once()
+        except Exception as e:
+            _prewarm_status['last_error'] = str(e)
+            _log.error('prewarm failed', extra={'fields': {'error': str(e)}})
+        _prewarm_wake.wait(_PREWARM_INTERVAL)
+        _prewarm_wake.clear()
+
+
+if _PREWARM_ENABLED:
+    threading.Thread(target=_prewarm_loop, name='prewarm', daemon=True).start()
+    _log.info('pre-warmer enabled', extra={'fields': {'interval': _PREWARM_INTERVAL, 'universes': ','.join(_PREWARM_UNIVERSES)}})
+
+# ── Live Binance Feed ────────────────────────────────────────────────────────
+# Optional (BINANCE_WS=1, needs websocket-client). One combined-stream
+# connection per worker keeps the crypto scan inputs in the price cache:
+# !miniTicker@arr refreshes the 24hr quote-volume ranking, and <pair>@kline_1d
+# for the top BINANCE_WS_TOP pairs rewrites today's candle of each cached
+# kline series. Scans then find both in cache and skip /ticker/24hr and the
+# per-coin klines calls. A pair without a contiguous series in cache or store
+# is left to the normal REST path, which seeds it for the stream to extend.
+# BINANCE_WS_URL can point at a local stand-in that replays recorded frames.
+
+_BINANCE_WS_ENABLED = os.environ.get('BINANCE_WS', '0') == '1'
+_BINANCE_WS_URL     = os.environ.get('BINANCE_WS_URL', 'wss://stream.binance.com:9443')
+_BINANCE_WS_TOP     = int(os.environ.get('BINANCE_WS_TOP', 200))
+_BINANCE_WS_MAX_AGE = 23 * 3600   # Binance drops connections after 24h; reconnect first
+
+
+class _BinanceLiveFeed:
+    """Applies Binance stream frames to the price cache."""
+
+    def __init__(self, url: str, top: int):
+        self.url = url
+        self.top = top
+        self.tickers = {}           # pair -> /ticker/24hr-shaped dict
+        self._tickers_put_at = 0
+        self.status = {
+            'enabled':     True,
+            'connected':   False,
+            'connects':    0,
+            'frames':      0,
+            'klines':      0,
+            'kline_skips': 0,
+            'last_frame':  None,
+            'last_error':  None,
+        }
+
+    def seed(self) -> list:
+        """Restart the ticker map from the REST ranking.
+
+        !miniTicker@arr frames only carry the pairs that changed in the last
+        second, so they update this map rather than replace the ranking.
+        """
+        ranked = _binance_top_tickers(_BINANCE_RANK_MAX, refresh=True)
+        if not ranked:
+            raise RuntimeError('no /ticker/24hr ranking to seed the live feed from')
+        self.tickers = {t['symbol']: dict(t) for t in ranked}
+        self._tickers_put_at = time.time()
+        return ranked
+
+    def streams(self, ranked: list) -> list:
+        pairs = [t['symbol'] for t in ranked[:self.top]]
+        return ['!miniTicker@arr'] + [f"{p.lower()}@kline_1d" for p in pairs]
+
+    def on_frame(self, message: str):
+        frame = json.loads(message)
+        data = frame.get('data')
+        if data is None:            # SUBSCRIBE acknowledgements
+            return
+        self.status['frames'] += 1
+        self.status['last_frame'] = datetime.now().isoformat()
+        if isinstance(data, list):
+            self.on_mini_tickers(data)
+        elif data.get('e') == 'kline':
+            self.on_kline(data['s'], data['k'])
+
+    def on_mini_tickers(self, items: list):
+        if not self.tickers:        # not seeded; a lone frame is no ranking
+            return
+        for m in items:
+            self.tickers[m['s']] = {
+                'symbol':      m['s'],
+                'openPrice':   m['o'],
+                'lastPrice':   m['c'],
+                'quoteVolume': m['q'],
+            }
+        # The array only carries pairs that changed; re-rank at most every 5s
+        if time.time() - self._tickers_put_at >= 5:
+            _cache_usdt_tickers(self.tickers.values())
+            self._tickers_put_at = time.time()
+
+    def on_kline(self, pair: str, k: dict):
+        key = _binance_klines_key(pair)
+        candle = {
+            'timestamps': [k['t'] // 1000],
+            'opens':      [float(k['o'])],
+            'closes':     [float(k['c'])],
+            'volumes':    [float(k['v'])],
+            'price':      float(k['c']),
+            'volume':     None,
+        }
+        base = _price_cache.get(key)
+        if base is None:
+            base = _delta_base(_store_load('binance', pair, _binance_since()), _binance_since())
+        # Only extend a series whose last candle is today's or yesterday's
+        if base is None or candle['timestamps'][0] - base['timestamps'][-1] > 86400:
+            self.status['kline_skips'] += 1
+            return
+        klines = _merge_history(base, candle, keep_last=32)
+        _price_cache.put(key, klines, _PRICE_CACHE_TTL_OPEN, _estimate_history_bytes(klines))
+        self.status['klines'] += 1
+
+    def run_once(self):
+        ranked = self.seed()
+        ws = websocket.create_connection(f"{self.url}/stream", timeout=30)
+        try:
+            streams = self.streams(ranked)
+            for i in range(0, len(streams), 200):
+                ws.send(json.dumps({'method': 'SUBSCRIBE', 'params': streams[i:i + 200], 'id': i // 200 + 1}))
+            self.status.update(connected=True, connects=self.status['connects'] + 1)
+            _log.info('binance ws subscribed', extra={'fields': {'streams': len(streams), 'url': self.url}})
+            opened = time.time()
+            while time.time() - opened < _BINANCE_WS_MAX_AGE:
+                try:
+                    message = ws.recv()
+                except websocket.WebSocketTimeoutException:
+                    continue
+                if not message:
+                    return
+                self.on_frame(message)
+        finally:
+            self.status['connected'] = False
+            ws.close()
+
+    def run(self):
+        backoff = 1
+        while True:
+            started = time.time()
+            try:
+                self.run_once()
+            except Exception as e:
+                self.status['last_error'] = str(e)
+                _log.error('binance ws failed', extra={'fields': {'error': str(e)}})
+            if time.time() - started > 60:
+                backoff = 1
+            time.sleep(backoff * random.uniform(0.5, 1.5))
+            backoff = min(backoff * 2, 60)
+
+
+_binance_live = None
+if _BINANCE_WS_ENABLED:
+    if websocket is None:
+        _log.warning('BINANCE_WS=1 but websocket-client is not installed; crypto scans use REST')
+    else:
+        _binance_live = _BinanceLiveFeed(_BINANCE_WS_URL, _BINANCE_WS_TOP)
+        threading.Thread(target=_binance_live.run, name='binance-ws', daemon=True).start()
+        _log.info('binance live feed enabled', extra={'fields': {'top': _BINANCE_WS_TOP, 'url': _BINANCE_WS_URL}})
+
+# ── Scan Snapshots ───────────────────────────────────────────────────────────
+# Every scan keeps the computed change for every symbol it screened, not just
+# the matches, under a snapshot ID. /refilter re-applies new thresholds and
+# sector / market-cap filters to it without touching market data. Snapshots
+# live in this worker's memory and in the shared SQLite file, so the other
+# gunicorn worker can serve a re-filter too.
+
+_SNAPSHOT_TTL        = int(os.environ.get('SNAPSHOT_TTL', 1800))
+_SNAPSHOT_MEMORY_MAX = 32
+
+
+class _ScanSnapshot:
+    """Screened rows of one scan with column arrays for vectorized re-filtering."""
+
+    def __init__(self, market, universe, universe_size, rows, failed, covers,
+                 snapshot_id=None, created_at=None):
+        self.id = snapshot_id or uuid.uuid4().hex
+        self.created_at = created_at or time.time()
+        self.market = market
+        self.universe = universe
+        self.universe_size = universe_size
+        self.rows = rows          # result-shaped dicts for every symbol with data
+        self.failed = failed      # symbols that could not be fetched
+        self.covers = covers      # {'sectorFilter', 'marketCapFilter'} the scan was run with
+        self._weekly = np.array([r['weeklyChange'] for r in rows], dtype=float)
+        self._monthly = np.array([r['monthlyChange'] for r in rows], dtype=float)
+        self._sector = np.array([r.get('sector') or '' for r in rows], dtype=object)
+        self._cap = np.array([r.get('marketCap') or '' for r in rows], dtype=object)
+
+    def covers_filters(self, sector_filter, market_cap_filter) -> bool:
+        """A snapshot taken with a filter can only be narrowed to that same filter."""
+        return (self.covers['sectorFilter'] in ('all', sector_filter)
+                and self.covers['marketCapFilter'] in ('all', market_cap_filter))
+
+    def filter(self, weekly_threshold, monthly_threshold, sector_filter='all', market_cap_filter='all') -> list:
+        mask = (self._weekly <= -weekly_threshold) & (self._monthly <= -monthly_threshold)
+        if sector_filter != 'all':
+            mask &= self._sector == sector_filter
+        if market_cap_filter != 'all':
+            mask &= self._cap == market_cap_filter
+        results = [self.rows[i] for i in np.flatnonzero(mask)]
+        results.sort(key=lambda x: x['weeklyChange'])
+        return results
+
+    def to_json(self) -> str:
+        return _dumps({
+            'market': self.market, 'universe': self.universe, 'universe_size': self.universe_size,
+            'rows': self.rows, 'failed': self.failed, 'covers': self.covers,
+        })
+
+    @classmethod
+    def from_json(cls, snapshot_id, created_at, payload):
+        data = json.loads(payload)
+        return cls(data['market'], data['universe'], data['universe_size'], data['rows'],
+                   data['failed'], data['covers'], snapshot_id, created_at)
+
+
+_snapshots = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+def _remember_snapshot(snapshot: _ScanSnapshot):
+    with _snapshots_lock:
+        _snapshots[snapshot.id] = snapshot
+        while len(_snapshots) > _SNAPSHOT_MEMORY_MAX:
+            _snapshots.popitem(last=False)
+
+
+def _save_snapshot(snapshot: _ScanSnapshot) -> str:
+    _remember_snapshot(snapshot)
+    try:
+        _ohlcv_store.save_snapshot(snapshot.id, snapshot.created_at, snapshot.to_json(), _SNAPSHOT_TTL)
+    except Exception as e:
+        _log.warning('snapshot save failed', extra={'fields': {'snapshot': snapshot.id, 'error': str(e)}})
+    return snapshot.id
+
+
+def _load_snapshot(snapshot_id: str):
+    """Return a live snapshot by ID from memory or the shared store, else None."""
+    with _snapshots_lock:
+        snapshot = _snapshots.get(snapshot_id)
+    if snapshot is None:
+        try:
+            row = _ohlcv_store.load_snapshot(snapshot_id)
+        except Exception as e:
+            _log.warning('snapshot load failed', extra={'fields': {'snapshot': snapshot_id, 'error': str(e)}})
+            row = None
+        if row is None:
+            return None
+        snapshot = _ScanSnapshot.from_json(snapshot_id, row[0], row[1])
+        _remember_snapshot(snapshot)
+    if snapshot.created_at + _SNAPSHOT_TTL < time.time():
+        return None
+    return snapshot
+
+# ── Scan Sharding ────────────────────────────────────────────────────────────
+# A big universe scan would otherwise run inside one gunicorn worker while the
+# other sits idle. Symbols that need an upstream fetch are split into shards
+# queued in the shared SQLite file; every worker's shard thread claims queued
+# shards and fetches them, which commits the histories to the shared store.
+# The originating worker works through its own job too and, as other workers
+# finish shards, loads those histories from the store into the scan's flight.
+# A shard whose claimant goes quiet for SCAN_SHARD_TIMEOUT is claimed again.
+
+_SHARD_ENABLED = os.environ.get('SCAN_SHARDING', '1' if os.environ.get('RENDER') else '0') == '1'
+_SHARD_SIZE    = int(os.environ.get('SCAN_SHARD_SIZE', 100))
+_SHARD_POLL    = float(os.environ.get('SCAN_SHARD_POLL', 0.25))
+_SHARD_TIMEOUT = int(os.environ.get('SCAN_SHARD_TIMEOUT', 90))
+
+_shard_status = {
+    'enabled':       _SHARD_ENABLED,
+    'shard_size':    _SHARD_SIZE,
+    'jobs':          0,
+    'shards_local':  0,   # shards of this worker's jobs it fetched itself
+    'shards_remote': 0,   # shards of this worker's jobs another worker fetched
+    'shards_served': 0,   # shards this worker's shard thread fetched
+    'last_error':    None,
+}
+
+
+def _run_shard(job_id: str, shard: int, symbols: list):
+    """Fetch a claimed shard into the shared store and mark it done."""
+    try:
+        for _ in iter_yahoo_batches(symbols):
+            pass
+    finally:
+        _ohlcv_store.finish_shard(job_id, shard)
+
+
+def iter_sharded_batches(symbols):
+    """iter_yahoo_batches, with the upstream part spread over every worker.
+
+    Cached and fresh-stored symbols come first as one matrix. With sharding
+    off, or when no more than one shard's worth needs fetching, the rest is
+    fetched here as before.
+    """
+    hit_symbols, hit_histories, misses = [], [], []
+    for symbol in symbols:
+        history, _ = _yahoo_lookup(symbol)
+        if history is not None:
+            hit_symbols.append(symbol)
+            hit_histories.append(history)
+        else:
+            misses.append(symbol)
+    if hit_symbols:
+        yield _PriceMatrix(hit_symbols, hit_histories)
+    if not misses:
+        return
+    if not _SHARD_ENABLED or len(misses) <= _SHARD_SIZE:
+        yield from iter_yahoo_batches(misses)
+        return
+
+    job_id = uuid.uuid4().hex
+    shards = {n: misses[i:i + _SHARD_SIZE] for n, i in enumerate(range(0, len(misses), _SHARD_SIZE))}
+    try:
+        _ohlcv_store.enqueue_shards(job_id, shards, max_age=3600)
+    except Exception as e:
+        _log.warning('shard enqueue failed; fetching here', extra={'fields': {'symbols': len(misses), 'error': str(e)}})
+        yield from iter_yahoo_batches(misses)
+        return
+
+    started = time.time()
+    _log.debug('shard job queued', extra={'fields': {'job': job_id[:8], 'symbols': len(misses), 'shards': len(shards)}})
+    pending = set(shards)
+    local = set()
+    try:
+        while pending:
+            claimed = _ohlcv_store.claim_shard(_SHARD_TIMEOUT, job_id)
+            if claimed is not None:
+                _, shard, shard_symbols = claimed
+                local.add(shard)
+                try:
+                    yield from iter_yahoo_batches(shard_symbols)
+                finally:
+                    _ohlcv_store.finish_shard(job_id, shard)
+                pending.discard(shard)
+                _shard_status['shards_local'] += 1
+
+            for shard, state in _ohlcv_store.shard_states(job_id).items():
+                if state != 'done' or shard not in pending or shard in local:
+                    continue
+                # Fetched elsewhere (possibly by this worker's shard thread); the store has it
+                pending.discard(shard)
+                _shard_status['shards_remote'] += 1
+                yield _PriceMatrix(shards[shard], [_yahoo_from_store(s) for s in shards[shard]])
+
+            if pending and claimed is None:
+                time.sleep(_SHARD_POLL)
+    finally:
+        try:
+            _ohlcv_store.drop_shards(job_id)
+        except Exception as e:
+            _log.warning('shard cleanup failed', extra={'fields': {'job': job_id[:8], 'error': str(e)}})
+    _shard_status['jobs'] += 1
+    _log.debug('shard job finished', extra={'fields': {
+        'job': job_id[:8], 'seconds': round(time.time() - started, 1), 'local': len(local), 'shards': len(shards),
+    }})
+
+
+def _shard_loop():
+    while True:
+        try:
+            claimed = _ohlcv_store.claim_shard(_SHARD_TIMEOUT)
+            if claimed is None:
+                time.sleep(_SHARD_POLL)
+                continue
+            _run_shard(*claimed)
+            _shard_status['shards_served'] += 1
+        except Exception as e:
+            _shard_status['last_error'] = str(e)
+            _log.error('shard loop failed', extra={'fields': {'error': str(e)}})
+            time.sleep(_SHARD_POLL)
+
+
+if _SHARD_ENABLED:
+    threading.Thread(target=_shard_loop, name='shards', daemon=True).start()
+    _log.info('scan sharding enabled', extra={'fields': {'shard_size': _SHARD_SIZE}})
+
+# ── Scan Coalescing ──────────────────────────────────────────────────────────
+# At market open many users start the same universe scan at once. Each
+# (market, universe) has at most one upstream fetch in flight per worker;
+# scans that arrive while it runs attach to it, replay the batches it has
+# produced so far and then receive new ones as they land. Every subscriber
+# applies its own thresholds and filters, so the flight fetches the whole
+# universe; a sector / market-cap filtered scan fetches only its own stocks
+# unless the universe's flight is already running.
+
+class _ScanFlight:
+    """One in-flight universe fetch, iterable by any number of scans."""
+
+    def __init__(self, key, produce):
+        self.key = key
+        self.items = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self._produce = produce
+        self._cond = threading.Condition()
+
+    def _run(self):
+        try:
+            for item in self._produce():
+                with self._cond:
+                    self.items.append(item)
+                    self._cond.notify_all()
+        except Exception as e:
+            _log.error('universe fetch failed', extra={'fields': {'market': self.key[0], 'universe': self.key[1], 'error': str(e)}})
+            self.error = e
+        finally:
+            # Scans that start from here on begin a new flight (mostly cache hits)
+            with _flights_lock:
+                if _flights.get(self.key) is self:
+                    del _flights[self.key]
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def __iter__(self):
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self.items) and not self.done:
+                    self._cond.wait()
+                if i >= len(self.items):
+                    if self.error is not None:
+                        raise self.error
+                    return
+                item = self.items[i]
+            i += 1
+            yield item
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _join_flight(key: tuple, produce) -> _ScanFlight:
+    """Attach to the in-flight fetch for key, or start one running produce()."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        joined = flight is not None
+        if not joined:
+            flight = _flights[key] = _ScanFlight(key, produce)
+            threading.Thread(target=flight._run, name=f'flight-{key[0]}-{key[1]}', daemon=True).start()
+        flight.subscribers += 1
+    if joined:
+        _log.debug('joined in-flight fetch', extra={'fields': {'market': key[0], 'universe': key[1], 'scans': flight.subscribers}})
+    return flight
+
+
+def _yahoo_universe_flight(registry: _UniverseRegistry, market: str, stock_universe: str) -> _ScanFlight:
+    """Shared iter_sharded_batches run over every symbol of a stock universe."""
+    symbols = list(registry.by_symbol(market, stock_universe))
+    return _join_flight((market, stock_universe, registry.generation), lambda: iter_sharded_batches(symbols))
+
+
+def _yahoo_scan_flight(registry: _UniverseRegistry, market: str, stock_universe: str,
+                       sector_filter: str, market_cap_filter: str):
+    """(flight, covers) for a Yahoo scan; covers is what its snapshot can re-filter."""
+    everything = {'sectorFilter': 'all', 'marketCapFilter': 'all'}
+    if sector_filter == 'all' and market_cap_filter == 'all':
+        return _yahoo_universe_flight(registry, market, stock_universe), everything
+    with _flights_lock:
+        running = (market, stock_universe, registry.generation) in _flights
+    if running:
+        return _yahoo_universe_flight(registry, market, stock_universe), everything
+    stocks = registry.stocks(market, stock_universe, sector_filter, market_cap_filter)
+    symbols = list(dict.fromkeys(s.symbol for s in stocks))
+    key = (market, stock_universe, registry.generation, sector_filter, market_cap_filter)
+    flight = _join_flight(key, lambda: iter_sharded_batches(symbols))
+    return flight, {'sectorFilter': sector_filter, 'marketCapFilter': market_cap_filter}
+
+
+def _crypto_flight(universe_size: int) -> _ScanFlight:
+    """Shared _binance_coin_feed run; joins a larger in-flight crypto fetch if any."""
+    with _flights_lock:
+        larger = [k for k in _flights if k[0] == 'crypto' and k[1] >= universe_size]
+    key = min(larger) if larger else ('crypto', universe_size)
+    return _join_flight(key, lambda: _binance_coin_feed(key[1]))
+
+# ── Scan Jobs ────────────────────────────────────────────────────────────────
+# /scan-stream runs each scan as a job on its own thread, so the scan keeps
+# going when the client's connection drops. The job's events are numbered and
+# sent with an SSE id of "<job_id>:<seq>"; EventSource reconnects with that as
+# Last-Event-ID and the stream resumes after it. Events are also flushed to
+# the shared SQLite file every SCAN_JOB_FLUSH seconds, so a reconnect that
+# lands on the other gunicorn worker can follow the job from there.
+#
+# A keeper thread flushes running jobs at least every SCAN_JOB_HEARTBEAT
+# seconds, so a job that is quietly waiting (e.g. on a dead worker's shard)
+# is not taken for lost, and cancels jobs no client has followed, in any
+# worker, for SCAN_JOB_ABANDON seconds. At most SCAN_JOB_MAX_RUNNING jobs
+# run per worker; beyond that /scan-stream answers 503.
+
+_SCAN_JOB_TTL   = int(os.environ.get('SCAN_JOB_TTL', 600))
+_SCAN_JOB_FLUSH = float(os.environ.get('SCAN_JOB_FLUSH', 0.5))
+_SCAN_JOB_STALE = int(os.environ.get('SCAN_JOB_STALE', 30))   # no flush for this long → owner died
+_SCAN_JOB_HEARTBEAT   = float(os.environ.get('SCAN_JOB_HEARTBEAT', 5))
+_SCAN_JOB_ABANDON     = int(os.environ.get('SCAN_JOB_ABANDON', 60))
+_SCAN_JOB_MAX_RUNNING = int(os.environ.get('SCAN_JOB_MAX_RUNNING', 8))
+_SCAN_JOB_MEMORY_MAX = 64
+_SCAN_JOB_CANCELLED  = 'Scan cancelled because no client was following it'
+
+
+def _compact_events(events):
+    """Drop progress events superseded by a later one in the same chunk.
+
+    A reconnecting or lagging client only needs the newest progress counts;
+    every other event is kept in order.
+    """
+    last_progress = max((i for i, e in enumerate(events) if e[1] == 'progress'), default=-1)
+    return [e for i, e in enumerate(events) if e[1] != 'progress' or i == last_progress]
+
+
+class _ScanJob:
+    """Numbered event log of one streaming scan, followable from any position."""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.events = []          # [(event, json payload)]; seq is index + 1
+        self.done = False
+        self.finished_at = None
+        self.followers = 0
+        self.unfollowed_at = time.time()
+        self.cancelled = False
+        self._flushed = 0
+        self._flushed_at = 0.0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()   # keeps a heartbeat flush from overtaking the final one
+
+    def emit(self, event: str, data):
+        with self._cond:
+            self.events.append((event, _dumps(data)))
+            self._cond.notify_all()
+        if time.time() - self._flushed_at >= _SCAN_JOB_FLUSH:
+            self._flush()
+
+    def finish(self):
+        with self._cond:
+            self.done = True
+            self.finished_at = time.time()
+            self._cond.notify_all()
+        self._flush()
+
+    def _flush(self):
+        with self._flush_lock:
+            with self._cond:
+                pending = self.events[self._flushed:]
+                first_seq, done = self._flushed + 1, self.done
+            self._flushed_at = time.time()
+            try:
+                _ohlcv_store.append_job_events(self.id, first_seq, pending, done, _SCAN_JOB_TTL)
+                self._flushed = first_seq - 1 + len(pending)
+            except Exception as e:
+                _log.warning('scan job flush failed', extra={'fields': {'job': self.id[:8], 'error': str(e)}})
+
+    def abandoned(self, now: float) -> bool:
+        """True once no client anywhere has followed the running job for SCAN_JOB_ABANDON seconds."""
+        if self.done or self.followers or now - self.unfollowed_at < _SCAN_JOB_ABANDON:
+            return False
+        try:
+            followed_at = _ohlcv_store.job_followed_at(self.id)
+        except Exception:
+            return False
+        return followed_at is None or now - followed_at >= _SCAN_JOB_ABANDON
+
+    def state(self):
+        """(done, [(seq, event, payload)]) as of now."""
+        with self._cond:
+            return self.done, [(i + 1, *e) for i, e in enumerate(self.events)]
+
+    def follow(self, after: int = 0):
+        """Yield (seq, event, payload) after seq `after` until the job is done."""
+        seq = after
+        with self._cond:
+            self.followers += 1
+        try:
+            while True:
+                with self._cond:
+                    while seq >= len(self.events) and not self.done:
+                        self._cond.wait()
+                    chunk = [(i + 1, *self.events[i]) for i in range(seq, len(self.events))]
+                    done = self.done
+                if chunk:
+                    seq = chunk[-1][0]
+                    yield from _compact_events(chunk)
+                elif done:
+                    return
+        finally:
+            with self._cond:
+                self.followers -= 1
+                self.unfollowed_at = time.time()
+
+
+class _StoredScanJob:
+    """A job running in another worker, followed through the shared store."""
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+
+    def state(self):
+        loaded = _ohlcv_store.load_job_events(self.id, 0)
+        return (True, []) if loaded is None else (loaded[0], loaded[2])
+
+    def follow(self, after: int = 0):
+        seq = after
+        touched_at = 0.0
+        while True:
+            if time.time() - touched_at >= _SCAN_JOB_HEARTBEAT:
+                # Tells the owning worker someone still wants this job
+                _ohlcv_store.touch_job_follower(self.id)
+                touched_at = time.time()
+            loaded = _ohlcv_store.load_job_events(self.id, seq)
+            if loaded is None:
+                return
+            done, updated_at, chunk = loaded
+            if chunk:
+                seq = chunk[-1][0]
+                yield from _compact_events(chunk)
+            if done:
+                return
+            if updated_at + _SCAN_JOB_STALE < time.time():
+                yield seq + 1, 'error', _dumps({'message': 'Scan job was lost; please run the scan again'})
+                return
+            time.sleep(_SCAN_JOB_FLUSH)
+
+
+_scan_jobs = OrderedDict()
+_scan_jobs_lock = threading.Lock()
+
+
+def _start_scan_job(run, *args, market: str = 'unknown') -> _ScanJob:
+    """Run run(job, *args) on a new thread; it emits events and the job finishes after it.
+
+    Returns None when SCAN_JOB_MAX_RUNNING jobs are already running here.
+    """
+    job = _ScanJob()
+    now = time.time()
+    with _scan_jobs_lock:
+        if sum(not j.done for j in _scan_jobs.values()) >= _SCAN_JOB_MAX_RUNNING:
+            return None
+        for job_id in [k for k, j in _scan_jobs.items() if j.done and j.finished_at + _SCAN_JOB_TTL < now]:
+            del _scan_jobs[job_id]
+        _scan_jobs[job.id] = job
+        while len(_scan_jobs) > _SCAN_JOB_MEMORY_MAX:
+            _scan_jobs.popitem(last=False)
+
+    def target():
+        try:
+            run(job, *args)
+        except Exception as e:
+            _log.error('scan failed', extra={'fields': {'endpoint': 'scan-stream', 'market': market, 'error': str(e)}})
+            _SCAN_FAILURES.labels(_metric_market(market), 'error').inc()
+            job.emit('error', {'message': str(e)})
+        finally:
+            job.finish()
+
+    threading.Thread(target=target, name=f'scan-job-{job.id[:8]}', daemon=True).start()
+    return job
+
+
+def _scan_job_keeper():
+    while True:
+        time.sleep(_SCAN_JOB_HEARTBEAT)
+        now = time.time()
+        with _scan_jobs_lock:
+            running = [j for j in _scan_jobs.values() if not j.done]
+        for job in running:
+            try:
+                if job.abandoned(now) and not job.cancelled:
+                    job.cancelled = True
+                    _log.info('scan job cancelled; no followers', extra={'fields': {'job': job.id[:8]}})
+                if now - job._flushed_at >= _SCAN_JOB_HEARTBEAT:
+                    job._flush()    # refreshes updated_at even with no new events
+            except Exception as e:
+                _log.error('scan job keeper failed', extra={'fields': {'job': job.id[:8], 'error': str(e)}})
+
+
+threading.Thread(target=_scan_job_keeper, name='scan-jobs', daemon=True).start()
+
+
+def _find_scan_job(job_id: str):
+    """This worker's job with that ID, else a store-backed follower, else None."""
+    with _scan_jobs_lock:
+        job = _scan_jobs.get(job_id)
+    if job is not None:
+        return job
+    try:
+        if _ohlcv_store.load_job_events(job_id, sys.maxsize) is not None:
+            return _StoredScanJob(job_id)
+    except Exception as e:
+        _log.warning('scan job lookup failed', extra={'fields': {'job': job_id[:8], 'error': str(e)}})
+    return None
+
+# ── Headline Tickers ─────────────────────────────────────────────────────────
+# Every open tab polls /tickers once a minute. All viewers share one cached
+# payload per worker; once it is older than TICKERS_TTL the next request
+# triggers a single background refresh (the four symbols fetched in
+# parallel) and is answered with the previous payload meanwhile. The refresh
+# has its own small pool, so it never queues behind scan fetches, and gives up
+# after TICKERS_REFRESH_TIMEOUT; a symbol still pending keeps its last value.
+
+_TICKERS_TTL = int(os.environ.get('TICKERS_TTL', 30))
+_TICKERS_REFRESH_TIMEOUT = float(os.environ.get('TICKERS_REFRESH_TIMEOUT', 8))   # seconds
+_HEADLINE_SYMBOLS = [
+    ('nifty', '^NSEI'),
+    ('sp500', '^GSPC'),
+    ('dow',   '^DJI'),
+    ('btc',   'BTC-USD'),
+]
+
+_tickers_state = {'entry': None, 'refreshing': False}
+_tickers_cond = threading.Condition()
+_headline_executor = ThreadPoolExecutor(max_workers=len(_HEADLINE_SYMBOLS), thread_name_prefix='headline')
+
+
+def _headline_ticker(symbol: str):
+    """{'value', 'change_pct', 'change_abs'} vs the previous close, or None."""
+    try:
+        r = _http_get(
+            f"{_YAHOO_CHART_URL}/{symbol}",
+            params=dict(_YAHOO_CHART_PARAMS, interval='1d', range='5d'),
+            headers=_YAHOO_HEADERS,
+            timeout=5,
+        )
+        r.raise_for_status()
+        result = _chart_result(r)
+        if result is None:
+            return None
+        meta = result.get('meta', {})
+        price = meta.get('regularMarketPrice')
+
+        # Determine prev close correctly regardless of whether today's
+        # candle is settled or still None in the chart.
+        # If the last close in the chart is None → today not settled yet,
+        # so last non-null IS yesterday's close.
+        # If the last close is not None → today is settled, use second-to-last.
+        closes = result.get('indicators', {}).get('quote', [{}])[0].get('close', [])
+        non_null_closes = [c for c in closes if c is not None]
+
+        if price is None or len(non_null_closes) < 2:
+            return None
+
+        last_raw = closes[-1] if closes else None
+        if last_raw is None:
+            # Today's candle not settled — last non-null is yesterday
+            prev = non_null_closes[-1]
+        else:
+            # Today's candle is settled — second-to-last is yesterday
+            prev = non_null_closes[-2]
+
+        if prev == 0:
+            return None
+        change_pct = ((price - prev) / prev) * 100
+        change_abs = price - prev
+        return {'value': round(price, 2), 'change_pct': round(change_pct, 2), 'change_abs': round(change_abs, 2)}
+    except Exception as e:
+        _log.warning('headline ticker failed', extra={'fields': {'symbol': symbol, 'error': str(e)}})
+        return None
+
+
+def _refresh_headline_tickers() -> dict:
+    """Fetch every headline symbol concurrently and publish a new cache entry."""
+    try:
+        futures = {key: _headline_executor.submit(_headline_ticker, symbol) for key, symbol in _HEADLINE_SYMBOLS}
+        wait(futures.values(), timeout=_TICKERS_REFRESH_TIMEOUT)
+        previous = (_tickers_state['entry'] or {}).get('data', {})
+        # A symbol that failed or is still pending keeps its last good value
+        data = {key: (future.result() if future.done() else None) or previous.get(key)
+                for key, future in futures.items()}
+        body = _dumps(data, sort_keys=True)
+        entry = {
+            'data':       data,
+            'body':       body,
+            'etag':       hashlib.md5(body.encode()).hexdigest(),
+            'fetched_at': time.time(),
+        }
+        _tickers_state['entry'] = entry
+        return entry
+    finally:
+        with _tickers_cond:
+            _tickers_state['refreshing'] = False
+            _tickers_cond.notify_all()
+
+
+def _headline_tickers() -> dict:
+    """Current headline entry; refreshes in the background once stale."""
+    with _tickers_cond:
+        entry = _tickers_state['entry']
+        stale = entry is None or time.time() - entry['fetched_at'] >= _TICKERS_TTL
+        start = stale and not _tickers_state['refreshing']
+        if start:
+            _tickers_state['refreshing'] = True
+    if entry is None:
+        # First request in this worker: wait for the data (or another
+        # request's refresh) instead of serving nothing
+        if start:
+            return _refresh_headline_tickers()
+        with _tickers_cond:
+            _tickers_cond.wait_for(lambda: _tickers_state['entry'] is not None or not _tickers_state['refreshing'])
+        return _tickers_state['entry'] or _refresh_headline_tickers()
+    if start:
+        threading.Thread(target=_refresh_headline_tickers, name='tickers-refresh', daemon=True).start()
+    return entry
+
 # Flask Routes
 @app.route('/')
 def home():
@@ -1448,22 +2675,46 @@ def home():
         'message': 'BuyTheDip API is operational and ready to receive requests.'
     })
 
+_universe_bodies = {}    # (universe_type, registry generation) -> {'body', 'etag'}
+_UNIVERSE_BODIES_MAX = 32
+
+
 @app.route('/stock-universe/<universe_type>')
 def get_universe(universe_type):
     """Get stock universe by type"""
     try:
-        stocks = get_stock_universe(universe_type)
-        
-        return jsonify({
-            'universe_type': universe_type,
-            'stocks': stocks,
-            'total': len(stocks),
-            'source': 'static_curated_list',
-            'reliability': 'high',
-            'timestamp': datetime.now().isoformat(),
-            'message': f'Successfully got {len(stocks)} stocks for {universe_type}'
-        })
-        
+        registry = _universe_registry()
+        key = (universe_type, registry.generation)
+        entry = _universe_bodies.get(key)
+        if entry is None:
+            stocks = registry.stocks('india', universe_type)
+            payload = {
+                'universe_type': universe_type,
+                'stocks': [dict(s) for s in stocks],
+                'total': len(stocks),
+                'version': registry.version,
+                'source': 'static_curated_list',
+                'reliability': 'high',
+            }
+            # The ETag covers the list, not the timestamp, so every worker agrees on it
+            etag = hashlib.md5(_dumps(payload).encode()).hexdigest()
+            body = _dumps({
+                **payload,
+                'timestamp': datetime.now().isoformat(),
+                'message': f'Successfully got {len(stocks)} stocks for {universe_type}'
+            })
+            entry = {'body': body, 'etag': etag}
+            if len(_universe_bodies) >= _UNIVERSE_BODIES_MAX:
+                _universe_bodies.clear()    # old registry generations, or junk universe names
+            _universe_bodies[key] = entry
+
+        # The list only changes when the registry reloads, so clients
+        # revalidate with If-None-Match and usually get a 304
+        resp = Response(entry['body'], mimetype='application/json')
+        resp.set_etag(entry['etag'])
+        resp.headers['Cache-Control'] = f"public, max-age={_UNIVERSES_CHECK_INTERVAL}"
+        return resp.make_conditional(request)
+
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -1471,6 +2722,158 @@ def get_universe(universe_type):
             'message': 'Failed to get stock universe'
         }), 500
 
+_STREAM_ROW_ONCE = ('source', 'status', 'lastUpdated')   # same on every row of a scan
+
+
+def _stream_row(row: dict) -> dict:
+    """row as a `match` event: the fields init/done send once are left out."""
+    return {k: v for k, v in row.items() if k not in _STREAM_ROW_ONCE}
+
+
+def _scan_stream_job(job, weekly_threshold, monthly_threshold, market_cap_filter, sector_filter, stock_universe, market):
+    """Run one /scan-stream scan, emitting its SSE events on job."""
+    started = time.time()
+    # ── Crypto: per-coin streaming as Binance klines arrive ──
+    if market == 'crypto':
+        universe_size = _CRYPTO_UNIVERSE_SIZES.get(stock_universe, 100)
+        total, feed = iter_crypto_coins(universe_size)
+        job.emit('init', {
+            'job_id': job.id, 'total': total, 'universe_size': universe_size,
+            'universe': stock_universe, 'market': 'crypto',
+            'row_defaults': {'source': 'binance'},
+        })
+        processed = 0
+        matches = []
+        rows = []
+        failed_coins = []
+        for pair, coin in feed:
+            if job.cancelled:
+                job.emit('error', {'message': _SCAN_JOB_CANCELLED})
+                return
+            processed += 1
+            if coin:
+                row = _crypto_row(coin)
+                rows.append(row)
+                if _coin_is_dip(coin, weekly_threshold, monthly_threshold, market_cap_filter):
+                    _log_symbol('match', symbol=coin['symbol'], weekly=coin['_weekly'], monthly=coin['_monthly'])
+                    matches.append(row)
+                    job.emit('match', _stream_row(row))
+            else:
+                failed_coins.append(pair[:-4])
+                _SCAN_FAILURES.labels('crypto', 'no_candles').inc()
+            job.emit('progress', {
+                'processed': processed, 'total': total, 'matches': len(matches)
+            })
+        _observe_scan('scan-stream', 'crypto', stock_universe, started, processed, len(matches), failed_coins)
+
+        snapshot_id = _save_snapshot(_ScanSnapshot(
+            'crypto', stock_universe, universe_size, rows, failed_coins,
+            {'sectorFilter': 'all', 'marketCapFilter': 'all'},
+        ))
+        job.emit('done', {
+            'total_matches': len(matches),
+            'stock_universe': stock_universe,
+            'universe_size': universe_size,
+            'processed': processed,
+            'success_rate': f"{((len(rows) / processed) * 100):.1f}%" if processed > 0 else "0%",
+            'market': 'crypto',
+            'failed_symbols': failed_coins,
+            'snapshot_id': snapshot_id,
+            'lastUpdated': datetime.now().isoformat(),
+        })
+        return
+
+    # ── India / US: per-symbol streaming ──
+    registry = _universe_registry()
+    stock_list = registry.stocks(market, stock_universe)
+    filtered_stocks = registry.stocks(market, stock_universe, sector_filter, market_cap_filter)
+
+    job.emit('init', {
+        'job_id': job.id,
+        'total': len(filtered_stocks),
+        'universe_size': len(stock_list),
+        'universe': stock_universe,
+        'market': market,
+        'row_defaults': {'source': 'yahoo_finance', 'status': 'success'},
+    })
+
+    processed = 0
+    matches = []
+    rows = []
+    failed_universe = []
+    real_data_count = 0
+    failed_count = 0
+    failed_stocks = []
+
+    # A shared universe flight can cover more than the filter (and some
+    # lists carry the same symbol twice); only filtered stocks count
+    wanted = {id(s) for s in filtered_stocks}
+    stocks_by_symbol = registry.by_symbol(market, stock_universe)
+    flight, covers = _yahoo_scan_flight(registry, market, stock_universe, sector_filter, market_cap_filter)
+
+    for batch in flight:
+        if job.cancelled:
+            # The shared fetch carries on for other scans and the store
+            job.emit('error', {'message': _SCAN_JOB_CANCELLED})
+            return
+        dips = batch.dip_mask(weekly_threshold, monthly_threshold)
+        for i, symbol in enumerate(batch.symbols):
+            for stock in stocks_by_symbol.get(symbol, ()):
+                row = {**stock, **batch.market_data(i)} if batch.ok[i] else None
+                if row:
+                    rows.append(row)
+                else:
+                    failed_universe.append(stock['symbol'])
+                if id(stock) not in wanted:
+                    continue
+
+                processed += 1
+                if row:
+                    real_data_count += 1
+                    if dips[i]:
+                        _log_symbol('match', symbol=symbol, weekly=row['weeklyChange'], monthly=row['monthlyChange'])
+                        matches.append(row)
+                        job.emit('match', _stream_row(row))
+                else:
+                    failed_count += 1
+                    failed_stocks.append(stock['symbol'])
+                    _SCAN_FAILURES.labels(_metric_market(market), batch.failure_reason(i)).inc()
+
+                job.emit('progress', {
+                    'processed': processed,
+                    'total': len(filtered_stocks),
+                    'matches': len(matches),
+                })
+
+    _observe_scan('scan-stream', market, stock_universe, started, processed, len(matches), failed_stocks)
+
+    snapshot_id = _save_snapshot(_ScanSnapshot(
+        market, stock_universe, len(stock_list), rows, failed_universe, covers,
+    ))
+    job.emit('done', {
+        'total_matches': len(matches),
+        'stock_universe': stock_universe,
+        'universe_size': len(stock_list),
+        'processed': processed,
+        'success_rate': f"{((real_data_count / processed) * 100):.1f}%" if processed > 0 else "0%",
+        'market': market,
+        'failed_symbols': failed_stocks,
+        'snapshot_id': snapshot_id,
+        'lastUpdated': datetime.now().isoformat(),
+    })
+
+
+def _scan_stream_refusal(message: str, status: int, retry_after: int = None):
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        resp = Response(f"event: error\ndata: {_dumps({'message': message})}\n\n",
+                        mimetype='text/event-stream', headers={'Cache-Control': 'no-cache, no-transform'})
+    else:
+        resp = jsonify({'error': message})
+        resp.status_code = status
+    if retry_after:
+        resp.headers['Retry-After'] = str(retry_after)
+    return resp
+
 @app.route('/scan-stream')
 def scan_stream():
     """Streaming version of /scan using Server-Sent Events (SSE).
@@ -1479,11 +2882,21 @@ def scan_stream():
     because EventSource only supports GET.
 
     Emits these events as data becomes available:
-      init     { total, universe_size, universe, market }
+      init     { job_id, total, universe_size, universe, market, row_defaults }
       progress { processed, total, matches }
-      match    { ...stock result dict... }
-      done     { total_matches, universe_size, processed, success_rate, market }
+      match    { ...stock result dict, minus the row_defaults and lastUpdated fields... }
+      done     { total_matches, universe_size, processed, success_rate, market, snapshot_id, lastUpdated }
       error    { message }
+
+    A request the server refuses (bad parameters, or SCAN_JOB_MAX_RUNNING
+    scans already running) gets 400 / 503 with a JSON error. EventSource
+    cannot read a non-200 response, so when the client accepts
+    text/event-stream the refusal is sent as a lone `error` event instead.
+
+    Every event carries an id of "<job_id>:<seq>". A request with that in the
+    Last-Event-ID header (EventSource sends it when it reconnects) or the
+    lastEventId query parameter resumes the still-running or finished job
+    after that event instead of starting a new scan.
     """
     try:
         weekly_threshold  = float(request.args.get('weeklyThreshold', 5))
@@ -1493,113 +2906,29 @@ def scan_stream():
         stock_universe    = request.args.get('stockUniverse', 'nifty100')
         market            = request.args.get('market', 'india')
     except Exception as e:
-        return jsonify({'error': f'Invalid params: {e}'}), 400
-
-    def sse(event, data):
-        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        return _scan_stream_refusal(f'Invalid params: {e}', 400)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId', '')
+    job_id, _, seq = last_event_id.partition(':')
+    job = _find_scan_job(job_id) if job_id else None
+    after = int(seq) if job is not None and seq.isdigit() else 0
+    if job is None:
+        job = _start_scan_job(_scan_stream_job, weekly_threshold, monthly_threshold,
+                              market_cap_filter, sector_filter, stock_universe, market, market=market)
+        if job is None:
+            return _scan_stream_refusal('Too many scans are running; please try again shortly', 503,
+                                        retry_after=10)
+    elif after:
+        _log.info('scan job resumed', extra={'fields': {'job': job.id[:8], 'after': after}})
 
     def generate():
-        try:
-            # ── Crypto: monolithic Binance call ──
-            # (scan_crypto_via_binance does it all in one shot; we can't
-            # stream per-symbol progress for crypto without refactoring it.
-            # We emit init → all matches → done.)
-            if market == 'crypto':
-                size_map = {'top50': 50, 'top100': 100, 'top200': 200, 'top500': 500}
-                universe_size = size_map.get(stock_universe, 100)
-                yield sse('init', {
-                    'total': universe_size, 'universe_size': universe_size,
-                    'universe': stock_universe, 'market': 'crypto',
-                })
-                results = scan_crypto_via_binance(
-                    universe_size, weekly_threshold, monthly_threshold, market_cap_filter
-                )
-                for r in results:
-                    yield sse('match', r)
-                yield sse('progress', {
-                    'processed': universe_size, 'total': universe_size, 'matches': len(results)
-                })
-                yield sse('done', {
-                    'total_matches': len(results),
-                    'stock_universe': stock_universe,
-                    'universe_size': universe_size,
-                    'processed': universe_size,
-                    'success_rate': '100%',
-                    'market': 'crypto',
-                })
-                return
-
-            # ── India / US: per-symbol streaming ──
-            stock_list = get_stock_universe(stock_universe, market)
-            filtered_stocks = [
-                s for s in stock_list
-                if (market_cap_filter == 'all' or s.get('marketCap') == market_cap_filter)
-                and (sector_filter == 'all' or s.get('sector') == sector_filter)
-            ]
-
-            yield sse('init', {
-                'total': len(filtered_stocks),
-                'universe_size': len(stock_list),
-                'universe': stock_universe,
-                'market': market,
-            })
-
-            processed = 0
-            matches = []
-            real_data_count = 0
-            failed_count = 0
-            failed_stocks = []
-
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_stock = {
-                    executor.submit(process_single_stock, stock, weekly_threshold, monthly_threshold): stock
-                    for stock in filtered_stocks
-                }
-                for future in as_completed(future_to_stock):
-                    stock = future_to_stock[future]
-                    processed += 1
-                    try:
-                        result = future.result()
-                        if result['status'] == 'match':
-                            matches.append(result['data'])
-                            real_data_count += 1
-                            yield sse('match', result['data'])
-                        elif result['status'] == 'no_match':
-                            real_data_count += 1
-                        else:
-                            failed_count += 1
-                            failed_stocks.append(stock['symbol'])
-                    except Exception as e:
-                        failed_count += 1
-                        failed_stocks.append(stock['symbol'])
-
-                    yield sse('progress', {
-                        'processed': processed,
-                        'total': len(filtered_stocks),
-                        'matches': len(matches),
-                    })
-
-            if failed_stocks:
-                print(f"\n[SCAN FAILURES] {failed_count} symbol(s) failed to fetch:")
-                for sym in failed_stocks:
-                    print(f"  ✗ {sym}")
-            else:
-                print(f"[SCAN] All {processed} symbols fetched successfully.")
-
-            yield sse('done', {
-                'total_matches': len(matches),
-                'stock_universe': stock_universe,
-                'universe_size': len(stock_list),
-                'processed': processed,
-                'success_rate': f"{((real_data_count / processed) * 100):.1f}%" if processed > 0 else "0%",
-                'market': market,
-                'failed_symbols': failed_stocks,
-            })
-        except Exception as e:
-            print(f"[SCAN-STREAM ERROR] {e}")
-            yield sse('error', {'message': str(e)})
+        yield "retry: 3000\n\n"
+        # closing() ends the follow, and with it the follower count, on disconnect
+        with closing(job.follow(after)) as events:
+            for seq, event, payload in events:
+                yield f"id: {job.id}:{seq}\nevent: {event}\ndata: {payload}\n\n"
 
-    return Response(
+    resp = Response(
         stream_with_context(generate()),
         mimetype='text/event-stream',
         headers={
@@ -1608,10 +2937,44 @@ def scan_stream():
             'Connection': 'keep-alive',
         },
     )
+    _SSE_STREAMS.labels('scan').inc()
+    resp.call_on_close(_SSE_STREAMS.labels('scan').dec)
+    return resp
+
+@app.route('/scan-jobs/<job_id>')
+def scan_job_status(job_id):
+    """Progress, matches so far and (once finished) the done/error payload of a /scan-stream job."""
+    job = _find_scan_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Scan job not found or expired', 'job_id': job_id}), 404
+    done, events = job.state()
+    progress, result, matches, row_defaults = None, None, [], {}
+    for _, event, payload in events:
+        if event == 'match':
+            matches.append({**row_defaults, **json.loads(payload)})
+        elif event == 'init':
+            row_defaults = json.loads(payload).get('row_defaults', {})
+        elif event == 'progress':
+            progress = payload
+        elif event in ('done', 'error'):
+            result = {'event': event, **json.loads(payload)}
+            if 'lastUpdated' in result:
+                for match in matches:
+                    match['lastUpdated'] = result['lastUpdated']
+    return jsonify({
+        'job_id': job_id,
+        'done': done,
+        'last_event_id': f"{job_id}:{events[-1][0]}" if events else None,
+        'progress': json.loads(progress) if progress else None,
+        'matches': matches,
+        'result': result,
+    })
 
 @app.route('/scan', methods=['POST'])
 def scan_stocks():
     """Scan stocks with Yahoo Finance data only"""
+    started = time.time()
+    market = 'unknown'
     try:
         data = request.get_json()
         
@@ -1623,18 +2986,25 @@ def scan_stocks():
         stock_universe    = data.get('stockUniverse', 'nifty100')
         market            = data.get('market', 'india')  # 'india' | 'us' | 'crypto'
 
-        print(f"\n[SCAN] STARTING — market={market} universe={stock_universe}")
-        print(f"[CRITERIA] Weekly ≤ -{weekly_threshold}%, Monthly ≤ -{monthly_threshold}%")
-        print(f"[FILTERS] Market Cap = {market_cap_filter}, Sector = {sector_filter}")
+        _log.debug('scan started', extra={'fields': {
+            'market': market, 'universe': stock_universe, 'weekly': weekly_threshold,
+            'monthly': monthly_threshold, 'cap': market_cap_filter, 'sector': sector_filter,
+        }})
 
         # ── Crypto: use Binance ──
         if market == 'crypto':
-            size_map = {'top50': 50, 'top100': 100, 'top200': 200, 'top500': 500}
-            universe_size = size_map.get(stock_universe, 100)
-            results = scan_crypto_via_binance(universe_size, weekly_threshold, monthly_threshold, market_cap_filter)
+            universe_size = _CRYPTO_UNIVERSE_SIZES.get(stock_universe, 100)
+            rows = []
+            results = scan_crypto_via_binance(universe_size, weekly_threshold, monthly_threshold, market_cap_filter, rows)
+            _observe_scan('scan', 'crypto', stock_universe, started, len(rows), len(results))
+            snapshot_id = _save_snapshot(_ScanSnapshot(
+                'crypto', stock_universe, universe_size, rows, [],
+                {'sectorFilter': 'all', 'marketCapFilter': 'all'},
+            ))
             return jsonify({
                 'results':              results,
                 'total_matches':        len(results),
+                'snapshot_id':          snapshot_id,
                 'stock_universe':       stock_universe,
                 'universe_size':        universe_size,
                 'processed':            universe_size,
@@ -1650,82 +3020,63 @@ def scan_stocks():
 
         # ── India / US: use Yahoo Finance ──
         # Get stock list
-        stock_list = get_stock_universe(stock_universe, market)
+        registry = _universe_registry()
+        stock_list = registry.stocks(market, stock_universe)
         
-        # Filter stocks based on criteria
-        filtered_stocks = []
-        for stock in stock_list:
-            # Apply filters
-            if market_cap_filter != 'all' and stock.get('marketCap') != market_cap_filter:
-                continue
-            if sector_filter != 'all' and stock.get('sector') != sector_filter:
-                continue
-            filtered_stocks.append(stock)
-        
-        print(f"[FILTER] {len(filtered_stocks)} stocks to process")
+        # Filter stocks based on criteria (prebuilt index lookup)
+        filtered_stocks = registry.stocks(market, stock_universe, sector_filter, market_cap_filter)
         
         results = []
+        rows = []
+        failed_universe = []
         processed = 0
         real_data_count = 0
         failed_count = 0
         failed_stocks = []
         
-        # Process stocks concurrently with ThreadPoolExecutor
-        # Use max 5 concurrent threads to respect API rate limits
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            # Submit all tasks
-            future_to_stock = {
-                executor.submit(process_single_stock, stock, weekly_threshold, monthly_threshold): stock 
-                for stock in filtered_stocks
-            }
-            
-            # Process completed futures as they complete
-            for future in as_completed(future_to_stock):
-                stock = future_to_stock[future]
-                processed += 1
-                
-                try:
-                    result = future.result()
+        # Fetch in batches (cache → spark → per-symbol fallback) through a
+        # shared flight; some lists carry the same symbol twice, so fetch
+        # each symbol once
+        wanted = {id(s) for s in filtered_stocks}
+        stocks_by_symbol = registry.by_symbol(market, stock_universe)
+        flight, covers = _yahoo_scan_flight(registry, market, stock_universe, sector_filter, market_cap_filter)
+        
+        for batch in flight:
+            # One vectorized threshold pass per batch
+            dips = batch.dip_mask(weekly_threshold, monthly_threshold)
+            for i, symbol in enumerate(batch.symbols):
+                for stock in stocks_by_symbol.get(symbol, ()):
+                    row = {**stock, **batch.market_data(i)} if batch.ok[i] else None
+                    if row:
+                        rows.append(row)
+                    else:
+                        failed_universe.append(stock['symbol'])
+                    if id(stock) not in wanted:
+                        continue
                     
-                    if result['status'] == 'match':
-                        results.append(result['data'])
-                        real_data_count += 1
-                    elif result['status'] == 'no_match':
+                    processed += 1
+                    
+                    if row:
                         real_data_count += 1
-                    elif result['status'] == 'failed':
-                        failed_count += 1
-                        failed_stocks.append({'symbol': stock['symbol'], 'name': stock['name']})
-                    elif result['status'] == 'error':
+                        if dips[i]:
+                            _log_symbol('match', symbol=symbol, weekly=row['weeklyChange'], monthly=row['monthlyChange'])
+                            results.append(row)
+                    else:
                         failed_count += 1
                         failed_stocks.append({'symbol': stock['symbol'], 'name': stock['name']})
-                        
-                except Exception as e:
-                    failed_count += 1
-                    failed_stocks.append({'symbol': stock['symbol'], 'name': stock['name']})
-                    print(f"[ERROR] {stock['symbol']} - Future execution failed: {str(e)}")
-                
-                # Progress update every 10 stocks
-                if processed % 10 == 0:
-                    print(f"\n[PROGRESS] {processed}/{len(filtered_stocks)}")
-                    print(f"   [SUCCESS] Yahoo Finance success: {real_data_count}")
-                    print(f"   [FAILED] Failed: {failed_count}")
-                    print(f"   [MATCHES] Found: {len(results)}")
+                        _SCAN_FAILURES.labels(_metric_market(market), batch.failure_reason(i)).inc()
         
-        print(f"\n[SCAN COMPLETE]")
-        print(f"   [UNIVERSE] {stock_universe} ({len(stock_list)} total, {len(filtered_stocks)} filtered)")
-        print(f"   [PROCESSED] {processed}")
-        print(f"   [SUCCESS] Yahoo Finance success: {real_data_count}")
-        print(f"   [FAILED] {failed_count}")
-        print(f"   [RESULTS] Stocks meeting criteria: {len(results)}")
+        _observe_scan('scan', market, stock_universe, started, processed, len(results),
+                      sorted(f['symbol'] for f in failed_stocks))
         
-        if failed_stocks:
-            print(f"\n[FAILED STOCKS] {len(failed_stocks)} stocks failed:")
-            for failed_stock in sorted(failed_stocks, key=lambda x: x['symbol']):
-                print(f"   - {failed_stock['symbol']} ({failed_stock['name']})")
+        snapshot_id = _save_snapshot(_ScanSnapshot(
+            market, stock_universe, len(stock_list), rows, failed_universe, covers,
+        ))
         
         return jsonify({
             'results': results,
             'total_matches': len(results),
+            'snapshot_id': snapshot_id,
             'stock_universe': stock_universe,
             'universe_size': len(stock_list),
             'processed': processed,
@@ -1748,9 +3099,64 @@ def scan_stocks():
         })
         
     except Exception as e:
-        print(f"[SCAN ERROR] {str(e)}")
+        _log.error('scan failed', extra={'fields': {'market': market, 'error': str(e)}})
+        _SCAN_FAILURES.labels(_metric_market(market), 'error').inc()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/refilter', methods=['POST'])
+def refilter():
+    """Re-apply thresholds and filters to a previous scan's snapshot.
+
+    Body: { snapshotId, weeklyThreshold, monthlyThreshold, sectorFilter, marketCapFilter }
+    Returns the /scan response shape without fetching any market data.
+    404 if the snapshot expired; 409 if it was taken with a different
+    sector / market-cap filter than the one requested.
+    """
+    try:
+        data = request.get_json() or {}
+        snapshot_id       = data.get('snapshotId', '')
+        weekly_threshold  = float(data.get('weeklyThreshold', 5))
+        monthly_threshold = float(data.get('monthlyThreshold', 10))
+        market_cap_filter = data.get('marketCapFilter', 'all')
+        sector_filter     = data.get('sectorFilter', 'all')
+    except Exception as e:
+        return jsonify({'error': f'Invalid params: {e}'}), 400
+
+    snapshot = _load_snapshot(snapshot_id)
+    if snapshot is None:
+        return jsonify({'error': 'Snapshot not found or expired', 'snapshot_id': snapshot_id}), 404
+    if not snapshot.covers_filters(sector_filter, market_cap_filter):
+        return jsonify({
+            'error': 'Snapshot was taken with narrower filters; run a new scan',
+            'snapshot_id': snapshot_id,
+            'covers': snapshot.covers,
+        }), 409
+
+    results = snapshot.filter(weekly_threshold, monthly_threshold, sector_filter, market_cap_filter)
+    processed = len(snapshot.rows) + len(snapshot.failed)
+    return jsonify({
+        'results': results,
+        'total_matches': len(results),
+        'snapshot_id': snapshot.id,
+        'snapshot_age': round(time.time() - snapshot.created_at, 1),
+        'stock_universe': snapshot.universe,
+        'universe_size': snapshot.universe_size,
+        'processed': processed,
+        'failed_count': len(snapshot.failed),
+        'failed_symbols': snapshot.failed,
+        'success_rate': f"{((len(snapshot.rows) / processed) * 100):.1f}%" if processed > 0 else "0%",
+        'criteria': {
+            'weeklyThreshold': weekly_threshold,
+            'monthlyThreshold': monthly_threshold,
+            'marketCapFilter': market_cap_filter,
+            'sectorFilter': sector_filter,
+            'stockUniverse': snapshot.universe
+        },
+        'market': snapshot.market,
+        'timestamp': datetime.now().isoformat(),
+        'message': f'Re-filtered {snapshot.universe}: {len(results)} matches from {len(snapshot.rows)} screened symbols'
+    })
+
 @app.route('/tickers')
 def tickers():
     """Return current values for headline indices used by the UI status bar.
@@ -1763,60 +3169,21 @@ def tickers():
       }
 
     Any individual ticker that fails returns null for that key so the
-    frontend can degrade gracefully.
-    """
-    symbols = [
-        ('nifty', '^NSEI'),
-        ('sp500', '^GSPC'),
-        ('dow',   '^DJI'),
-        ('btc',   'BTC-USD'),
-    ]
-    out = {}
-    for key, symbol in symbols:
-        try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-            r = requests.get(
-                url,
-                params={'interval': '1d', 'range': '5d'},
-                headers={'User-Agent': 'Mozilla/5.0'},
-                timeout=5,
-            )
-            r.raise_for_status()
-            data = r.json()
-            result = data['chart']['result'][0]
-            meta = result.get('meta', {})
-            price = meta.get('regularMarketPrice')
-
-            # Determine prev close correctly regardless of whether today's
-            # candle is settled or still None in the chart.
-            # If the last close in the chart is None → today not settled yet,
-            # so last non-null IS yesterday's close.
-            # If the last close is not None → today is settled, use second-to-last.
-            closes = result.get('indicators', {}).get('quote', [{}])[0].get('close', [])
-            non_null_closes = [c for c in closes if c is not None]
-
-            if price is None or len(non_null_closes) < 2:
-                out[key] = None
-                continue
-
-            last_raw = closes[-1] if closes else None
-            if last_raw is None:
-                # Today's candle not settled — last non-null is yesterday
-                prev = non_null_closes[-1]
-            else:
-                # Today's candle is settled — second-to-last is yesterday
-                prev = non_null_closes[-2]
+    frontend can degrade gracefully. Served from the shared headline cache
+    with an ETag, so a browser or CDN revalidation costs a 304.
 
-            if prev == 0:
-                out[key] = None
-                continue
-            change_pct = ((price - prev) / prev) * 100
-            change_abs = price - prev
-            out[key] = {'value': round(price, 2), 'change_pct': round(change_pct, 2), 'change_abs': round(change_abs, 2)}
-        except Exception as e:
-            print(f"[tickers] {symbol} failed: {e}")
-            out[key] = None
-    return jsonify(out)
+    Tabs poll this rather than hold a push stream open: under gunicorn
+    gthread every open stream pins one of a worker's request threads, and
+    the shared cache already limits upstream traffic to four requests per
+    TICKERS_TTL however many tabs poll.
+    """
+    entry = _headline_tickers()
+    resp = Response(entry['body'], mimetype='application/json')
+    resp.set_etag(entry['etag'])
+    resp.headers['Cache-Control'] = (
+        f"public, max-age={_TICKERS_TTL}, stale-while-revalidate={_TICKERS_TTL}"
+    )
+    return resp.make_conditional(request)
 
 @app.route('/health')
 def health_check():
@@ -1825,6 +3192,48 @@ def health_check():
         'message': 'API is operational and healthy.'
     })
 
+@app.route('/prewarm', methods=['GET', 'POST'])
+def prewarm():
+    """GET reports pre-warmer status; POST also triggers a refresh cycle now."""
+    if request.method == 'POST' and _PREWARM_ENABLED:
+        _prewarm_wake.set()
+    return jsonify({
+        **_prewarm_status,
+        'triggered': request.method == 'POST' and _PREWARM_ENABLED,
+        'cache': _price_cache.stats(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/cache-stats')
+def cache_stats():
+    """Price-history cache counters and upstream rate-limiter state for this worker."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return jsonify({
+        'price_history': _price_cache.stats(),
+        'upstream': {l.host: l.stats() for l in limiters},
+        'binance_ws': _binance_live.status if _binance_live else {'enabled': False},
+        'sharding': _shard_status,
+        'universes': {
+            'version':    _universes_state['registry'] and _universes_state['registry'].version,
+            'loads':      _universes_state['loads'],
+            'last_error': _universes_state['last_error'],
+        },
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus exposition of the hot-path metrics, summed over every worker."""
+    if prometheus_client is None:
+        return jsonify({'error': 'prometheus_client is not installed'}), 501
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        prometheus_multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry), mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
 @app.route('/test-stock/<symbol>')
 def test_stock(symbol):
     """Test Yahoo Finance data for specific stock"""
@@ -0,0 +1,217 @@
+"""Local stand-in for Binance's combined WebSocket stream (BINANCE_WS_URL).
+
+Answers SUBSCRIBE requests on /stream and then replays the recorded frames
+in fixtures/binance_ws.jsonl, in order and in a loop, sending each client
+only the streams it subscribed to. Timestamps are re-dated as they are
+sent, so kline frames always describe today's candle.
+
+    python bench/fake_binance_ws.py --port 8767 --interval 1
+    python bench/fake_binance_ws.py --record 30    # refresh the fixture from the live stream
+
+Run the backend with BINANCE_WS=1 and BINANCE_WS_URL set to the printed URL
+(and BINANCE_BASE_URL at bench/fake_upstream.py, which the feed seeds its
+ranking from).
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'binance_ws.jsonl')
+DAY_MS = 86400 * 1000
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+def _load(path):
+    with open(path) as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def redate(frame: dict) -> dict:
+    """frame with its event times set to now and kline candles to today's."""
+    now = int(time.time() * 1000)
+    data = frame['data']
+    if isinstance(data, list):
+        data = [{**m, 'E': now} for m in data]
+    else:
+        start = now // DAY_MS * DAY_MS
+        data = {**data, 'E': now, 'k': {**data['k'], 't': start, 'T': start + DAY_MS - 1}}
+    return {'stream': frame['stream'], 'data': data}
+
+
+# ── WebSocket framing ──
+
+def _encode(text: str, opcode: int = 0x1) -> bytes:
+    payload = text.encode()
+    n = len(payload)
+    if n < 126:
+        header = struct.pack('!BB', 0x80 | opcode, n)
+    elif n < 65536:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, n)
+    return header + payload
+
+
+def _read(rfile):
+    """(opcode, payload) of the next client frame, or (None, b'') at EOF."""
+    head = rfile.read(2)
+    if len(head) < 2:
+        return None, b''
+    opcode, n = head[0] & 0x0F, head[1] & 0x7F
+    if n == 126:
+        n = struct.unpack('!H', rfile.read(2))[0]
+    elif n == 127:
+        n = struct.unpack('!Q', rfile.read(8))[0]
+    mask = rfile.read(4) if head[1] & 0x80 else b'\0\0\0\0'
+    data = rfile.read(n)
+    return opcode, bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+
+class FakeBinanceWS:
+    """Threaded WebSocket server replaying recorded combined-stream frames."""
+
+    def __init__(self, frames=None, interval=1.0):
+        self.frames = frames if frames is not None else _load(FIXTURE)
+        self.interval = interval
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.calls[key] += n
+
+    def start(self, port=0):
+        fake = self
+
+        class Handler(StreamRequestHandler):
+            def handle(self):
+                headers = {}
+                request_line = self.rfile.readline().decode()
+                for line in iter(self.rfile.readline, b'\r\n'):
+                    name, _, value = line.decode().partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if not request_line.startswith('GET /stream') or 'sec-websocket-key' not in headers:
+                    self.wfile.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n')
+                    return
+                accept = base64.b64encode(
+                    hashlib.sha1((headers['sec-websocket-key'] + WS_GUID).encode()).digest()).decode()
+                self.wfile.write((
+                    'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                    f'Sec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+                fake.count('connects')
+
+                self.subscribed = set()
+                self.send_lock = threading.Lock()
+                self.closed = threading.Event()
+                threading.Thread(target=self.read_loop, daemon=True).start()
+                self.replay()
+
+            def send(self, text, opcode=0x1):
+                with self.send_lock:
+                    self.wfile.write(_encode(text, opcode))
+
+            def read_loop(self):
+                try:
+                    while True:
+                        opcode, payload = _read(self.rfile)
+                        if opcode is None or opcode == 0x8:
+                            break
+                        if opcode == 0x9:
+                            self.send(payload.decode(), 0xA)
+                        elif opcode == 0x1:
+                            msg = json.loads(payload)
+                            if msg.get('method') == 'SUBSCRIBE':
+                                self.subscribed.update(msg.get('params', []))
+                                fake.count('subscribe')
+                                fake.count('streams', len(msg.get('params', [])))
+                            self.send(json.dumps({'result': None, 'id': msg.get('id')}))
+                except OSError:
+                    pass
+                self.closed.set()
+
+            def replay(self):
+                try:
+                    while not self.closed.is_set():
+                        for frame in fake.frames:
+                            if self.closed.is_set():
+                                return
+                            if frame['stream'] in self.subscribed:
+                                self.send(json.dumps(redate(frame)))
+                                fake.count('frames')
+                            self.closed.wait(fake.interval / max(1, len(fake.frames)))
+                except OSError:
+                    pass
+
+        ThreadingTCPServer.allow_reuse_address = True
+        self._server = ThreadingTCPServer(('127.0.0.1', port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='fake-binance-ws', daemon=True).start()
+        return f"ws://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.calls)
+
+
+def record(seconds, pairs=20):
+    """Overwrite the fixture with live frames for the top pairs (needs network access)."""
+    import requests
+    import websocket
+    tickers = requests.get('https://api.binance.com/api/v3/ticker/24hr', timeout=30).json()
+    usdt = [t for t in tickers if t['symbol'].endswith('USDT')]
+    top = sorted(usdt, key=lambda t: float(t['quoteVolume'] or 0), reverse=True)[:pairs]
+    streams = ['!miniTicker@arr'] + [f"{t['symbol'].lower()}@kline_1d" for t in top]
+    ws = websocket.create_connection('wss://stream.binance.com:9443/stream', timeout=10)
+    ws.send(json.dumps({'method': 'SUBSCRIBE', 'params': streams, 'id': 1}))
+    frames = []
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        frame = json.loads(ws.recv())
+        if 'data' in frame:
+            frames.append(frame)
+    ws.close()
+    with open(FIXTURE, 'w') as fh:
+        for frame in frames:
+            fh.write(json.dumps(frame, separators=(',', ':')) + '\n')
+    print(f"Recorded {len(frames)} frames")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--port', type=int, default=8767)
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds per pass over the fixture')
+    parser.add_argument('--record', type=float, metavar='SECONDS',
+                        help='record this many seconds of the live stream into the fixture and exit')
+    args = parser.parse_args()
+    if args.record:
+        record(args.record)
+        return
+    fake = FakeBinanceWS(interval=args.interval)
+    print(f"Fake Binance stream: BINANCE_WS_URL={fake.start(args.port)}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
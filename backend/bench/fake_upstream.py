@@ -0,0 +1,290 @@
+"""Local stand-in for the Yahoo Finance and Binance endpoints app.py calls.
+
+Replays the recorded responses in fixtures/ for any symbol: each symbol gets
+its own deterministic price series (the fixture's shape, rescaled and
+drifted), re-dated so the last bar is today. Latency, 5xx errors and 429s
+are configurable, and every call is counted by endpoint.
+
+    python bench/fake_upstream.py --port 8765 --latency 80 --throttle-rate 0.02
+    python bench/fake_upstream.py --record     # refresh fixtures/ from the live APIs
+
+It listens on two ports (--port and --port + 1); point YAHOO_BASE_URL at the
+first and BINANCE_BASE_URL at the second, so the backend rate-limits them
+separately as it does the real hosts. GET /__stats returns the call counters, POST /__reset clears them.
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DAY = 86400
+HISTORY_DAYS = 45
+QUOTE_ASSETS = ('USDT', 'FDUSD', 'USDC', 'BTC')
+
+
+def _load(name):
+    with open(os.path.join(FIXTURES, name)) as fh:
+        return json.load(fh)
+
+
+class FakeUpstream:
+    """Threaded HTTP server answering chart, spark, klines and ticker/24hr."""
+
+    def __init__(self, latency_ms=50, jitter_ms=20, error_rate=0.0, throttle_rate=0.0, pairs=2000):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.pairs = pairs
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._weight = [0, 0]           # [minute, Binance weight used in it]
+        self._chart = _load('chart.json')['chart']['result'][0]
+        self._klines = _load('klines.json')
+        self._tickers = _load('ticker_24hr.json')
+        self._tickers_body = None
+        self._servers = []
+
+    # ── Series ──
+
+    def _series(self, symbol, template, day_offset):
+        """(day starts, closes, volumes) for HISTORY_DAYS days ending today."""
+        rnd = random.Random(symbol)
+        scale = rnd.uniform(0.05, 20.0)
+        drift = rnd.uniform(-0.012, 0.006)
+        today = int(time.time()) // DAY * DAY
+        days = [today - (HISTORY_DAYS - 1 - i) * DAY for i in range(HISTORY_DAYS)]
+        closes, volumes = [], []
+        for i in range(HISTORY_DAYS):
+            base, volume = template[i % len(template)]
+            closes.append(round(base * scale * (1 + drift) ** i * rnd.uniform(0.985, 1.015), 4))
+            volumes.append(int(volume * rnd.uniform(0.5, 1.5)))
+        return [d + day_offset for d in days], closes, volumes
+
+    def _stock_series(self, symbol):
+        quote = self._chart['indicators']['quote'][0]
+        return self._series(symbol, list(zip(quote['close'], quote['volume'])), 3 * 3600 + 45 * 60)
+
+    def _coin_series(self, symbol):
+        return self._series(symbol, [(float(k[4]), float(k[5])) for k in self._klines], 0)
+
+    # ── Responses ──
+
+    def chart(self, symbol, query, spark=False):
+        ts, closes, volumes = self._stock_series(symbol)
+        if 'period1' in query:
+            lo, hi = int(query['period1']), int(query.get('period2', time.time()))
+            keep = [i for i, t in enumerate(ts) if lo <= t <= hi]
+        else:
+            keep = range(len(ts))[-(5 if query.get('range') == '5d' else 22):]
+        ts = [ts[i] for i in keep]
+        closes = [closes[i] for i in keep]
+        volumes = [volumes[i] for i in keep]
+        meta = copy.deepcopy(self._chart['meta'])
+        meta.update(symbol=symbol, regularMarketPrice=closes[-1] if closes else None,
+                    regularMarketVolume=volumes[-1] if volumes else None)
+        if spark:
+            # Spark answers carry closes only
+            return {'meta': meta, 'timestamp': ts, 'indicators': {'quote': [{'close': closes}]}}
+        opens = [round(c * 0.998, 4) for c in closes]
+        quote = {
+            'open': opens,
+            'high': [round(max(o, c) * 1.006, 4) for o, c in zip(opens, closes)],
+            'low':  [round(min(o, c) * 0.994, 4) for o, c in zip(opens, closes)],
+            'close': closes,
+            'volume': volumes,
+        }
+        return {'meta': meta, 'timestamp': ts, 'indicators': {'quote': [quote]}}
+
+    def klines(self, symbol, query):
+        days, closes, volumes = self._coin_series(symbol)
+        rows = []
+        prev = closes[0]
+        for day, close, volume in zip(days, closes, volumes):
+            open_ms = day * 1000
+            if 'startTime' in query and open_ms < int(query['startTime']):
+                prev = close
+                continue
+            rows.append([
+                open_ms, f"{prev:.8f}", f"{max(prev, close) * 1.01:.8f}", f"{min(prev, close) * 0.99:.8f}",
+                f"{close:.8f}", f"{volume:.8f}", open_ms + DAY * 1000 - 1, f"{volume * close:.8f}",
+                1000, f"{volume / 2:.8f}", f"{volume * close / 2:.8f}", "0",
+            ])
+            prev = close
+        return rows[-int(query.get('limit', 500)):]
+
+    def tickers_body(self):
+        """The /ticker/24hr list, built once: the fixture repeated out to `pairs` entries."""
+        if self._tickers_body is None:
+            out = []
+            for i in range(self.pairs):
+                entry = dict(self._tickers[i % len(self._tickers)])
+                if i >= len(self._tickers):
+                    quote = next(q for q in QUOTE_ASSETS if entry['symbol'].endswith(q))
+                    entry['symbol'] = f"{entry['symbol'][:-len(quote)]}{i}{quote}"
+                if entry['symbol'].endswith('USDT'):
+                    _, closes, _ = self._coin_series(entry['symbol'])
+                    entry['lastPrice'] = f"{closes[-1]:.8f}"
+                entry['quoteVolume'] = f"{float(entry['quoteVolume']) / (1 + i // len(self._tickers)):.8f}"
+                out.append(entry)
+            self._tickers_body = json.dumps(out).encode()
+        return self._tickers_body
+
+    # ── Server ──
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.calls[key] += n
+
+    def binance_weight(self, weight):
+        with self._lock:
+            minute = int(time.time() // 60)
+            if self._weight[0] != minute:
+                self._weight = [minute, 0]
+            self._weight[1] += weight
+            return self._weight[1]
+
+    def start(self, port=0):
+        """Serve on another port and return its URL; every port answers every endpoint."""
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send(self, code, body, headers=()):
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path == '/__reset':
+                    with upstream._lock:
+                        upstream.calls.clear()
+                    return self.send(200, b'{}')
+                self.send(404, b'{}')
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path == '/__stats':
+                    with upstream._lock:
+                        return self.send(200, json.dumps(upstream.calls).encode())
+
+                if '/v8/finance/chart/' in url.path:
+                    endpoint = 'chart'
+                elif url.path.endswith('/v7/finance/spark'):
+                    endpoint = 'spark'
+                elif url.path.endswith('/api/v3/klines'):
+                    endpoint = 'klines'
+                elif url.path.endswith('/api/v3/ticker/24hr'):
+                    endpoint = 'ticker/24hr'
+                else:
+                    return self.send(404, b'{"error": "unknown endpoint"}')
+                upstream.count(endpoint)
+                time.sleep(max(0.0, upstream.latency_ms + random.uniform(-1, 1) * upstream.jitter_ms) / 1000)
+
+                headers = []
+                if endpoint in ('klines', 'ticker/24hr'):
+                    used = upstream.binance_weight(2 if endpoint == 'klines' else 80)
+                    headers.append(('X-MBX-USED-WEIGHT-1M', str(used)))
+                roll = random.random()
+                if roll < upstream.throttle_rate:
+                    upstream.count('429')
+                    return self.send(429, b'{"code": -1003}', headers + [('Retry-After', '1')])
+                if roll < upstream.throttle_rate + upstream.error_rate:
+                    upstream.count('5xx')
+                    return self.send(500, b'{"error": "internal"}', headers)
+
+                if endpoint == 'chart':
+                    symbol = url.path.rsplit('/', 1)[1]
+                    body = {'chart': {'result': [upstream.chart(symbol, query)], 'error': None}}
+                elif endpoint == 'spark':
+                    body = {'spark': {'result': [
+                        {'symbol': s, 'response': [upstream.chart(s, query, spark=True)]}
+                        for s in query.get('symbols', '').split(',') if s
+                    ], 'error': None}}
+                elif endpoint == 'klines':
+                    body = upstream.klines(query['symbol'], query)
+                else:
+                    return self.send(200, upstream.tickers_body(), headers)
+                self.send(200, json.dumps(body).encode(), headers)
+
+        server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='fake-upstream', daemon=True).start()
+        self._servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.calls)
+
+
+def record():
+    """Overwrite fixtures/ with fresh live responses (needs network access)."""
+    import requests
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    chart = requests.get('https://query1.finance.yahoo.com/v8/finance/chart/RELIANCE.NS',
+                         params={'range': '1mo', 'interval': '1d'}, headers=headers, timeout=15)
+    klines = requests.get('https://api.binance.com/api/v3/klines',
+                          params={'symbol': 'BTCUSDT', 'interval': '1d', 'limit': 32}, timeout=15)
+    tickers = requests.get('https://api.binance.com/api/v3/ticker/24hr', timeout=30)
+    for resp in (chart, klines, tickers):
+        resp.raise_for_status()
+    top = sorted(tickers.json(), key=lambda t: float(t['quoteVolume'] or 0), reverse=True)[:120]
+    for name, data in (('chart.json', chart.json()), ('klines.json', klines.json()), ('ticker_24hr.json', top)):
+        with open(os.path.join(FIXTURES, name), 'w') as fh:
+            json.dump(data, fh, indent=1)
+        print(f"Recorded {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=50, help='mean response latency, ms')
+    parser.add_argument('--jitter', type=float, default=20, help='latency jitter, ± ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='share of requests answered 429')
+    parser.add_argument('--pairs', type=int, default=2000, help='entries in /ticker/24hr')
+    parser.add_argument('--record', action='store_true', help='refresh fixtures/ from the live APIs and exit')
+    args = parser.parse_args()
+    if args.record:
+        record()
+        return
+    upstream = FakeUpstream(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.pairs)
+    print(f"Fake upstream: YAHOO_BASE_URL={upstream.start(args.port)} "
+          f"BINANCE_BASE_URL={upstream.start(args.port + 1)}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        upstream.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""Offline scan benchmark: the backend under gunicorn against bench/fake_upstream.py.
+
+    cd backend
+    python bench/run.py
+    python bench/run.py --universes nifty50,nifty500,top500 --concurrency 1,8 --rounds 3
+    python bench/run.py --latency 150 --throttle-rate 0.05 --env YAHOO_RATE=5 --json bench.json
+    python bench/run.py --endpoints scan --universes top100 --ws   # with the live Binance feed
+
+Every (endpoint, universe, concurrency) scenario gets a fresh gunicorn with an
+empty OHLCV store, so round 1 is a cold scan and later rounds show the warm
+path. Each round fires `concurrency` identical requests at once. Reported per
+scenario: p50/p99 request latency over all rounds, round-1 p50, symbols
+screened per second, peak RSS of the gunicorn master plus workers, and the
+upstream calls the fake server answered (including the 429s and 5xx it
+injected). With --ws the backend also runs its Binance WebSocket feed
+against bench/fake_binance_ws.py, and the frames it was sent are counted.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_binance_ws import FakeBinanceWS  # noqa: E402
+from fake_upstream import FakeUpstream  # noqa: E402
+
+US_UNIVERSES = {'dow30', 'sp100', 'nasdaq100', 'sp500'}
+CRYPTO_UNIVERSES = {'top50', 'top100', 'top200', 'top500'}
+
+
+def market_of(universe: str) -> str:
+    if universe in CRYPTO_UNIVERSES:
+        return 'crypto'
+    return 'us' if universe in US_UNIVERSES else 'india'
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return None
+    k = (len(values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# ── Backend process ──
+
+class Backend:
+    """A gunicorn running app:app with its upstreams pointed at the fake server."""
+
+    def __init__(self, yahoo_url, binance_url, workers, threads, extra_env):
+        self.tmp = tempfile.TemporaryDirectory(prefix='scanner-bench-')
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        env = dict(os.environ)
+        env.update({
+            'YAHOO_BASE_URL':           yahoo_url,
+            'BINANCE_BASE_URL':         binance_url,
+            'OHLCV_DB_PATH':            os.path.join(self.tmp.name, 'ohlcv.sqlite3'),
+            'PROMETHEUS_MULTIPROC_DIR': os.path.join(self.tmp.name, 'metrics'),
+            'PREWARM_ENABLED':          '0',
+            'BINANCE_WS':               '0',
+        })
+        env.pop('RENDER', None)
+        env.update(extra_env)
+        self.log = open(os.path.join(self.tmp.name, 'gunicorn.log'), 'w')
+        self.proc = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+             '--worker-class', 'gthread', '--workers', str(workers), '--threads', str(threads),
+             '--bind', f'127.0.0.1:{self.port}', '--timeout', '120', 'app:app'],
+            cwd=BACKEND_DIR, env=env, stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        self.peak_rss = 0
+        self._sampling = True
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+
+    def wait_ready(self, timeout=30):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"gunicorn exited; see {self.log.name}")
+            try:
+                if requests.get(f"{self.url}/health", timeout=1).ok:
+                    self._sampler.start()
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError('gunicorn did not become ready')
+
+    def _pids(self):
+        pids = [self.proc.pid]
+        try:
+            with open(f"/proc/{self.proc.pid}/task/{self.proc.pid}/children") as fh:
+                pids += [int(p) for p in fh.read().split()]
+        except OSError:
+            pass
+        return pids
+
+    def _rss(self) -> int:
+        total = 0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/status") as fh:
+                    for line in fh:
+                        if line.startswith('VmRSS:'):
+                            total += int(line.split()[1]) * 1024
+            except OSError:
+                pass
+        return total
+
+    def _sample_rss(self):
+        while self._sampling:
+            self.peak_rss = max(self.peak_rss, self._rss())
+            time.sleep(0.05)
+
+    def stop(self):
+        self._sampling = False
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        self.log.close()
+        self.tmp.cleanup()
+
+
+# ── Requests ──
+
+def run_scan(base, universe):
+    body = {'market': market_of(universe), 'stockUniverse': universe,
+            'weeklyThreshold': 5, 'monthlyThreshold': 10}
+    resp = requests.post(f"{base}/scan", json=body, timeout=300)
+    resp.raise_for_status()
+    return resp.json().get('processed', 0)
+
+
+def run_scan_stream(base, universe):
+    params = {'market': market_of(universe), 'stockUniverse': universe,
+              'weeklyThreshold': 5, 'monthlyThreshold': 10}
+    with requests.get(f"{base}/scan-stream", params=params, stream=True, timeout=300) as resp:
+        resp.raise_for_status()
+        event = None
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith('event: '):
+                event = line[7:]
+            elif line.startswith('data: ') and event in ('done', 'error'):
+                data = json.loads(line[6:])
+                if event == 'error':
+                    raise RuntimeError(data.get('message'))
+                return data.get('processed', 0)
+    raise RuntimeError('stream ended without a done event')
+
+
+def run_tickers(base, universe):
+    requests.get(f"{base}/tickers", timeout=60).raise_for_status()
+    return 0
+
+
+ENDPOINTS = {'scan': run_scan, 'scan-stream': run_scan_stream, 'tickers': run_tickers}
+
+
+def run_scenario(args, upstream, ws, endpoint, universe, concurrency):
+    backend = Backend(upstream.yahoo_url, upstream.binance_url, args.workers, args.threads, args.env)
+    try:
+        backend.wait_ready()
+        upstream.reset()
+        if ws:
+            ws.reset()
+        call = ENDPOINTS[endpoint]
+        latencies, cold, symbols, errors = [], [], 0, 0
+
+        def timed():
+            started = time.perf_counter()
+            processed = call(backend.url, universe)
+            return time.perf_counter() - started, processed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for round_no in range(args.rounds):
+                for future in [pool.submit(timed) for _ in range(concurrency)]:
+                    try:
+                        elapsed, processed = future.result()
+                    except Exception as e:
+                        errors += 1
+                        print(f"  ! {endpoint} {universe}: {e}", file=sys.stderr)
+                        continue
+                    latencies.append(elapsed)
+                    symbols += processed
+                    if round_no == 0:
+                        cold.append(elapsed)
+        wall = time.perf_counter() - started
+        return {
+            'endpoint':    endpoint,
+            'universe':    universe,
+            'concurrency': concurrency,
+            'requests':    len(latencies) + errors,
+            'errors':      errors,
+            'p50_s':       percentile(latencies, 50),
+            'p99_s':       percentile(latencies, 99),
+            'cold_p50_s':  percentile(cold, 50),
+            'symbols_per_s': symbols / wall if symbols else None,
+            'peak_rss_mb': backend.peak_rss / 2 ** 20 if backend.peak_rss else None,
+            'upstream':    {**upstream.stats(), **{f"ws:{k}": v for k, v in (ws.stats() if ws else {}).items()}},
+        }
+    finally:
+        backend.stop()
+
+
+def fmt(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+def print_row(r):
+    calls = ' '.join(f"{k}={v}" for k, v in sorted(r['upstream'].items()))
+    print(f"{r['endpoint']:<12} {r['universe']:<10} {r['concurrency']:>4} {r['requests']:>5} {r['errors']:>4} "
+          f"{fmt(r['p50_s'], '8.3f')} {fmt(r['p99_s'], '8.3f')} {fmt(r['cold_p50_s'], '8.3f')} "
+          f"{fmt(r['symbols_per_s'], '9.1f')} {fmt(r['peak_rss_mb'], '8.1f')}  {calls}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--endpoints', default='scan,scan-stream,tickers')
+    parser.add_argument('--universes', default='nifty50,nifty200,nifty500,sp500,top100,top500')
+    parser.add_argument('--concurrency', default='1,4,16')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=80, help='fake upstream latency, ms')
+    parser.add_argument('--jitter', type=float, default=30, help='fake upstream jitter, ± ms')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='extra environment for the backend, e.g. FETCH_CONCURRENCY=16')
+    parser.add_argument('--ws', action='store_true', help='run the Binance WebSocket feed against a replay stand-in')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+    args.env = dict(item.split('=', 1) for item in args.env)
+
+    upstream = FakeUpstream(args.latency, args.jitter, args.error_rate, args.throttle_rate)
+    # Separate ports, so the backend keeps a rate limiter per upstream as in production
+    upstream.yahoo_url = upstream.start()
+    upstream.binance_url = upstream.start()
+    ws = None
+    if args.ws:
+        ws = FakeBinanceWS()
+        args.env.setdefault('BINANCE_WS', '1')
+        args.env.setdefault('BINANCE_WS_URL', ws.start())
+    results = []
+    print(f"{'endpoint':<12} {'universe':<10} {'conc':>4} {'reqs':>5} {'errs':>4} "
+          f"{'p50 s':>8} {'p99 s':>8} {'cold p50':>8} {'sym/s':>9} {'rss MB':>8}  upstream calls")
+    try:
+        for endpoint in args.endpoints.split(','):
+            universes = ['-'] if endpoint == 'tickers' else args.universes.split(',')
+            for universe in universes:
+                for concurrency in (int(c) for c in args.concurrency.split(',')):
+                    result = run_scenario(args, upstream, ws, endpoint, universe, concurrency)
+                    results.append(result)
+                    print_row(result)
+    finally:
+        upstream.stop()
+        if ws:
+            ws.stop()
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump({'args': vars(args), 'results': results}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
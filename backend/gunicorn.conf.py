@@ -0,0 +1,26 @@
+# Gunicorn loads this file from the working directory on its own; the worker
+# and thread settings stay on the command line in Procfile / render.yaml.
+#
+# Workers share Prometheus metrics through files in PROMETHEUS_MULTIPROC_DIR,
+# which has to be set before the workers import app.py and emptied when the
+# server starts so counters from a previous run are not summed in.
+
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'scanner-metrics'))
+
+
+def on_starting(server):
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
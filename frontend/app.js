@@ -76,6 +76,7 @@
   let scanResults      = [];
   let scanData         = null;
   let lastScanBody     = null;
+  let lastSnapshot     = null;   // { id, market, universe } from the last full scan
   let loadingTimer     = null;
   let loadingStartTs   = 0;
   let sortCol          = 'monthly';
@@ -276,13 +277,56 @@
     return String(s).replace(/[&<>"']/g, (c) => ({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;',"'":'&#39;'}[c]));
   }
 
+  function sameBody(a, b) {
+    return !!a && !!b && Object.keys(a).every((k) => a[k] === b[k]);
+  }
+
+  function showScanResults(results) {
+    sortCol = 'monthly';
+    sortDir = 'asc';
+    scanResults = results.slice();
+    sortResults();
+    if (scanResults.length > 0) { renderResults(); setMode('results'); }
+    else { setMode('noResults'); }
+  }
+
+  // Only thresholds/filters changed: re-filter the last scan's snapshot
+  // on the server instead of fetching the whole universe again. Resolves
+  // false when the snapshot is gone (404) or too narrow (409).
+  async function tryRefilter(body) {
+    try {
+      const r = await fetch(`${API_BASE}/refilter`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', Accept: 'application/json' },
+        body: JSON.stringify({ ...body, snapshotId: lastSnapshot.id }),
+      });
+      if (!r.ok) { lastSnapshot = null; return false; }
+      const data = await r.json();
+      scanData = data;
+      showScanResults(data.results || []);
+      return true;
+    } catch {
+      return false;
+    }
+  }
+
   async function runScan() {
     const btn = $('scanBtn');
     btn.disabled = true;
     $('buttonText').textContent = 'SCANNING…';
 
     const body = buildScanBody();
+    // Same market + universe with new criteria → re-filter. Re-running the
+    // exact same scan is how the user asks for fresh prices, so that still
+    // goes through the stream below.
+    const canRefilter = lastSnapshot && !sameBody(body, lastScanBody)
+      && lastSnapshot.market === body.market && lastSnapshot.universe === body.stockUniverse;
     lastScanBody = body;
+    if (canRefilter && await tryRefilter(body)) {
+      btn.disabled = false;
+      $('buttonText').textContent = 'RUN SCAN';
+      return;
+    }
     const uniLabel = UNIVERSE_LABELS[body.stockUniverse] || body.stockUniverse;
 
     setMode('loading');
@@ -311,14 +355,24 @@
     const es = new EventSource(url);
     window.__es = es;
 
+    // How long to let EventSource keep reconnecting before giving up
+    const RECONNECT_GIVE_UP_MS = 60000;
+    let reconnectTimer = null;
+
     const cleanup = () => {
+      clearTimeout(reconnectTimer);
       try { es.close(); } catch {}
       window.__es = null;
       btn.disabled = false;
       $('buttonText').textContent = 'RUN SCAN';
     };
 
+    // Any event means the stream is (back) up
+    es.addEventListener('open', () => { clearTimeout(reconnectTimer); reconnectTimer = null; });
+
     es.addEventListener('init', (e) => {
+      // A reconnect the server could not resume starts the scan over
+      matches.length = 0;
       initData = JSON.parse(e.data);
       $('progressCount').textContent = `0/${initData.total} fetched`;
       $('lstatSymbols').textContent = `0 / ${initData.total}`;
@@ -348,7 +402,8 @@
     });
 
     es.addEventListener('match', (e) => {
-      matches.push(JSON.parse(e.data));
+      // Fields shared by every row (source, status) arrive once, in init
+      matches.push({ ...(initData && initData.row_defaults), ...JSON.parse(e.data) });
     });
 
     es.addEventListener('done', (e) => {
@@ -361,33 +416,43 @@
       } else {
         console.log(`%c[BuyTheDip] All ${doneData.processed} symbols fetched successfully.`, 'color: #3ddc97; font-weight: bold;');
       }
-      sortCol = 'monthly';
-      sortDir = 'asc';
-      scanResults = matches.slice();
-      sortResults();
-      scanData = { ...doneData, results: scanResults };
+      lastSnapshot = doneData.snapshot_id
+        ? { id: doneData.snapshot_id, market: body.market, universe: body.stockUniverse }
+        : null;
+      if (doneData.lastUpdated) matches.forEach(m => { m.lastUpdated = doneData.lastUpdated; });
+      scanData = { ...doneData, results: matches };
       $('progressFill').style.width = '100%';
-      $('lstatMatches').textContent = scanResults.length;
+      $('lstatMatches').textContent = matches.length;
       cleanup();
-      if (scanResults.length > 0) { renderResults(); setMode('results'); }
-      else { setMode('noResults'); }
+      showScanResults(matches);
     });
 
     es.addEventListener('error', (e) => {
       // EventSource fires 'error' on any disconnect, even normal closes.
       // Distinguish real errors by readyState.
+      // CLOSED before `done` means the server answered with an error status
+      // (refusals such as "too many scans" arrive as an error event instead)
       if (es.readyState === EventSource.CLOSED) {
+        showError(new Error('The scan could not be started (server error)'));
         cleanup();
         return;
       }
-      // Server-emitted error event with payload
+      // Server-emitted error event with payload, including refusals
       if (e.data) {
         try { const d = JSON.parse(e.data); showError(new Error(d.message || 'Scan failed')); }
         catch { showError(new Error('Scan failed')); }
-      } else {
-        showError(new Error('Connection to scan stream lost'));
+        cleanup();
+        return;
+      }
+      // Dropped connection: the scan keeps running server-side and
+      // EventSource resumes it via Last-Event-ID when it reconnects.
+      $('progressEta').textContent = 'reconnecting…';
+      if (!reconnectTimer) {
+        reconnectTimer = setTimeout(() => {
+          showError(new Error('Connection to scan stream lost'));
+          cleanup();
+        }, RECONNECT_GIVE_UP_MS);
       }
-      cleanup();
     });
   }
 